@@ -0,0 +1,326 @@
+"""
+Format Conversion Benchmark
+Times loading, analysis and export/reload of every format on synthetic meshes
+from 1K to 10M faces, and stores the results as JSON for regression checks
+"""
+
+import argparse
+import datetime
+import gc
+import json
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import trimesh
+
+from build_cache import CONVERTER_VERSION
+from convert_formats import (FORMATS, INDEXED_FORMATS, OBJ_BACKENDS, analyze_mesh,
+                             export_to_memory, load_mesh)
+from obj_codec import DEFAULT_PRECISION
+from welding import weld_mesh
+
+# Default mesh sizes, in faces
+DEFAULT_SIZES = (1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+
+# Bump when the measured stages or the result layout change
+BENCHMARK_VERSION = 2
+
+# Slowdown (current / baseline) reported as a regression by --compare
+REGRESSION_THRESHOLD = 1.25
+
+def synthetic_mesh(face_count, seed=0):
+    """
+    Watertight torus with about `face_count` faces
+
+    The surface is a rows x cols quad grid split into triangles, with a
+    small deterministic radial noise so text formats don't get unrealistically
+    short coordinates.
+
+    Args:
+        face_count: approximate number of faces (2 * rows * cols)
+        seed: noise seed
+
+    Returns:
+        trimesh.Trimesh object
+    """
+    rows = max(3, int(round(np.sqrt(face_count / 4.0))))
+    cols = max(3, int(round(face_count / (2.0 * rows))))
+
+    u = np.linspace(0, 2 * np.pi, cols, endpoint=False)
+    v = np.linspace(0, 2 * np.pi, rows, endpoint=False)
+    uu, vv = np.meshgrid(u, v)
+
+    rng = np.random.default_rng(seed)
+    tube = 0.25 * (1.0 + 0.01 * rng.standard_normal(uu.shape))
+    ring = 1.0 + tube * np.cos(vv)
+    vertices = np.column_stack([(ring * np.cos(uu)).ravel(),
+                                (ring * np.sin(uu)).ravel(),
+                                (tube * np.sin(vv)).ravel()])
+
+    r, c = np.meshgrid(np.arange(rows), np.arange(cols), indexing='ij')
+    a = r * cols + c
+    b = r * cols + (c + 1) % cols
+    d = ((r + 1) % rows) * cols + c
+    e = ((r + 1) % rows) * cols + (c + 1) % cols
+    faces = np.concatenate([np.column_stack([a.ravel(), b.ravel(), e.ravel()]),
+                            np.column_stack([a.ravel(), e.ravel(), d.ravel()])])
+
+    return trimesh.Trimesh(vertices=vertices, faces=faces, process=False)
+
+def measure(function, repeat=1, memory=True, setup=None):
+    """
+    Best wall time of a call and, optionally, its peak traced allocation
+
+    Timing runs are done without tracemalloc (it slows allocations down);
+    the memory run is a separate call.
+
+    Args:
+        function: callable without arguments, or taking the result of
+            `setup` if given
+        repeat: timed runs, the fastest one is kept (at least 1)
+        memory: also measure the peak memory in a traced run
+        setup: untimed callable run before every call, e.g. to hand each
+            call a fresh mesh instead of one with warm caches
+
+    Returns:
+        result: return value of the last call
+        seconds: best wall time
+        peak_mb: peak traced memory in MB (None if not measured)
+    """
+    if repeat < 1:
+        raise ValueError(f"repeat must be at least 1, got {repeat}")
+
+    best = float('inf')
+    for _ in range(repeat):
+        argument = () if setup is None else (setup(),)
+        gc.collect()
+        start = time.perf_counter()
+        result = function(*argument)
+        best = min(best, time.perf_counter() - start)
+        del argument
+
+    peak_mb = None
+    if memory:
+        del result
+        argument = () if setup is None else (setup(),)
+        gc.collect()
+        tracemalloc.start()
+        try:
+            result = function(*argument)
+            peak_mb = tracemalloc.get_traced_memory()[1] / (1 << 20)
+        finally:
+            tracemalloc.stop()
+
+    return result, best, peak_mb
+
+def _record(rows, size, mesh, stage, format_name, seconds, peak_mb, file_size=None):
+    row = {
+        'target_faces': size,
+        'faces': len(mesh.faces),
+        'vertices': len(mesh.vertices),
+        'stage': stage,
+        'format': format_name,
+        'seconds': seconds,
+        'peak_mb': peak_mb,
+        'file_size': file_size
+    }
+    rows.append(row)
+
+    extra = f", {file_size:,} bytes" if file_size is not None else ""
+    memory = f", peak {peak_mb:.1f} MB" if peak_mb is not None else ""
+    print(f"  {stage:<8} {format_name:<6} {seconds * 1000:>10.2f} ms{memory}{extra}")
+
+def benchmark_size(size, work_dir, formats=tuple(FORMATS), repeat=1, memory=True,
+                   obj_backend='trimesh', metrics=None):
+    """
+    Benchmark every stage for one synthetic mesh size
+
+    Stages: 'load' (binary STL source into trimesh), 'analyze'
+    (analyze_mesh), and per format 'export' (encode + write) and 'reload'
+    (load_mesh from disk).
+
+    Args:
+        size: target face count
+        work_dir: directory for the generated files
+        formats: formats to export
+        repeat: timed runs per stage
+        memory: measure peak memory
+        obj_backend: OBJ encoder/decoder (see OBJ_BACKENDS)
+        metrics: metrics passed to analyze_mesh (default: all)
+
+    Returns:
+        List of result rows
+    """
+    rows = []
+    mesh = synthetic_mesh(size)
+    print(f"\n{len(mesh.faces):,} faces, {len(mesh.vertices):,} vertices")
+
+    source = work_dir / f"synthetic_{size}.stl"
+    mesh.export(str(source))
+    _record(rows, size, mesh, 'source', 'stl', 0.0, None, source.stat().st_size)
+
+    loaded, seconds, peak = measure(lambda: load_mesh(source), repeat, memory)
+    _record(rows, size, mesh, 'load', 'stl', seconds, peak)
+
+    analyze_options = {'verbose': False}
+    if metrics is not None:
+        analyze_options['metrics'] = metrics
+    # Each call analyzes a fresh copy: the same object would hit trimesh's
+    # per-mesh cache and the topology cache after the first run
+    _, seconds, peak = measure(lambda fresh: analyze_mesh(fresh, 'stl', **analyze_options),
+                               repeat, memory, setup=loaded.copy)
+    _record(rows, size, mesh, 'analyze', 'stl', seconds, peak)
+    del loaded
+
+    for format_name in formats:
+        output_dir = work_dir / f"{size}_{format_name}"
+        output_dir.mkdir(exist_ok=True)
+        output_file = output_dir / f"synthetic{FORMATS[format_name]}"
+        source_mesh = mesh if format_name not in INDEXED_FORMATS else weld_mesh(mesh)
+
+        def export(fresh):
+            files = export_to_memory(fresh, format_name, 'synthetic',
+                                     obj_backend=obj_backend, obj_precision=DEFAULT_PRECISION)
+            for name, content in files.items():
+                with open(output_dir / name, 'wb') as f:
+                    f.write(content)
+            return sum(len(content) for content in files.values())
+
+        file_size, seconds, peak = measure(export, repeat, memory, setup=source_mesh.copy)
+        _record(rows, size, mesh, 'export', format_name, seconds, peak, file_size)
+
+        _, seconds, peak = measure(lambda: load_mesh(output_file, obj_backend), repeat, memory)
+        _record(rows, size, mesh, 'reload', format_name, seconds, peak)
+
+    return rows
+
+def run_benchmark(sizes=DEFAULT_SIZES, formats=tuple(FORMATS), repeat=1, memory=True,
+                  obj_backend='trimesh', metrics=None):
+    """
+    Benchmark all sizes and return the machine-readable report
+
+    Args:
+        sizes: target face counts
+        formats: formats to export
+        repeat: timed runs per stage
+        memory: measure peak memory
+        obj_backend: OBJ encoder/decoder (see OBJ_BACKENDS)
+        metrics: metrics passed to analyze_mesh (default: all)
+
+    Returns:
+        Dictionary with environment metadata and the result rows
+    """
+    report = {
+        'benchmark_version': BENCHMARK_VERSION,
+        'converter_version': CONVERTER_VERSION,
+        'created': datetime.datetime.now().isoformat(timespec='seconds'),
+        'environment': {
+            'python': sys.version.split()[0],
+            'numpy': np.__version__,
+            'trimesh': trimesh.__version__,
+            'platform': platform.platform(),
+            'processor': platform.processor() or platform.machine()
+        },
+        'settings': {
+            'sizes': list(sizes),
+            'formats': list(formats),
+            'repeat': repeat,
+            'memory': memory,
+            'obj_backend': obj_backend,
+            'metrics': list(metrics) if metrics is not None else None
+        },
+        'results': []
+    }
+
+    with tempfile.TemporaryDirectory(prefix='benchmark_') as tmp:
+        for size in sizes:
+            report['results'].extend(
+                benchmark_size(size, Path(tmp), formats, repeat, memory, obj_backend, metrics))
+
+    return report
+
+def compare_reports(current, baseline, threshold=REGRESSION_THRESHOLD):
+    """
+    Compare the timings of two reports row by row
+
+    Rows are matched on (target_faces, stage, format); very short stages
+    (under a millisecond in the baseline) are ignored as noise.
+
+    Args:
+        current: report returned by run_benchmark
+        baseline: report loaded from a previous run
+        threshold: slowdown ratio reported as a regression
+
+    Returns:
+        List of (key, baseline_seconds, current_seconds, ratio) regressions
+    """
+    def index(report):
+        return {(r['target_faces'], r['stage'], r['format']): r
+                for r in report['results'] if r['stage'] != 'source'}
+
+    before = index(baseline)
+    regressions = []
+    for key, row in index(current).items():
+        if key not in before or before[key]['seconds'] < 1e-3:
+            continue
+        ratio = row['seconds'] / before[key]['seconds']
+        if ratio > threshold:
+            regressions.append((key, before[key]['seconds'], row['seconds'], ratio))
+    return regressions
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmark load, analysis and export/reload of every format")
+    parser.add_argument('--sizes', default=','.join(str(s) for s in DEFAULT_SIZES),
+                        help="comma separated face counts")
+    parser.add_argument('--formats', default=','.join(FORMATS),
+                        help=f"comma separated formats (available: {', '.join(FORMATS)})")
+    parser.add_argument('--repeat', type=int, default=1,
+                        help="timed runs per stage, the fastest is kept")
+    parser.add_argument('--no-memory', action='store_true',
+                        help="skip the traced peak memory runs")
+    parser.add_argument('--obj-backend', choices=OBJ_BACKENDS, default='trimesh',
+                        help="OBJ encoder/decoder to benchmark")
+    parser.add_argument('--metrics', default=None,
+                        help="comma separated metrics for analyze_mesh (default: all)")
+    parser.add_argument('--output', default='benchmark_results.json',
+                        help="JSON file for the results")
+    parser.add_argument('--compare', default=None,
+                        help="baseline JSON; exit with status 1 on regressions")
+    args = parser.parse_args()
+    if args.repeat < 1:
+        parser.error("--repeat must be at least 1")
+
+    sizes = [int(float(s)) for s in args.sizes.split(',') if s.strip()]
+    formats = [f.strip() for f in args.formats.split(',') if f.strip()]
+    unknown = [f for f in formats if f not in FORMATS]
+    if unknown:
+        print(f"Error: unknown formats: {', '.join(unknown)}")
+        exit(1)
+    metrics = [m.strip() for m in args.metrics.split(',')] if args.metrics else None
+
+    report = run_benchmark(sizes, formats, args.repeat, not args.no_memory,
+                           args.obj_backend, metrics)
+
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n[OK] Results saved to: {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare_reports(report, baseline)
+
+        if not regressions:
+            print(f"No regressions against {args.compare}")
+        else:
+            print(f"\n{len(regressions)} regressions against {args.compare}:")
+            for (size, stage, format_name), before, after, ratio in regressions:
+                print(f"  {size:>10,} faces {stage:<8} {format_name:<6} "
+                      f"{before * 1000:.2f} ms -> {after * 1000:.2f} ms (x{ratio:.2f})")
+            exit(1)
@@ -0,0 +1,134 @@
+"""
+Incremental Conversion Cache
+Treats the converted/ directory as a build cache keyed by input content and options
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import trimesh
+
+# Bump when the converter output changes in a way options don't capture
+CONVERTER_VERSION = 2
+
+# Manifests live next to the outputs, one per converted model
+MANIFEST_DIR = '.build_cache'
+
+READ_BLOCK_SIZE = 1 << 20
+
+def file_digest(file_path):
+    """
+    SHA-1 of a file's contents, read in blocks
+
+    Args:
+        file_path: path to the file
+
+    Returns:
+        Hex digest string
+    """
+    digest = hashlib.sha1()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(READ_BLOCK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def options_digest(options):
+    """
+    Stable hash of the exporter options that influence the outputs
+
+    Args:
+        options: JSON serializable dictionary
+
+    Returns:
+        Hex digest string
+    """
+    payload = {
+        'converter': CONVERTER_VERSION,
+        'trimesh': trimesh.__version__,
+        'options': options
+    }
+    encoded = json.dumps(payload, sort_keys=True, default=str).encode('utf-8')
+    return hashlib.sha1(encoded).hexdigest()
+
+def _file_state(file_path):
+    """Size and modification time used to detect changed outputs"""
+    stat = os.stat(file_path)
+    return [stat.st_size, stat.st_mtime_ns]
+
+class BuildCache:
+    """
+    Per-directory manifest of converted models
+
+    Each entry stores the input content hash, the options hash, the state of
+    every output file and the comparison stats. A model is up to date when
+    both hashes match and all outputs are still exactly as they were written.
+    """
+
+    def __init__(self, output_dir):
+        self.output_dir = Path(output_dir)
+        self.directory = self.output_dir / MANIFEST_DIR
+
+    def _manifest_path(self, input_path):
+        return self.directory / f"{Path(input_path).name}.json"
+
+    def key(self, input_path, options):
+        """Cache key of an input file under the given options"""
+        return {
+            'input_hash': file_digest(input_path),
+            'options_hash': options_digest(options)
+        }
+
+    def lookup(self, input_path, key):
+        """
+        Return the recorded stats if the outputs are up to date
+
+        Args:
+            input_path: path of the model being converted
+            key: result of BuildCache.key
+
+        Returns:
+            List of stats dicts, or None when the model must be rebuilt
+        """
+        try:
+            with open(self._manifest_path(input_path)) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if entry.get('key') != key:
+            return None
+
+        for name, state in entry.get('outputs', {}).items():
+            output_file = self.output_dir / name
+            if not output_file.exists() or _file_state(output_file) != state:
+                return None
+
+        return entry.get('stats')
+
+    def record(self, input_path, key, outputs, stats):
+        """
+        Store a manifest entry after a successful conversion
+
+        Args:
+            input_path: path of the converted model
+            key: result of BuildCache.key
+            outputs: paths of every file written for this model (inside
+                output_dir, possibly in subfolders)
+            stats: comparison stats of the conversion
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        entry = {
+            'input': str(input_path),
+            'key': key,
+            'outputs': {os.path.relpath(p, self.output_dir): _file_state(p)
+                        for p in outputs},
+            'stats': stats
+        }
+
+        manifest_path = self._manifest_path(input_path)
+        tmp_path = manifest_path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump(entry, f, indent=2)
+        os.replace(tmp_path, manifest_path)
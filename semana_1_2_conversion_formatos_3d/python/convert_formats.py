@@ -1,178 +1,993 @@
 """
 3D Model Format Conversion and Analysis Script
-Loads, analyzes, and converts between .STL, .OBJ, and .GLTF formats
+Loads, analyzes, and converts between .STL, .OBJ, .GLTF and .GLB formats
 """
 
 import trimesh
 import numpy as np
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from functools import partial
+import argparse
+import glob
+import hashlib
+import io
 import json
-
-def analyze_mesh(mesh, format_name):
+import os
+import time
+
+from build_cache import BuildCache
+from decimation import LOD_RATIOS, build_lod_chain
+from glb_format import build_glb, read_glb
+from mesh_metrics import ALL_METRICS, MeshMetrics, MetricsCache
+from obj_codec import DEFAULT_PRECISION, export_obj, load_obj
+from stl_reader import MappedSTL, open_stl
+from welding import DEFAULT_TOLERANCE, weld_mesh
+
+# Supported output formats
+FORMATS = {
+    'stl': '.stl',
+    'obj': '.obj',
+    'gltf': '.gltf',
+    'glb': '.glb'
+}
+
+# Encoders available for the obj entry: trimesh's exporter or the
+# vectorized NumPy codec (obj_codec.py)
+OBJ_BACKENDS = ('trimesh', 'numpy')
+
+# Indexed formats that benefit from shared (welded) vertices
+INDEXED_FORMATS = ('obj', 'gltf', 'glb')
+
+# Metrics cache directory, created inside the output directory
+METRICS_CACHE_DIR = '.metrics_cache'
+
+# Formats exported and verified concurrently per model
+EXPORT_THREADS = 4
+
+# Relative tolerance (of the bounding box size) used by mesh fingerprints
+FINGERPRINT_TOLERANCE = 1e-6
+
+def analyze_mesh(mesh, format_name, verbose=True, metrics=ALL_METRICS, cache=None):
     """
     Analyze and print mesh properties
 
     Args:
         mesh: trimesh.Trimesh object
         format_name: string name of the format
+        verbose: print the analysis to the console
+        metrics: names of the metrics to compute (see mesh_metrics.METRICS)
+        cache: optional MetricsCache shared between runs
+
+    Returns:
+        Dictionary with the format name and the requested metrics
+    """
+    stats = {'format': format_name, **MeshMetrics(mesh, cache).get(metrics)}
+    if verbose:
+        print_analysis(stats)
+    return stats
+
+def print_analysis(stats):
+    """
+    Print the metrics of one analysis dict
+
+    Args:
+        stats: dictionary returned by analyze_mesh
     """
     print(f"\n{'='*60}")
-    print(f"Analysis of {format_name.upper()} format")
+    print(f"Analysis of {stats['format'].upper()} format")
     print(f"{'='*60}")
 
-    print(f"Vertices: {len(mesh.vertices)}")
-    print(f"Faces: {len(mesh.faces)}")
-    print(f"Edges: {len(mesh.edges)}")
-    print(f"Is watertight: {mesh.is_watertight}")
-    print(f"Is winding consistent: {mesh.is_winding_consistent}")
-    print(f"Volume: {mesh.volume:.2f}")
-    print(f"Surface area: {mesh.area:.2f}")
+    labels = {
+        'vertices': "Vertices: {}",
+        'faces': "Faces: {}",
+        'edges': "Edges: {}",
+        'is_watertight': "Is watertight: {}",
+        'is_winding_consistent': "Is winding consistent: {}",
+        'boundary_loops': "Boundary loops: {}",
+        'non_manifold_edges': "Non-manifold edges: {}",
+        'flipped_faces': "Flipped faces: {}",
+        'volume': "Volume: {:.2f}",
+        'surface_area': "Surface area: {:.2f}",
+        'duplicate_vertices': "Duplicate vertices: {}",
+        'stl_duplicate_corners': "Duplicate STL corners: {}"
+    }
+    for name, label in labels.items():
+        if stats.get(name) is not None:
+            print(label.format(stats[name]))
+
+    if 'bounds_min' in stats and 'bounds_max' in stats:
+        print(f"Bounding box: {np.array(stats['bounds_min'])} "
+              f"to {np.array(stats['bounds_max'])}")
+
+def load_mesh(file_path, obj_backend='trimesh'):
+    """
+    Load a model file as a single trimesh.Trimesh
+
+    Binary STL files are read through stl_reader.open_stl (memory-mapped and
+    welded bit-exactly) instead of trimesh's parser.
+
+    Args:
+        file_path: path to the model file
+        obj_backend: decoder used for .obj files (see OBJ_BACKENDS)
+
+    Returns:
+        trimesh.Trimesh object (first geometry if the file is a Scene)
+    """
+    if Path(file_path).suffix.lower() == '.obj' and obj_backend == 'numpy':
+        with open(file_path, 'rb') as f:
+            return load_obj(f.read())
+
+    if Path(file_path).suffix.lower() == '.stl':
+        # Binary STL files are memory-mapped and welded without trimesh's parser
+        mesh = open_stl(file_path)
+        return mesh.to_trimesh() if isinstance(mesh, MappedSTL) else mesh
 
-    # Check for duplicate vertices
-    unique_vertices = np.unique(mesh.vertices, axis=0)
-    duplicates = len(mesh.vertices) - len(unique_vertices)
-    print(f"Duplicate vertices: {duplicates}")
+    if Path(file_path).suffix.lower() == '.glb':
+        # Our own reader applies node transforms (needed for quantized files)
+        try:
+            with open(file_path, 'rb') as f:
+                return read_glb(f.read())
+        except (ValueError, KeyError):
+            pass
+
+    data = trimesh.load(str(file_path))
+
+    # Handle Scene objects (GLTF returns Scene)
+    if isinstance(data, trimesh.Scene):
+        # Get the first geometry from the scene
+        return list(data.geometry.values())[0]
+    return data
+
+def mesh_fingerprint(mesh, tolerance=FINGERPRINT_TOLERANCE):
+    """
+    Compute a cheap, order independent fingerprint of a mesh
 
-    # Bounds
+    Vertices are snapped to a grid of `tolerance` times the bounding box size
+    and each row is hashed; the row hashes are summed so the result does not
+    depend on vertex order (exporters are free to reorder vertices). Faces
+    are hashed by their snapped corner positions, sorted within each face and
+    then across faces, so scrambled connectivity changes the hash while
+    reordered vertices or faces do not.
+
+    Args:
+        mesh: trimesh.Trimesh object
+        tolerance: grid size relative to the largest bounding box extent
+
+    Returns:
+        Dictionary with counts, bounds and a hex geometry hash
+    """
+    vertices = np.asarray(mesh.vertices, dtype=np.float64)
     bounds = mesh.bounds
-    print(f"Bounding box: {bounds[0]} to {bounds[1]}")
+    scale = max(float(np.ptp(bounds, axis=0).max()), 1e-12) * tolerance
+
+    grid = np.round((vertices - bounds[0]) / scale).astype(np.int64).view(np.uint64)
+    with np.errstate(over='ignore'):
+        rows = (grid[:, 0] * np.uint64(0x9E3779B97F4A7C15)) \
+            ^ (grid[:, 1] * np.uint64(0xC2B2AE3D27D4EB4F)) \
+            ^ (grid[:, 2] * np.uint64(0x165667B19E3779F9))
+        rows ^= rows >> np.uint64(29)
+        total = rows.sum(dtype=np.uint64)
+
+    corners = np.sort(rows[np.asarray(mesh.faces, dtype=np.int64)], axis=1)
+    corners = corners[np.lexsort(corners.T[::-1])]
+
+    digest = hashlib.sha1(np.uint64(total).tobytes() + corners.tobytes()).hexdigest()
 
     return {
-        'format': format_name,
-        'vertices': len(mesh.vertices),
+        'vertices': len(vertices),
         'faces': len(mesh.faces),
-        'edges': len(mesh.edges),
-        'is_watertight': mesh.is_watertight,
-        'is_winding_consistent': mesh.is_winding_consistent,
-        'volume': float(mesh.volume),
-        'surface_area': float(mesh.area),
-        'duplicate_vertices': duplicates,
-        'bounds_min': bounds[0].tolist(),
-        'bounds_max': bounds[1].tolist()
+        'bounds': bounds.tolist(),
+        'hash': digest,
+        'scale': scale
     }
 
-def convert_formats(input_file):
+def fingerprints_match(a, b):
     """
-    Convert a 3D model between STL, OBJ, and GLTF formats
+    Compare two fingerprints from mesh_fingerprint
+
+    Counts and hash must be identical; bounds may differ by one grid step.
+    """
+    if a['vertices'] != b['vertices'] or a['faces'] != b['faces']:
+        return False
+    if a['hash'] != b['hash']:
+        return False
+    step = max(a['scale'], b['scale'])
+    return bool(np.allclose(a['bounds'], b['bounds'], rtol=0, atol=step))
+
+def export_to_memory(mesh, format_name, base_name, quantize=False, normals=True,
+                     obj_backend='trimesh', obj_precision=DEFAULT_PRECISION):
+    """
+    Export a mesh without touching the disk
 
     Args:
-        input_file: path to input file (STL, OBJ, or GLTF)
+        mesh: trimesh.Trimesh object
+        format_name: key of FORMATS
+        base_name: stem used for the main output file
+        quantize: quantize GLB attributes (KHR_mesh_quantization)
+        normals: store per-vertex normals in GLB files
+        obj_backend: OBJ encoder (see OBJ_BACKENDS)
+        obj_precision: decimal places of OBJ coordinates
+
+    Returns:
+        Dictionary mapping output file names to bytes (GLTF produces
+        the .gltf file plus its external buffers)
     """
-    input_path = Path(input_file)
+    if format_name == 'glb':
+        return {f"{base_name}.glb": build_glb(mesh, quantize=quantize, include_normals=normals)}
 
-    if not input_path.exists():
-        print(f"Error: File {input_file} not found")
-        return
+    if format_name == 'obj':
+        if obj_backend == 'numpy':
+            return {f"{base_name}.obj": export_obj(mesh, obj_precision)}
+        data = mesh.export(file_type='obj', digits=obj_precision)
+    else:
+        data = mesh.export(file_type=format_name)
 
-    print(f"\nLoading model from: {input_path.name}")
+    if isinstance(data, dict):
+        files = {}
+        for name, content in data.items():
+            if name.endswith(FORMATS[format_name]):
+                name = f"{base_name}{FORMATS[format_name]}"
+            files[name] = content
+        return files
 
-    # Load the mesh
-    try:
-        mesh = trimesh.load(input_file)
-        print(f"Successfully loaded {input_path.suffix} file")
-    except Exception as e:
-        print(f"Error loading file: {e}")
-        return
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    return {f"{base_name}{FORMATS[format_name]}": data}
 
-    # Analyze original mesh
-    stats = []
-    original_format = input_path.suffix[1:]  # Remove the dot
-    stats.append(analyze_mesh(mesh, original_format))
+def load_from_memory(files, format_name, base_name, obj_backend='trimesh'):
+    """
+    Decode the output of export_to_memory back into a mesh
 
-    # Define output formats
-    output_dir = input_path.parent / "converted"
-    output_dir.mkdir(exist_ok=True)
+    Args:
+        files: dictionary of file name to bytes
+        format_name: key of FORMATS
+        base_name: stem of the main output file
+        obj_backend: OBJ decoder (see OBJ_BACKENDS)
 
-    base_name = input_path.stem
+    Returns:
+        trimesh.Trimesh object
+    """
+    main = files[f"{base_name}{FORMATS[format_name]}"]
+    if format_name == 'glb':
+        return read_glb(main)
+    if format_name == 'obj' and obj_backend == 'numpy':
+        return load_obj(main)
 
-    # Convert to different formats
-    formats = {
-        'obj': '.obj',
-        'stl': '.stl',
-        'gltf': '.gltf'
-    }
+    resolver = trimesh.resolvers.ZipResolver(files)
+    data = trimesh.load(io.BytesIO(main), file_type=format_name, resolver=resolver)
 
-    print(f"\n{'='*60}")
-    print("Starting conversions...")
-    print(f"{'='*60}")
+    if isinstance(data, trimesh.Scene):
+        return list(data.geometry.values())[0]
+    return data
 
-    for format_name, extension in formats.items():
-        if format_name == original_format.lower():
-            continue  # Skip the original format
+def glb_variants(mesh, normals=True):
+    """
+    Size and decode time of the plain and quantized GLB encodings of a mesh
 
-        output_file = output_dir / f"{base_name}{extension}"
+    Args:
+        mesh: trimesh.Trimesh object (welded)
+        normals: store per-vertex normals
 
-        try:
-            # Export to new format
-            mesh.export(str(output_file))
-            print(f"\n[OK] Converted to {format_name.upper()}: {output_file.name}")
+    Returns:
+        Dictionary mapping 'plain' and 'quantized' to file_size and decode_ms
+    """
+    variants = {}
+    for name, quantize in (('plain', False), ('quantized', True)):
+        data = build_glb(mesh, quantize=quantize, include_normals=normals)
+        start = time.perf_counter()
+        read_glb(data)
+        variants[name] = {
+            'file_size': len(data),
+            'decode_ms': (time.perf_counter() - start) * 1000.0
+        }
+    return variants
+
+def _export_and_verify(mesh, welded, source_stats, source_fingerprint, format_name,
+                       base_name, output_dir, verify, analyze, codec):
+    """
+    Export one format, verify the round trip and return its stats
+
+    With verify='memory' the file is encoded and decoded in memory and only
+    fully re-analyzed when its fingerprint differs from the source; it is then
+    written to disk once. verify='disk' keeps the export-then-reload path.
+    Indexed formats are exported from the welded mesh. `analyze` is
+    analyze_mesh with the caller's metrics and cache already bound and `codec`
+    holds the encoder options (quantize, normals, obj_backend, obj_precision).
+    Every stats dict also records the output size and how long encoding and
+    decoding took; GLB stats also compare the plain and quantized variants.
+    Nothing is printed, so several formats can run on threads at once; see
+    _report_export.
+
+    Returns:
+        stats: analysis dict of the converted file
+        written: paths of every file written for this format
+    """
+    if format_name in INDEXED_FORMATS:
+        mesh = welded
+
+    output_file = output_dir / f"{base_name}{FORMATS[format_name]}"
+    start = time.perf_counter()
+    files = export_to_memory(mesh, format_name, base_name, **codec)
+    cost = {
+        'file_size': sum(len(content) for content in files.values()),
+        'encode_ms': (time.perf_counter() - start) * 1000.0,
+        'quantized': bool(codec['quantize'] and format_name == 'glb')
+    }
+    if format_name == 'obj':
+        cost['backend'] = codec['obj_backend']
+    if format_name == 'glb':
+        cost['variants'] = glb_variants(mesh, codec['normals'])
+
+    if verify == 'disk':
+        written = _write_files(files, output_dir)
+
+        # Load the converted file and analyze it
+        start = time.perf_counter()
+        converted_mesh = load_mesh(output_file, codec['obj_backend'])
+        cost['decode_ms'] = (time.perf_counter() - start) * 1000.0
+
+        stats = analyze(converted_mesh, format_name)
+        stats.update(cost, verified='full')
+        return stats, written
+
+    start = time.perf_counter()
+    converted_mesh = load_from_memory(files, format_name, base_name, codec['obj_backend'])
+    cost['decode_ms'] = (time.perf_counter() - start) * 1000.0
+
+    written = _write_files(files, output_dir)
+
+    if fingerprints_match(source_fingerprint, mesh_fingerprint(converted_mesh)):
+        stats = dict(source_stats, format=format_name, verified='fingerprint')
+        stats.update(cost)
+        return stats, written
+
+    stats = analyze(converted_mesh, format_name)
+    stats.update(cost, verified='full')
+    return stats, written
+
+def _report_export(stats, written, source_format):
+    """Print the outcome of _export_and_verify for one format"""
+    main = next(p for p in written if p.suffix == FORMATS[stats['format']])
+    print(f"\n[OK] Converted to {stats['format'].upper()}: {main.name}")
+    if stats['verified'] == 'fingerprint':
+        print(f"Round trip fingerprint matches {source_format.upper()}, "
+              f"skipping full analysis")
+    else:
+        print_analysis(stats)
+    if 'variants' in stats:
+        print("GLB variants:   " + ", ".join(
+            f"{name} {variant['file_size']:,} bytes ({variant['decode_ms']:.2f} ms decode)"
+            for name, variant in stats['variants'].items()))
 
-            # Load the converted file and analyze it
-            converted_data = trimesh.load(str(output_file))
+def _run_exports(tasks, threads):
+    """
+    Run export tasks on a bounded thread pool
 
-            # Handle Scene objects (GLTF returns Scene)
-            if isinstance(converted_data, trimesh.Scene):
-                # Get the first geometry from the scene
-                converted_mesh = list(converted_data.geometry.values())[0]
-            else:
-                converted_mesh = converted_data
+    The exporters only read the shared meshes and release the GIL during
+    NumPy work and file I/O, so formats overlap. Results come back in task
+    order regardless of which finishes first.
 
-            stats.append(analyze_mesh(converted_mesh, format_name))
+    Args:
+        tasks: list of (key, callable) pairs
+        threads: maximum number of concurrent tasks (1 runs them inline)
 
+    Returns:
+        List of (key, result or exception) in task order
+    """
+    def attempt(task):
+        try:
+            return task()
         except Exception as e:
-            print(f"[ERROR] Error converting to {format_name}: {e}")
+            return e
+
+    if threads <= 1 or len(tasks) <= 1:
+        return [(key, attempt(task)) for key, task in tasks]
+
+    with ThreadPoolExecutor(max_workers=min(threads, len(tasks))) as executor:
+        futures = [(key, executor.submit(attempt, task)) for key, task in tasks]
+        return [(key, future.result()) for key, future in futures]
+
+def _write_files(files, output_dir):
+    """Write the output of export_to_memory and return the written paths"""
+    written = []
+    for name, content in files.items():
+        path = output_dir / name
+        with open(path, 'wb') as f:
+            f.write(content)
+        written.append(path)
+    return written
+
+def export_formats(mesh, input_path, output_dir, verbose=True, verify='memory',
+                   metrics=ALL_METRICS, use_cache=True, cache_dir=None,
+                   quantize=False, normals=True, obj_backend='trimesh',
+                   obj_precision=DEFAULT_PRECISION, lod_ratios=(),
+                   export_threads=EXPORT_THREADS, load_ms=None):
+    """
+    Export a mesh to every supported format and analyze the results
+
+    Args:
+        mesh: trimesh.Trimesh object loaded from input_path
+        input_path: Path of the original model
+        output_dir: directory where converted files are written
+        verbose: print progress and analysis to the console
+        verify: 'memory' to verify round trips in memory with fingerprints,
+            'disk' to reload and fully re-analyze every written file
+        metrics: names of the metrics reported for every format
+        use_cache: reuse metrics cached on disk by mesh content hash
+        cache_dir: metrics cache location (defaults to output_dir/.metrics_cache)
+        quantize: quantize GLB positions and normals (KHR_mesh_quantization)
+        normals: store per-vertex normals in GLB files
+        obj_backend: OBJ encoder/decoder (see OBJ_BACKENDS)
+        obj_precision: decimal places of OBJ coordinates
+        lod_ratios: face count fractions of the decimated levels of detail;
+            level k is written to output_dir/lod{k} in every format
+        export_threads: formats exported and verified concurrently
+        load_ms: time it took to load the original file, if known
+
+    Returns:
+        stats: list of analysis dicts, original format first
+        errors: dict mapping format name to error message
+        outputs: paths of every file written
+    """
+    stats = []
+    errors = {}
+    outputs = []
+    original_format = input_path.suffix[1:]  # Remove the dot
+    cache = None
+    if use_cache:
+        cache = MetricsCache(cache_dir or output_dir / METRICS_CACHE_DIR)
+    analyze = partial(analyze_mesh, verbose=False, metrics=metrics, cache=cache)
+    codec = {'quantize': quantize, 'normals': normals, 'obj_backend': obj_backend,
+             'obj_precision': obj_precision}
+
+    source_stats = analyze(mesh, original_format)
+    if verbose:
+        print_analysis(source_stats)
+    source_stats['file_size'] = input_path.stat().st_size
+    source_stats['decode_ms'] = load_ms
+    stats.append(source_stats)
+
+    base_name = input_path.stem
+    source_fingerprint = mesh_fingerprint(mesh) if verify == 'memory' else None
+    welded = weld_mesh(mesh)
+
+    if verbose:
+        print(f"\n{'='*60}")
+        print("Starting conversions...")
+        print(f"{'='*60}")
+
+    # Skip the original format
+    tasks = [(format_name, partial(_export_and_verify, mesh, welded, source_stats,
+                                   source_fingerprint, format_name, base_name,
+                                   output_dir, verify, analyze, codec))
+             for format_name in FORMATS if format_name != original_format.lower()]
+
+    for format_name, result in _run_exports(tasks, export_threads):
+        if isinstance(result, Exception):
+            errors[format_name] = str(result)
+            if verbose:
+                print(f"[ERROR] Error converting to {format_name}: {result}")
+            continue
+
+        format_stats, written = result
+        stats.append(format_stats)
+        outputs.extend(written)
+        if verbose:
+            _report_export(format_stats, written, original_format)
+
+    if lod_ratios:
+        lod_stats, lod_errors, lod_outputs = export_lods(
+            welded, input_path, output_dir, lod_ratios, verify, verbose, analyze, codec,
+            export_threads)
+        stats.extend(lod_stats)
+        errors.update(lod_errors)
+        outputs.extend(lod_outputs)
 
     # Save comparison stats to JSON
     stats_file = output_dir / f"{base_name}_comparison.json"
     with open(stats_file, 'w') as f:
         json.dump(stats, f, indent=2)
+    outputs.append(stats_file)
+
+    return stats, errors, outputs
+
+def export_lods(welded, input_path, output_dir, lod_ratios, verify, verbose, analyze, codec,
+                export_threads=EXPORT_THREADS):
+    """
+    Decimate a mesh into levels of detail and export each one in every format
+
+    Level k (the k-th entry of lod_ratios) is written to output_dir/lod{k}
+    under the input's stem, so every level keeps the same file names (and
+    GLTF buffer names) as the full resolution model.
+
+    Args:
+        welded: welded trimesh.Trimesh of the model
+        input_path: Path of the original model
+        output_dir: directory where converted files are written
+        lod_ratios: face count fractions, see decimation.build_lod_chain
+        verify, analyze, codec: as in _export_and_verify
+        verbose: print progress to the console
+        export_threads: (level, format) pairs exported concurrently
+
+    Returns:
+        stats: analysis dicts tagged with 'lod' and 'ratio'
+        errors: dict mapping 'lod{k}/format' to error message
+        outputs: paths of every file written
+    """
+    stats = []
+    errors = {}
+    outputs = []
+    base_name = input_path.stem
+
+    start = time.perf_counter()
+    chain = build_lod_chain(welded, lod_ratios)
+    if verbose:
+        print(f"\nBuilt {len(chain)} levels of detail in "
+              f"{time.perf_counter() - start:.2f}s")
+
+    tasks = []
+    ratios = {}
+    for level, (ratio, lod) in enumerate(chain, 1):
+        lod_dir = output_dir / f"lod{level}"
+        lod_dir.mkdir(parents=True, exist_ok=True)
+        lod_stats = analyze(lod, f"lod{level}")
+        fingerprint = mesh_fingerprint(lod) if verify == 'memory' else None
+        ratios[level] = ratio
+
+        for format_name in FORMATS:
+            tasks.append(((level, format_name), partial(
+                _export_and_verify, lod, lod, lod_stats, fingerprint, format_name,
+                base_name, lod_dir, verify, analyze, codec)))
+
+    for (level, format_name), result in _run_exports(tasks, export_threads):
+        if isinstance(result, Exception):
+            errors[f"lod{level}/{format_name}"] = str(result)
+            if verbose:
+                print(f"[ERROR] Error converting LOD{level} to {format_name}: {result}")
+            continue
+
+        format_stats, written = result
+        format_stats.update(lod=level, ratio=ratios[level])
+        stats.append(format_stats)
+        outputs.extend(written)
+
+    return stats, errors, outputs
+
+def convert_model(input_path, output_dir, verbose=True, incremental=True, **options):
+    """
+    Convert one model unless its outputs in output_dir are already up to date
+
+    The build cache key is the input file's content hash plus every option
+    that affects the outputs, so unchanged models are skipped without even
+    being loaded.
+
+    Args:
+        input_path: Path of the model
+        output_dir: directory where converted files are written
+        verbose: print progress and analysis to the console
+        incremental: skip models whose outputs are up to date
+        **options: keyword arguments for export_formats
+
+    Returns:
+        stats: list of analysis dicts
+        errors: dict mapping format name to error message
+        skipped: True when the cached results were reused
+    """
+    input_path = Path(input_path)
+    output_dir = Path(output_dir)
+
+    build_cache = BuildCache(output_dir) if incremental else None
+    if build_cache is not None:
+        key = build_cache.key(input_path, {
+            'formats': FORMATS,
+            'indexed_formats': INDEXED_FORMATS,
+            'weld_tolerance': DEFAULT_TOLERANCE,
+            'verify': options.get('verify', 'memory'),
+            'metrics': list(options.get('metrics', ALL_METRICS)),
+            'quantize': options.get('quantize', False),
+            'normals': options.get('normals', True),
+            'obj_backend': options.get('obj_backend', 'trimesh'),
+            'obj_precision': options.get('obj_precision', DEFAULT_PRECISION),
+            'lod_ratios': list(options.get('lod_ratios', ()))
+        })
+        stats = build_cache.lookup(input_path, key)
+        if stats is not None:
+            if verbose:
+                print(f"[SKIP] {input_path.name} is up to date, reusing cached results")
+            return stats, {}, True
+
+    start = time.perf_counter()
+    mesh = load_mesh(input_path, options.get('obj_backend', 'trimesh'))
+    load_ms = (time.perf_counter() - start) * 1000.0
+    if verbose:
+        print(f"Successfully loaded {input_path.suffix} file")
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    stats, errors, outputs = export_formats(mesh, input_path, output_dir,
+                                            verbose=verbose, load_ms=load_ms, **options)
+
+    if build_cache is not None and not errors:
+        build_cache.record(input_path, key, outputs, stats)
+
+    return stats, errors, False
+
+def print_comparison_table(stats):
+    """
+    Print a side by side table of the analyzed formats
+
+    Args:
+        stats: list of analysis dicts returned by analyze_mesh
+    """
+    columns = list(FORMATS)
+    width = 25 + 16 * len(columns)
+
+    print("\n" + "="*width)
+    print("COMPARISON TABLE")
+    print("="*width)
+    print(f"{'Property':<25}" + "".join(f" {c.upper():>15}" for c in columns))
+    print("-"*width)
+
+    # Create a dictionary for easy lookup (full resolution entries only)
+    stats_dict = {s['format'].lower(): s for s in stats if 'lod' not in s}
+
+    properties = ['vertices', 'faces', 'edges', 'volume', 'surface_area', 'duplicate_vertices',
+                  'file_size', 'encode_ms', 'decode_ms']
+    prop_names = ['Vertices', 'Faces', 'Edges', 'Volume', 'Surface Area', 'Duplicate Vertices',
+                  'File Size (bytes)', 'Encode Time (ms)', 'Decode Time (ms)']
+
+    for prop, prop_name in zip(properties, prop_names):
+        row = f"{prop_name:<25}"
+        for column in columns:
+            value = stats_dict.get(column, {}).get(prop)
+            if value is None:
+                value = 'N/A'
+
+            # Format values appropriately
+            row += f" {value:>15.2f}" if isinstance(value, float) else f" {value:>15}"
+
+        print(row)
+
+    print("="*width)
+
+def print_lod_table(stats):
+    """
+    Print faces and file sizes of every level of detail
+
+    Args:
+        stats: list of analysis dicts, LOD entries carry 'lod' and 'ratio'
+    """
+    levels = {}
+    for entry in stats:
+        if 'lod' in entry:
+            levels.setdefault(entry['lod'], {})[entry['format'].lower()] = entry
+    if not levels:
+        return
+
+    columns = list(FORMATS)
+    width = 30 + 16 * len(columns)
+
+    print("\n" + "="*width)
+    print("LEVELS OF DETAIL (file size in bytes)")
+    print("="*width)
+    print(f"{'Level':<8}{'Ratio':>7}{'Faces':>15}" + "".join(f" {c.upper():>15}" for c in columns))
+    print("-"*width)
+
+    for level in sorted(levels):
+        entries = levels[level]
+        first = next(iter(entries.values()))
+        row = f"{'LOD' + str(level):<8}{first['ratio']:>7.0%}{first.get('faces', 'N/A'):>15}"
+        for column in columns:
+            row += f" {entries.get(column, {}).get('file_size', 'N/A'):>15}"
+        print(row)
+
+    print("="*width)
+
+def convert_formats(input_file, output_dir=None, verify='memory',
+                    metrics=ALL_METRICS, use_cache=True, incremental=True,
+                    quantize=False, normals=True, obj_backend='trimesh',
+                    obj_precision=DEFAULT_PRECISION, lod_ratios=(),
+                    export_threads=EXPORT_THREADS):
+    """
+    Convert a 3D model between STL, OBJ, and GLTF formats
+
+    Args:
+        input_file: path to input file (STL, OBJ, or GLTF)
+        output_dir: output directory (defaults to "converted" next to the input)
+        verify: round trip verification mode ('memory' or 'disk')
+        metrics: names of the metrics to report
+        use_cache: reuse metrics cached on disk by mesh content hash
+        incremental: skip the conversion when the outputs are up to date
+        quantize: quantize GLB positions and normals (KHR_mesh_quantization)
+        normals: store per-vertex normals in GLB files
+        obj_backend: OBJ encoder/decoder (see OBJ_BACKENDS)
+        obj_precision: decimal places of OBJ coordinates
+        lod_ratios: face count fractions of the levels of detail to generate
+        export_threads: formats exported and verified concurrently
+    """
+    input_path = Path(input_file)
+
+    if not input_path.exists():
+        print(f"Error: File {input_file} not found")
+        return
+
+    # Define output formats
+    if output_dir is None:
+        output_dir = input_path.parent / "converted"
+    output_dir = Path(output_dir)
+
+    print(f"\nLoading model from: {input_path.name}")
+
+    # Load and convert the mesh
+    try:
+        stats, _, _ = convert_model(input_path, output_dir, incremental=incremental,
+                                    verify=verify, metrics=metrics, use_cache=use_cache,
+                                    quantize=quantize, normals=normals,
+                                    obj_backend=obj_backend,
+                                    obj_precision=obj_precision, lod_ratios=lod_ratios,
+                                    export_threads=export_threads)
+    except Exception as e:
+        print(f"Error loading file: {e}")
+        return
 
     print(f"\n{'='*60}")
     print(f"Conversion complete!")
-    print(f"Comparison stats saved to: {stats_file.name}")
+    print(f"Comparison stats saved to: {input_path.stem}_comparison.json")
     print(f"{'='*60}")
 
     # Generate comparison table
-    print("\n" + "="*80)
-    print("COMPARISON TABLE")
-    print("="*80)
-    print(f"{'Property':<25} {'STL':>15} {'OBJ':>15} {'GLTF':>15}")
-    print("-"*80)
+    print_comparison_table(stats)
+    print_lod_table(stats)
 
-    # Create a dictionary for easy lookup
-    stats_dict = {s['format'].lower(): s for s in stats}
+    return output_dir
 
-    properties = ['vertices', 'faces', 'edges', 'volume', 'surface_area', 'duplicate_vertices']
-    prop_names = ['Vertices', 'Faces', 'Edges', 'Volume', 'Surface Area', 'Duplicate Vertices']
+def find_models(sources):
+    """
+    Expand directories and glob patterns into a sorted list of model files
 
-    for prop, prop_name in zip(properties, prop_names):
-        stl_val = stats_dict.get('stl', {}).get(prop, 'N/A')
-        obj_val = stats_dict.get('obj', {}).get(prop, 'N/A')
-        gltf_val = stats_dict.get('gltf', {}).get(prop, 'N/A')
-
-        # Format values appropriately
-        if isinstance(stl_val, float) and isinstance(obj_val, float) and isinstance(gltf_val, float):
-            stl_str = f"{stl_val:>15.2f}"
-            obj_str = f"{obj_val:>15.2f}"
-            gltf_str = f"{gltf_val:>15.2f}"
+    Args:
+        sources: iterable of file paths, directories or glob patterns
+
+    Returns:
+        List of Path objects with a supported extension
+    """
+    extensions = set(FORMATS.values())
+    found = set()
+
+    for source in sources:
+        source_path = Path(source)
+        if source_path.is_dir():
+            candidates = source_path.rglob('*')
+        elif source_path.is_file():
+            candidates = [source_path]
         else:
-            stl_str = f"{stl_val:>15}" if not isinstance(stl_val, float) else f"{stl_val:>15.2f}"
-            obj_str = f"{obj_val:>15}" if not isinstance(obj_val, float) else f"{obj_val:>15.2f}"
-            gltf_str = f"{gltf_val:>15}" if not isinstance(gltf_val, float) else f"{gltf_val:>15.2f}"
+            candidates = (Path(p) for p in glob.glob(str(source), recursive=True))
 
-        print(f"{prop_name:<25} {stl_str} {obj_str} {gltf_str}")
+        for candidate in candidates:
+            if candidate.is_file() and candidate.suffix.lower() in extensions:
+                found.add(candidate.resolve())
 
-    print("="*80)
+    return sorted(found)
 
-    return output_dir
+def _convert_worker(input_file, output_dir, options):
+    """
+    Convert a single file inside a worker process
 
-if __name__ == "__main__":
-    # Convert the cat.stl model
-    input_file = "cat.stl"
+    Every exception is caught so one broken model never aborts the batch.
+    `options` holds extra keyword arguments for convert_model.
+    """
+    start = time.perf_counter()
+    result = {'input': str(input_file), 'output_dir': str(output_dir)}
+
+    try:
+        stats, errors, skipped = convert_model(input_file, output_dir,
+                                               verbose=False, **options)
+        result['status'] = 'error' if errors else 'ok'
+        result['skipped'] = skipped
+        result['stats'] = stats
+        if errors:
+            result['errors'] = errors
+    except Exception as e:
+        result['status'] = 'error'
+        result['errors'] = {'load': f"{type(e).__name__}: {e}"}
+
+    result['seconds'] = time.perf_counter() - start
+    return result
+
+def convert_batch(sources, output_dir='converted', workers=None,
+                  report_name='batch_comparison.json', verify='memory',
+                  metrics=ALL_METRICS, use_cache=True, incremental=True,
+                  quantize=False, normals=True, obj_backend='trimesh',
+                  obj_precision=DEFAULT_PRECISION, lod_ratios=(), export_threads=1):
+    """
+    Convert every model found in a set of directories, files or glob patterns
+
+    Files are spread over a process pool; the relative directory layout of the
+    inputs is mirrored under output_dir so equal file names never collide.
 
-    if Path(input_file).exists():
-        output_dir = convert_formats(input_file)
+    Args:
+        sources: iterable of file paths, directories or glob patterns
+        output_dir: root directory for converted models and the report
+        workers: number of worker processes (defaults to os.cpu_count())
+        report_name: file name of the aggregated JSON report
+        verify: round trip verification mode ('memory' or 'disk')
+        metrics: names of the metrics to report
+        use_cache: share a metrics cache (output_dir/.metrics_cache) between workers
+        incremental: skip models whose outputs are up to date
+        quantize: quantize GLB positions and normals (KHR_mesh_quantization)
+        normals: store per-vertex normals in GLB files
+        obj_backend: OBJ encoder/decoder (see OBJ_BACKENDS)
+        obj_precision: decimal places of OBJ coordinates
+        lod_ratios: face count fractions of the levels of detail to generate
+        export_threads: formats exported concurrently inside each worker
+            (1 by default, the worker processes already use every core)
+
+    Returns:
+        Dictionary with the aggregated report
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    # Never pick up the outputs of a previous run as new inputs
+    resolved_output = output_dir.resolve()
+    models = [m for m in find_models(sources) if resolved_output not in m.parents]
+
+    if not models:
+        print("Error: No models found")
+        return None
+
+    workers = workers or os.cpu_count() or 1
+    workers = max(1, min(workers, len(models)))
+    root = Path(os.path.commonpath([str(m.parent) for m in models]))
+
+    # Models sharing a folder would overwrite each other's outputs (GLTF
+    # buffers are always named gltf_buffer_N.bin), so each of them gets its
+    # own subfolder; equal stems (cat.stl, cat.obj) also keep the extension
+    folders = {}
+    stems = {}
+    for model in models:
+        folders.setdefault(model.parent, []).append(model)
+        stems.setdefault((model.parent, model.stem), []).append(model)
+
+    targets = {}
+    for model in models:
+        target = output_dir / model.parent.relative_to(root)
+        if len(stems[(model.parent, model.stem)]) > 1:
+            target = target / f"{model.stem}_{model.suffix[1:].lower()}"
+        elif len(folders[model.parent]) > 1:
+            target = target / model.stem
+        targets[model] = target
+
+    options = {
+        'verify': verify,
+        'metrics': tuple(metrics),
+        'use_cache': use_cache,
+        'cache_dir': output_dir / METRICS_CACHE_DIR,
+        'incremental': incremental,
+        'quantize': quantize,
+        'normals': normals,
+        'obj_backend': obj_backend,
+        'obj_precision': obj_precision,
+        'lod_ratios': tuple(lod_ratios),
+        'export_threads': export_threads
+    }
+
+    print(f"\nConverting {len(models)} models with {workers} workers...")
+
+    start = time.perf_counter()
+    results = {}
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(_convert_worker, model, targets[model], options): model
+            for model in models
+        }
+
+        for done, future in enumerate(as_completed(futures), 1):
+            model = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                # The worker process itself died (e.g. out of memory)
+                result = {
+                    'input': str(model),
+                    'status': 'error',
+                    'errors': {'worker': f"{type(e).__name__}: {e}"}
+                }
+            results[model] = result
+
+            if result['status'] != 'ok':
+                tag = "ERROR"
+            elif result.get('skipped'):
+                tag = "SKIP"
+            else:
+                tag = "OK"
+            print(f"  [{done}/{len(models)}] [{tag}] {model.relative_to(root)}")
+
+    elapsed = time.perf_counter() - start
+    files = [results[model] for model in models]
+    failed = sum(1 for r in files if r['status'] != 'ok')
+    skipped = sum(1 for r in files if r.get('skipped'))
+
+    report = {
+        'root': str(root),
+        'workers': workers,
+        'total_files': len(models),
+        'failed_files': failed,
+        'skipped_files': skipped,
+        'elapsed_seconds': elapsed,
+        'files_per_second': len(models) / elapsed if elapsed > 0 else None,
+        'files': files
+    }
+
+    report_file = output_dir / report_name
+    with open(report_file, 'w') as f:
+        json.dump(report, f, indent=2)
+
+    print(f"\n{'='*60}")
+    print(f"Batch complete: {len(models) - failed}/{len(models)} models converted "
+          f"in {elapsed:.2f}s ({skipped} up to date)")
+    print(f"Aggregated report saved to: {report_file}")
+    print(f"{'='*60}")
+
+    return report
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Convert 3D models between STL, OBJ and GLTF formats")
+    parser.add_argument('inputs', nargs='*', default=["cat.stl"],
+                        help="model files, directories or glob patterns")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="worker processes for batch mode (default: all cores)")
+    parser.add_argument('--output', default=None,
+                        help="output directory (default: converted/)")
+    parser.add_argument('--verify', choices=['memory', 'disk'], default='memory',
+                        help="verify round trips in memory with fingerprints, "
+                             "or reload and re-analyze every file from disk")
+    parser.add_argument('--metrics', default=','.join(ALL_METRICS),
+                        help="comma separated metrics to report "
+                             f"(available: {', '.join(ALL_METRICS)})")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="ignore the on-disk metrics cache")
+    parser.add_argument('--force', action='store_true',
+                        help="rebuild every model even if its outputs are up to date")
+    parser.add_argument('--quantize', action='store_true',
+                        help="quantize GLB positions/normals (KHR_mesh_quantization)")
+    parser.add_argument('--no-normals', action='store_true',
+                        help="leave per-vertex normals out of GLB files")
+    parser.add_argument('--obj-backend', choices=OBJ_BACKENDS, default='trimesh',
+                        help="OBJ encoder/decoder: trimesh or the vectorized NumPy codec")
+    parser.add_argument('--obj-precision', type=int, default=DEFAULT_PRECISION,
+                        help="decimal places written for OBJ coordinates")
+    parser.add_argument('--lod', nargs='?', const=','.join(str(r) for r in LOD_RATIOS),
+                        default='', metavar='RATIOS',
+                        help="also export quadric-decimated levels of detail "
+                             f"(default ratios: {','.join(str(r) for r in LOD_RATIOS)})")
+    parser.add_argument('--threads', type=int, default=None,
+                        help="formats exported concurrently per model "
+                             f"(default: {EXPORT_THREADS}, 1 in batch mode)")
+    args = parser.parse_args()
+    metrics = [m.strip() for m in args.metrics.split(',') if m.strip()]
+    lod_ratios = tuple(float(r) for r in args.lod.split(',') if r.strip())
+
+    single_file = len(args.inputs) == 1 and Path(args.inputs[0]).is_file()
+
+    if single_file and args.workers is None:
+        # Convert the cat.stl model
+        input_file = args.inputs[0]
+        output_dir = convert_formats(input_file, args.output, args.verify,
+                                     metrics, not args.no_cache, not args.force,
+                                     args.quantize, not args.no_normals, args.obj_backend,
+                                     args.obj_precision,
+                                     lod_ratios, args.threads or EXPORT_THREADS)
         print(f"\nAll converted files are in: {output_dir}")
-    else:
-        print(f"Error: {input_file} not found in current directory")
+    elif args.inputs == ["cat.stl"] and not Path(args.inputs[0]).exists():
+        print("Error: cat.stl not found in current directory")
         print("Please make sure cat.stl is in the same directory as this script")
+    else:
+        convert_batch(args.inputs, args.output or "converted", args.workers,
+                      verify=args.verify, metrics=metrics, use_cache=not args.no_cache,
+                      incremental=not args.force, quantize=args.quantize,
+                      normals=not args.no_normals,
+                      obj_backend=args.obj_backend, obj_precision=args.obj_precision,
+                      lod_ratios=lod_ratios, export_threads=args.threads or 1)
@@ -0,0 +1,386 @@
+"""
+Quadric Error Mesh Decimation
+Simplifies meshes with Garland-Heckbert quadric error metrics and builds
+level-of-detail chains
+"""
+
+import numpy as np
+import trimesh
+
+from welding import weld_vertices
+
+# Default LOD chain, as fractions of the original face count
+LOD_RATIOS = (0.5, 0.25, 0.1, 0.01)
+
+# No level is reduced below this many faces
+MIN_FACES = 4
+
+# Safety limit on collapse passes per decimation
+MAX_PASSES = 200
+
+# Reject collapses that turn a face normal by more than ~84 degrees
+FLIP_THRESHOLD = 0.1
+
+# Faces handed to matplotlib per plot; larger meshes are simplified first
+PLOT_FACE_BUDGET = 20000
+
+# Grid refinements tried by fit_face_budget before falling back to sampling
+BUDGET_PASSES = 4
+
+def face_quadrics(vertices, faces):
+    """
+    Area weighted fundamental error quadric of every face plane
+
+    Args:
+        vertices: (V, 3) float array
+        faces: (F, 3) int array
+
+    Returns:
+        (F, 4, 4) array
+    """
+    v0, v1, v2 = (vertices[faces[:, i]] for i in range(3))
+    cross = np.cross(v1 - v0, v2 - v0)
+    double_area = np.linalg.norm(cross, axis=1)
+    normal = cross / np.where(double_area > 0, double_area, 1.0)[:, None]
+
+    plane = np.column_stack([normal, -np.einsum('ij,ij->i', normal, v0)])
+    return (double_area / 2.0)[:, None, None] * plane[:, :, None] * plane[:, None, :]
+
+def vertex_quadrics(vertices, faces):
+    """
+    Sum of the quadrics of the faces around every vertex
+
+    Returns:
+        (V, 4, 4) array
+    """
+    per_face = face_quadrics(vertices, faces).reshape(-1, 16)
+    corners = faces.ravel()
+    weights = np.repeat(per_face, 3, axis=0)
+
+    quadrics = np.empty((len(vertices), 16))
+    for j in range(16):
+        quadrics[:, j] = np.bincount(corners, weights=weights[:, j], minlength=len(vertices))
+    return quadrics.reshape(-1, 4, 4)
+
+def _quadric_error(quadrics, points):
+    """Error v^T Q v of (E, 3) points under (E, 4, 4) quadrics"""
+    homogeneous = np.column_stack([points, np.ones(len(points))])
+    return np.einsum('ei,eij,ej->e', homogeneous, quadrics, homogeneous)
+
+def collapse_targets(quadrics, vertices, edges):
+    """
+    Optimal position and error of collapsing every edge
+
+    The position minimizing the summed quadric is used when its 3x3 system
+    is well conditioned and the solution stays near the edge; otherwise the
+    best of the two endpoints and the midpoint is taken.
+
+    Args:
+        quadrics: (V, 4, 4) vertex quadrics
+        vertices: (V, 3) positions
+        edges: (E, 2) vertex index pairs
+
+    Returns:
+        positions: (E, 3) collapse targets
+        cost: (E,) quadric error at the targets
+    """
+    q = quadrics[edges[:, 0]] + quadrics[edges[:, 1]]
+    a, b = vertices[edges[:, 0]], vertices[edges[:, 1]]
+    middle = (a + b) / 2.0
+
+    candidates = np.stack([a, b, middle], axis=1)
+    errors = np.stack([_quadric_error(q, candidates[:, k]) for k in range(3)], axis=1)
+
+    system = q[:, :3, :3]
+    scale = np.trace(system, axis1=1, axis2=2) / 3.0
+    solvable = np.abs(np.linalg.det(system)) > 1e-9 * np.maximum(scale, 1e-300) ** 3
+    if solvable.any():
+        optimal = np.linalg.solve(system[solvable], -q[solvable, :3, 3][:, :, None])[:, :, 0]
+        length = np.linalg.norm(b[solvable] - a[solvable], axis=1)
+        near = np.linalg.norm(optimal - middle[solvable], axis=1) <= length
+
+        index = np.flatnonzero(solvable)[near]
+        extra = np.full((len(edges), 3), np.nan)
+        extra[index] = optimal[near]
+        extra_error = np.full(len(edges), np.inf)
+        extra_error[index] = _quadric_error(q[index], extra[index])
+
+        candidates = np.concatenate([candidates, np.nan_to_num(extra)[:, None]], axis=1)
+        errors = np.column_stack([errors, extra_error])
+
+    best = np.argmin(errors, axis=1)
+    rows = np.arange(len(edges))
+    return candidates[rows, best], np.maximum(errors[rows, best], 0.0)
+
+def _edge_table(faces, vertex_count):
+    """Unique undirected edges (sorted pairs) and how many faces use each"""
+    pairs = np.sort(faces[:, [0, 1, 1, 2, 2, 0]].reshape(-1, 2), axis=1)
+    keys, counts = np.unique(pairs[:, 0] * vertex_count + pairs[:, 1], return_counts=True)
+    return np.column_stack([keys // vertex_count, keys % vertex_count]), counts
+
+def _independent_edges(edges, candidates, rank, vertex_count):
+    """
+    Select candidate edges that are the cheapest within two rings
+
+    An edge is kept when its rank is the minimum over every candidate edge
+    touching its endpoints or their neighbors, so no face is touched by two
+    selected collapses and they can all be applied at once.
+    """
+    best = np.full(vertex_count, np.iinfo(np.int64).max)
+    np.minimum.at(best, candidates[:, 0], rank)
+    np.minimum.at(best, candidates[:, 1], rank)
+
+    ring = best.copy()
+    np.minimum.at(ring, edges[:, 0], best[edges[:, 1]])
+    np.minimum.at(ring, edges[:, 1], best[edges[:, 0]])
+
+    return (ring[candidates[:, 0]] == rank) & (ring[candidates[:, 1]] == rank)
+
+def _link_condition(edges, vertex_count, collapse):
+    """
+    True for edges whose endpoints share exactly two neighbors
+
+    Collapsing an interior edge with more common neighbors pinches the
+    surface into a non-manifold configuration.
+    """
+    both = np.concatenate([edges, edges[:, ::-1]])
+    both = both[np.argsort(both[:, 0] * vertex_count + both[:, 1])]
+    keys = both[:, 0] * vertex_count + both[:, 1]
+    offsets = np.searchsorted(both[:, 0], np.arange(vertex_count + 1))
+
+    # Enumerate the neighbors x of a and test whether (b, x) is an edge
+    a, b = collapse[:, 0], collapse[:, 1]
+    degree = offsets[a + 1] - offsets[a]
+    owner = np.repeat(np.arange(len(collapse)), degree)
+    position = np.arange(degree.sum()) - np.repeat(np.cumsum(degree) - degree, degree)
+    neighbor = both[offsets[a][owner] + position, 1]
+
+    probe = b[owner] * vertex_count + neighbor
+    found = keys[np.minimum(np.searchsorted(keys, probe), len(keys) - 1)] == probe
+    common = np.bincount(owner[found], minlength=len(collapse))
+    return common == 2
+
+def _flips(vertices, faces, collapse, positions):
+    """
+    True for collapses that would turn a surrounding face over
+
+    Every collapse is tested on its own: the faces around both endpoints
+    (except the two that vanish) are moved to the collapse target and their
+    normals compared with the current ones.
+    """
+    corners = faces.ravel()
+    order = np.argsort(corners, kind='stable')
+    offsets = np.searchsorted(corners[order], np.arange(len(vertices) + 1))
+
+    endpoints = collapse.ravel()
+    degree = offsets[endpoints + 1] - offsets[endpoints]
+    owner = np.repeat(np.arange(len(endpoints)) // 2, degree)
+    position = np.arange(degree.sum()) - np.repeat(np.cumsum(degree) - degree, degree)
+    face = order[offsets[endpoints].repeat(degree) + position] // 3
+
+    triangles = faces[face]
+    is_endpoint = (triangles == collapse[owner, :1]) | (triangles == collapse[owner, 1:])
+    survives = is_endpoint.sum(axis=1) == 1
+    owner, triangles, is_endpoint = owner[survives], triangles[survives], is_endpoint[survives]
+
+    before = vertices[triangles]
+    after = np.where(is_endpoint[:, :, None], positions[owner][:, None, :], before)
+    normal_before = np.cross(before[:, 1] - before[:, 0], before[:, 2] - before[:, 0])
+    normal_after = np.cross(after[:, 1] - after[:, 0], after[:, 2] - after[:, 0])
+
+    length = np.linalg.norm(normal_before, axis=1) * np.linalg.norm(normal_after, axis=1)
+    cosine = np.einsum('ij,ij->i', normal_before, normal_after) / np.where(length > 0, length, 1.0)
+    flipped = (cosine < FLIP_THRESHOLD) | (length == 0)
+    return np.bincount(owner[flipped], minlength=len(collapse)) > 0
+
+def quadric_decimate(mesh, target_faces, max_passes=MAX_PASSES):
+    """
+    Reduce a mesh to about `target_faces` faces with quadric error metrics
+
+    Every pass scores all interior edges, picks a set of cheapest edges far
+    enough apart to be collapsed together, rejects those that would break
+    the link condition or flip a face, and applies the rest in bulk. Vertex
+    quadrics are accumulated across collapses as in Garland-Heckbert.
+    Boundary vertices are kept fixed.
+
+    Args:
+        mesh: trimesh.Trimesh (indexed, i.e. welded)
+        target_faces: desired face count
+        max_passes: upper bound on collapse passes
+
+    Returns:
+        trimesh.Trimesh with at most target_faces faces, unless no more
+        valid collapses were found
+    """
+    vertices = np.array(mesh.vertices, dtype=np.float64)
+    faces = np.array(mesh.faces, dtype=np.int64)
+    target_faces = max(int(target_faces), MIN_FACES)
+    quadrics = vertex_quadrics(vertices, faces)
+    count = len(vertices)
+    rng = np.random.default_rng(0)
+
+    for _ in range(max_passes):
+        excess = len(faces) - target_faces
+        if excess <= 0:
+            break
+
+        edges, uses = _edge_table(faces, count)
+        boundary = np.zeros(count, dtype=bool)
+        boundary[edges[uses != 2].ravel()] = True
+        candidates = edges[(uses == 2) & ~boundary[edges].any(axis=1)]
+        if len(candidates) == 0:
+            break
+
+        # Only collapses that keep the surface manifold compete
+        positions, cost = collapse_targets(quadrics, vertices, candidates)
+        valid = _link_condition(edges, count, candidates)
+        candidates, positions, cost = candidates[valid], positions[valid], cost[valid]
+        if len(candidates) == 0:
+            break
+
+        # Random tie breaks keep equal-cost (e.g. flat) regions from
+        # starving the selection of local minima
+        rank = np.empty(len(candidates), dtype=np.int64)
+        rank[np.lexsort((rng.random(len(candidates)), cost))] = np.arange(len(candidates))
+
+        # Select, drop the selected collapses that flip a face and select
+        # again; removing candidates never unselects the valid ones
+        active = np.ones(len(candidates), dtype=bool)
+        checked = np.zeros(len(candidates), dtype=bool)
+        while True:
+            selected = np.zeros(len(candidates), dtype=bool)
+            selected[active] = _independent_edges(edges, candidates[active],
+                                                  rank[active], count)
+            new = np.flatnonzero(selected & ~checked)
+            if len(new) == 0:
+                break
+            checked[new] = True
+            active[new[_flips(vertices, faces, candidates[new], positions[new])]] = False
+
+        index = np.flatnonzero(selected)
+        if len(index) == 0:
+            break
+
+        # Each interior collapse removes two faces
+        index = index[np.argsort(rank[index])][:(excess + 1) // 2]
+        keep, drop = candidates[index, 0], candidates[index, 1]
+
+        vertices[keep] = positions[index]
+        quadrics[keep] += quadrics[drop]
+        remap = np.arange(count)
+        remap[drop] = keep
+
+        faces = remap[faces]
+        faces = faces[(faces[:, 0] != faces[:, 1]) &
+                      (faces[:, 1] != faces[:, 2]) &
+                      (faces[:, 2] != faces[:, 0])]
+
+    # Drop the vertices no face references anymore
+    used = np.zeros(count, dtype=bool)
+    used[faces.ravel()] = True
+    new_index = np.cumsum(used) - 1
+    return trimesh.Trimesh(vertices=vertices[used], faces=new_index[faces], process=False)
+
+def build_lod_chain(mesh, ratios=LOD_RATIOS):
+    """
+    Decimate a mesh into a chain of levels of detail
+
+    Levels are built from the largest ratio down, each simplified from the
+    next larger one, so the chain costs about as much as the first (largest)
+    reduction.
+
+    Args:
+        mesh: trimesh.Trimesh (indexed, i.e. welded)
+        ratios: fractions of the original face count, in any order
+
+    Returns:
+        List of (ratio, trimesh.Trimesh) tuples in the order of `ratios`
+    """
+    levels = {}
+    current = mesh
+    for ratio in sorted(set(ratios), reverse=True):
+        target = max(int(round(ratio * len(mesh.faces))), MIN_FACES)
+        if target < len(current.faces):
+            current = quadric_decimate(current, target)
+        levels[ratio] = current
+    return [(ratio, levels[ratio]) for ratio in ratios]
+
+def cluster_decimate(vertices, faces, cell_size):
+    """
+    Vertex clustering: merge all vertices of each grid cell
+
+    Much coarser than quadric_decimate but linear-time, so its cost stays
+    bounded for any input size.
+
+    Args:
+        vertices: (V, 3) float array
+        faces: (F, 3) int array
+        cell_size: edge length of the clustering grid
+
+    Returns:
+        vertices, faces of the simplified mesh (collapsed faces removed)
+    """
+    welded = weld_vertices(vertices, faces, cell_size)
+    faces = welded['faces']
+    keep = (faces[:, 0] != faces[:, 1]) & (faces[:, 1] != faces[:, 2]) & (faces[:, 2] != faces[:, 0])
+    return welded['vertices'], faces[keep]
+
+def fit_face_budget(vertices, faces, max_faces=PLOT_FACE_BUDGET):
+    """
+    Simplify a mesh until it has at most `max_faces` faces
+
+    Meshes within the budget are returned unchanged. Otherwise the mesh is
+    clustered on a grid sized from the budget (the faces of a surface grow
+    with the square of the cells per axis), refining the guess for up to
+    BUDGET_PASSES passes, and evenly sampled if it is still too large.
+
+    Args:
+        vertices: (V, 3) float array
+        faces: (F, 3) int array
+        max_faces: face budget
+
+    Returns:
+        vertices, faces with len(faces) <= max_faces
+    """
+    vertices = np.asarray(vertices, dtype=np.float64)
+    faces = np.asarray(faces, dtype=np.int64)
+    if len(faces) <= max_faces:
+        return vertices, faces
+
+    extent = max(np.ptp(vertices, axis=0).max(), 1e-12)
+    cells = np.sqrt(max_faces / 4.0)
+    for _ in range(BUDGET_PASSES):
+        simplified, reduced = cluster_decimate(vertices, faces, extent / cells)
+        if len(reduced) <= max_faces:
+            return simplified, reduced
+        cells *= 0.95 * np.sqrt(max_faces / len(reduced))
+
+    keep = np.linspace(0, len(reduced) - 1, max_faces).astype(np.int64)
+    return simplified, reduced[keep]
+
+if __name__ == "__main__":
+    import time
+    from pathlib import Path
+
+    from welding import weld_mesh
+
+    stl_file = "cat.stl"
+
+    if not Path(stl_file).exists():
+        print(f"Error: {stl_file} not found")
+        exit(1)
+
+    mesh = weld_mesh(trimesh.load(stl_file, process=False))
+    print(f"Original: {len(mesh.vertices)} vertices, {len(mesh.faces)} faces, "
+          f"watertight={mesh.is_watertight}")
+
+    start = time.perf_counter()
+    chain = build_lod_chain(mesh)
+    elapsed = time.perf_counter() - start
+
+    for level, (ratio, lod) in enumerate(chain, 1):
+        error = abs(lod.volume - mesh.volume) / abs(mesh.volume) * 100
+        print(f"LOD{level} ({ratio:>5.0%}): {len(lod.vertices):>6} vertices, "
+              f"{len(lod.faces):>6} faces, watertight={lod.is_watertight}, "
+              f"volume change {error:.2f}%")
+    print(f"Chain built in {elapsed * 1000:.1f} ms")
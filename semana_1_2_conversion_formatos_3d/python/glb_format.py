@@ -0,0 +1,295 @@
+"""
+Single-file GLB Writer and Reader
+Packs a mesh into one binary chunk with the narrowest index type and
+optional KHR_mesh_quantization attributes
+"""
+
+import json
+import struct
+
+import numpy as np
+import trimesh
+
+GLB_MAGIC = b'glTF'
+GLB_VERSION = 2
+CHUNK_JSON = 0x4E4F534A
+CHUNK_BIN = 0x004E4942
+
+# glTF component types
+BYTE = 5120
+UNSIGNED_BYTE = 5121
+SHORT = 5122
+UNSIGNED_SHORT = 5123
+UNSIGNED_INT = 5125
+FLOAT = 5126
+
+COMPONENT_DTYPES = {
+    BYTE: np.dtype('<i1'),
+    UNSIGNED_BYTE: np.dtype('<u1'),
+    SHORT: np.dtype('<i2'),
+    UNSIGNED_SHORT: np.dtype('<u2'),
+    UNSIGNED_INT: np.dtype('<u4'),
+    FLOAT: np.dtype('<f4')
+}
+
+TYPE_SIZES = {'SCALAR': 1, 'VEC2': 2, 'VEC3': 3, 'VEC4': 4, 'MAT4': 16}
+
+# bufferView targets
+ARRAY_BUFFER = 34962
+ELEMENT_ARRAY_BUFFER = 34963
+
+TRIANGLES = 4
+
+# Quantized positions use the symmetric int16 range [-32767, 32767]
+POSITION_STEPS = 65534
+
+def index_component_type(vertex_count):
+    """
+    Narrowest index type able to address every vertex
+
+    uint16 is used whenever all indices stay below the 65535 primitive
+    restart value; uint8 indices are avoided since many loaders reject them.
+    """
+    if vertex_count <= 0xFFFF:
+        return UNSIGNED_SHORT
+    return UNSIGNED_INT
+
+class _BinaryBuilder:
+    """Accumulates 4-byte aligned buffer views for the BIN chunk"""
+
+    def __init__(self):
+        self.parts = []
+        self.length = 0
+        self.buffer_views = []
+        self.accessors = []
+
+    def add_view(self, array, target, byte_stride=None):
+        data = np.ascontiguousarray(array).tobytes()
+        padding = (-self.length) % 4
+        if padding:
+            self.parts.append(b'\0' * padding)
+            self.length += padding
+
+        view = {'buffer': 0, 'byteOffset': self.length,
+                'byteLength': len(data), 'target': target}
+        if byte_stride is not None:
+            view['byteStride'] = byte_stride
+
+        self.parts.append(data)
+        self.length += len(data)
+        self.buffer_views.append(view)
+        return len(self.buffer_views) - 1
+
+    def add_accessor(self, view, component_type, count, kind, **extra):
+        accessor = {'bufferView': view, 'componentType': component_type,
+                    'count': int(count), 'type': kind}
+        accessor.update(extra)
+        self.accessors.append(accessor)
+        return len(self.accessors) - 1
+
+    def binary(self):
+        data = b''.join(self.parts)
+        return data + b'\0' * ((-len(data)) % 4)
+
+def build_glb(mesh, quantize=False, include_normals=False):
+    """
+    Encode a mesh as a binary glTF (.glb) file
+
+    Args:
+        mesh: trimesh.Trimesh object
+        quantize: store positions as int16 and normals as normalized int8
+            (KHR_mesh_quantization); the dequantization lives in the node
+            transform, so loaders need no extra decoding step
+        include_normals: also store per-vertex normals
+
+    Returns:
+        bytes of the .glb file
+    """
+    vertices = np.asarray(mesh.vertices, dtype=np.float64)
+    faces = np.asarray(mesh.faces)
+    builder = _BinaryBuilder()
+    node = {'mesh': 0}
+    attributes = {}
+
+    # Indices
+    index_type = index_component_type(len(vertices))
+    indices = faces.astype(COMPONENT_DTYPES[index_type]).ravel()
+    view = builder.add_view(indices, ELEMENT_ARRAY_BUFFER)
+    index_accessor = builder.add_accessor(
+        view, index_type, len(indices), 'SCALAR',
+        min=[int(indices.min())] if len(indices) else [0],
+        max=[int(indices.max())] if len(indices) else [0])
+
+    # Positions
+    if quantize:
+        lower, upper = vertices.min(axis=0), vertices.max(axis=0)
+        center = (lower + upper) / 2.0
+        step = max(float((upper - lower).max()), 1e-12) / POSITION_STEPS
+        quantized = np.round((vertices - center) / step).astype('<i2')
+
+        # Vertex attribute strides must be multiples of 4: pad VEC3 to 8 bytes
+        padded = np.zeros((len(vertices), 4), dtype='<i2')
+        padded[:, :3] = quantized
+        view = builder.add_view(padded, ARRAY_BUFFER, byte_stride=8)
+        attributes['POSITION'] = builder.add_accessor(
+            view, SHORT, len(vertices), 'VEC3',
+            min=quantized.min(axis=0).tolist(), max=quantized.max(axis=0).tolist())
+
+        # Uniform scale keeps normals valid without renormalization
+        node['translation'] = center.tolist()
+        node['scale'] = [step] * 3
+    else:
+        positions = vertices.astype('<f4')
+        view = builder.add_view(positions, ARRAY_BUFFER)
+        attributes['POSITION'] = builder.add_accessor(
+            view, FLOAT, len(vertices), 'VEC3',
+            min=positions.min(axis=0).astype(float).tolist(),
+            max=positions.max(axis=0).astype(float).tolist())
+
+    # Normals
+    if include_normals:
+        normals = np.asarray(mesh.vertex_normals, dtype=np.float64)
+        if quantize:
+            padded = np.zeros((len(normals), 4), dtype='<i1')
+            padded[:, :3] = np.round(np.clip(normals, -1.0, 1.0) * 127.0)
+            view = builder.add_view(padded, ARRAY_BUFFER, byte_stride=4)
+            attributes['NORMAL'] = builder.add_accessor(
+                view, BYTE, len(normals), 'VEC3', normalized=True)
+        else:
+            view = builder.add_view(normals.astype('<f4'), ARRAY_BUFFER)
+            attributes['NORMAL'] = builder.add_accessor(
+                view, FLOAT, len(normals), 'VEC3')
+
+    binary = builder.binary()
+    gltf = {
+        'asset': {'version': '2.0', 'generator': 'convert_formats.py'},
+        'scene': 0,
+        'scenes': [{'nodes': [0]}],
+        'nodes': [node],
+        'meshes': [{'primitives': [{'attributes': attributes,
+                                    'indices': index_accessor,
+                                    'mode': TRIANGLES}]}],
+        'accessors': builder.accessors,
+        'bufferViews': builder.buffer_views,
+        'buffers': [{'byteLength': len(binary)}]
+    }
+    if quantize:
+        gltf['extensionsUsed'] = ['KHR_mesh_quantization']
+        gltf['extensionsRequired'] = ['KHR_mesh_quantization']
+
+    json_chunk = json.dumps(gltf, separators=(',', ':')).encode('utf-8')
+    json_chunk += b' ' * ((-len(json_chunk)) % 4)
+
+    total = 12 + 8 + len(json_chunk) + 8 + len(binary)
+    return b''.join([
+        struct.pack('<4sII', GLB_MAGIC, GLB_VERSION, total),
+        struct.pack('<II', len(json_chunk), CHUNK_JSON), json_chunk,
+        struct.pack('<II', len(binary), CHUNK_BIN), binary
+    ])
+
+def _read_accessor(gltf, binary, index):
+    """Decode an accessor into a float64 (or integer index) array"""
+    accessor = gltf['accessors'][index]
+    view = gltf['bufferViews'][accessor['bufferView']]
+    dtype = COMPONENT_DTYPES[accessor['componentType']]
+    components = TYPE_SIZES[accessor['type']]
+    count = accessor['count']
+
+    start = view.get('byteOffset', 0) + accessor.get('byteOffset', 0)
+    element_size = dtype.itemsize * components
+    stride = view.get('byteStride', element_size)
+
+    # Interleaved/padded views: copy the strided block, then drop the padding
+    block = bytes(binary[start:start + stride * count]).ljust(stride * count, b'\0')
+    rows = np.frombuffer(block, dtype=np.uint8).reshape(count, stride)[:, :element_size]
+    values = np.ascontiguousarray(rows).view(dtype).reshape(count, components)
+
+    if accessor.get('normalized'):
+        limit = float(np.iinfo(dtype).max)
+        return np.maximum(values / limit, -1.0)
+    if accessor['componentType'] == FLOAT:
+        return values.astype(np.float64)
+    return values
+
+def _node_matrix(node):
+    """Local transform of a glTF node as a 4x4 matrix"""
+    if 'matrix' in node:
+        return np.array(node['matrix'], dtype=np.float64).reshape(4, 4).T
+
+    matrix = np.eye(4)
+    if 'scale' in node:
+        matrix = np.diag(list(node['scale']) + [1.0])
+    if 'rotation' in node:
+        x, y, z, w = node['rotation']
+        matrix = trimesh.transformations.quaternion_matrix([w, x, y, z]) @ matrix
+    if 'translation' in node:
+        matrix[:3, 3] += node['translation']
+    return matrix
+
+def read_glb(data):
+    """
+    Decode a .glb file into a single trimesh.Trimesh
+
+    Supports triangle primitives with plain or quantized attributes and
+    applies node transforms, so quantized files come back in model units.
+
+    Args:
+        data: bytes of the .glb file
+
+    Returns:
+        trimesh.Trimesh object (all primitives concatenated)
+    """
+    magic, version, _ = struct.unpack_from('<4sII', data, 0)
+    if magic != GLB_MAGIC or version != GLB_VERSION:
+        raise ValueError("Not a glTF 2.0 binary file")
+
+    offset = 12
+    gltf, binary = None, b''
+    while offset < len(data):
+        length, chunk_type = struct.unpack_from('<II', data, offset)
+        chunk = data[offset + 8:offset + 8 + length]
+        if chunk_type == CHUNK_JSON:
+            gltf = json.loads(chunk)
+        elif chunk_type == CHUNK_BIN:
+            binary = chunk
+        offset += 8 + length
+
+    if gltf is None:
+        raise ValueError("GLB file has no JSON chunk")
+
+    all_vertices, all_faces = [], []
+    vertex_offset = 0
+
+    def visit(node_index, parent):
+        nonlocal vertex_offset
+        node = gltf['nodes'][node_index]
+        matrix = parent @ _node_matrix(node)
+
+        if 'mesh' in node:
+            for primitive in gltf['meshes'][node['mesh']]['primitives']:
+                if primitive.get('mode', TRIANGLES) != TRIANGLES:
+                    continue
+                positions = _read_accessor(gltf, binary, primitive['attributes']['POSITION'])
+                positions = positions @ matrix[:3, :3].T + matrix[:3, 3]
+
+                if 'indices' in primitive:
+                    faces = _read_accessor(gltf, binary, primitive['indices']).reshape(-1, 3)
+                else:
+                    faces = np.arange(len(positions)).reshape(-1, 3)
+
+                all_vertices.append(positions)
+                all_faces.append(faces.astype(np.int64) + vertex_offset)
+                vertex_offset += len(positions)
+
+        for child in node.get('children', []):
+            visit(child, matrix)
+
+    scene = gltf['scenes'][gltf.get('scene', 0)]
+    for root in scene['nodes']:
+        visit(root, np.eye(4))
+
+    if not all_vertices:
+        raise ValueError("GLB file contains no triangle meshes")
+
+    return trimesh.Trimesh(vertices=np.vstack(all_vertices),
+                           faces=np.vstack(all_faces), process=False)
@@ -0,0 +1,187 @@
+"""
+Lazy Mesh Metrics
+Computes named mesh metrics on demand and caches them on disk by content hash
+"""
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+
+import numpy as np
+
+from topology import mesh_topology
+from welding import weld_vertices
+
+# Bump when a metric definition changes so stale cache entries are ignored
+METRICS_VERSION = 4
+
+# Metric name -> function computing it from a trimesh-like mesh, or from the
+# check_topology report of the mesh for the names in TOPOLOGY_METRICS
+METRICS = {
+    'vertices': lambda mesh: len(mesh.vertices),
+    'faces': lambda mesh: len(mesh.faces),
+    'edges': lambda mesh: len(mesh.edges),
+    'is_watertight': lambda report: report['is_watertight'],
+    'is_winding_consistent': lambda report: report['is_winding_consistent'],
+    'boundary_loops': lambda report: report['boundary_loops'],
+    'non_manifold_edges': lambda report: report['non_manifold_edges'],
+    'flipped_faces': lambda report: len(report['flipped_faces']),
+    'volume': lambda mesh: float(mesh.volume),
+    'surface_area': lambda mesh: float(mesh.area),
+    'duplicate_vertices': lambda mesh: weld_vertices(mesh.vertices)['duplicates'],
+    # Raw corners repeated in an STL file (MappedSTL only, None for indexed meshes)
+    'stl_duplicate_corners': lambda mesh: getattr(mesh, 'duplicate_corners', None),
+    'bounds_min': lambda mesh: np.asarray(mesh.bounds)[0].tolist(),
+    'bounds_max': lambda mesh: np.asarray(mesh.bounds)[1].tolist()
+}
+
+ALL_METRICS = tuple(METRICS)
+
+# Metrics read from one shared check_topology report (see MeshMetrics.topology)
+TOPOLOGY_METRICS = ('is_watertight', 'is_winding_consistent', 'boundary_loops',
+                    'non_manifold_edges', 'flipped_faces')
+
+# Metrics that only need array sizes
+COUNT_METRICS = ('vertices', 'faces', 'edges')
+
+def mesh_content_hash(mesh):
+    """
+    Hash the geometry of a mesh
+
+    Meshes that provide their own geometry_digest() (e.g. MappedSTL) are
+    hashed from their raw buffer so no welding is triggered.
+
+    Args:
+        mesh: trimesh.Trimesh or compatible object
+
+    Returns:
+        Hex digest string
+    """
+    if hasattr(mesh, 'geometry_digest'):
+        return mesh.geometry_digest()
+
+    digest = hashlib.sha1()
+    vertices = np.ascontiguousarray(mesh.vertices, dtype=np.float64)
+    faces = np.ascontiguousarray(mesh.faces, dtype=np.int64)
+    digest.update(np.array(vertices.shape + faces.shape, dtype=np.int64).tobytes())
+    digest.update(vertices.tobytes())
+    digest.update(faces.tobytes())
+    return digest.hexdigest()
+
+class MetricsCache:
+    """
+    Directory of JSON files, one per mesh content hash
+
+    Each file is replaced atomically so several processes (and threads) can
+    share the same cache directory.
+    """
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+
+    def _path(self, key):
+        return self.directory / f"{key}.json"
+
+    def load(self, key):
+        """Return the cached metrics for a key (empty dict if missing)"""
+        try:
+            with open(self._path(key)) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+        if entry.get('version') != METRICS_VERSION:
+            return {}
+        return entry.get('metrics', {})
+
+    def store(self, key, metrics):
+        """Merge metrics into the cache entry of a key"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        merged = dict(self.load(key), **metrics)
+
+        tmp_path = self._path(key).with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump({'version': METRICS_VERSION, 'metrics': merged}, f)
+        os.replace(tmp_path, self._path(key))
+
+class MeshMetrics:
+    """
+    Lazily evaluated metrics of one mesh
+
+    Metrics are computed on first access and remembered; with a cache the
+    values are read from and written back to disk keyed by the mesh content.
+
+    Example:
+        metrics = MeshMetrics(mesh, cache=MetricsCache('.metrics_cache'))
+        metrics['faces']                   # computed or cached
+        metrics.get(['volume', 'bounds_min'])
+    """
+
+    def __init__(self, mesh, cache=None):
+        self.mesh = mesh
+        self.cache = cache
+        self._values = {}
+        self._key = None
+        self._loaded = False
+        self._topology = None
+
+    @property
+    def key(self):
+        """Content hash of the mesh (computed once)"""
+        if self._key is None:
+            self._key = mesh_content_hash(self.mesh)
+        return self._key
+
+    def topology(self):
+        """check_topology report of the mesh (computed once, for this content hash)"""
+        if self._topology is None:
+            self._topology = mesh_topology(self.mesh)
+        return self._topology
+
+    def _compute(self, name):
+        if name in TOPOLOGY_METRICS:
+            return METRICS[name](self.topology())
+        return METRICS[name](self.mesh)
+
+    def _load_cache(self):
+        if self.cache is not None and not self._loaded:
+            self._values = dict(self.cache.load(self.key), **self._values)
+            self._loaded = True
+
+    def __getitem__(self, name):
+        if name not in METRICS:
+            raise KeyError(f"Unknown metric: {name}")
+
+        self._load_cache()
+        if name not in self._values:
+            self._values[name] = self._compute(name)
+            if self.cache is not None:
+                self.cache.store(self.key, {name: self._values[name]})
+        return self._values[name]
+
+    def get(self, names=ALL_METRICS):
+        """
+        Compute (or fetch) several metrics at once
+
+        Args:
+            names: iterable of metric names
+
+        Returns:
+            Dictionary of metric name to value, in the requested order
+        """
+        names = list(names)
+        unknown = [n for n in names if n not in METRICS]
+        if unknown:
+            raise KeyError(f"Unknown metrics: {', '.join(unknown)}")
+
+        self._load_cache()
+        missing = [n for n in names if n not in self._values]
+        for name in missing:
+            self._values[name] = self._compute(name)
+
+        if missing and self.cache is not None:
+            self.cache.store(self.key, {n: self._values[n] for n in missing})
+
+        return {name: self._values[name] for name in names}
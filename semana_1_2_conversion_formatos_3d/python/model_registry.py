@@ -0,0 +1,182 @@
+"""
+Loaded Model Registry
+Parses each model file once and shares read-only arrays and derived data
+between figures, within a memory budget
+"""
+
+import os
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+
+from convert_formats import load_mesh
+
+# Default memory budget for loaded models and their derived arrays
+MODEL_BUDGET_MB = 512
+
+def unique_edges(faces):
+    """(E, 2) distinct undirected edges of a triangle array, sorted"""
+    faces = np.asarray(faces, dtype=np.int64)
+    if len(faces) == 0:
+        return np.zeros((0, 2), dtype=np.int64)
+    edges = np.sort(faces[:, [0, 1, 1, 2, 2, 0]].reshape(-1, 2), axis=1)
+    width = int(faces.max()) + 1
+    keys = np.unique(edges[:, 0] * width + edges[:, 1])
+    return np.column_stack([keys // width, keys % width])
+
+def face_normals(vertices, faces):
+    """(F, 3) unit normals of a triangle array (zero for degenerate faces)"""
+    triangles = np.asarray(vertices, dtype=np.float64)[faces]
+    normals = np.cross(triangles[:, 1] - triangles[:, 0], triangles[:, 2] - triangles[:, 0])
+    lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+    return np.divide(normals, lengths, out=np.zeros_like(normals), where=lengths > 0)
+
+# Derived quantity name -> function computing it from (vertices, faces)
+DERIVED = {
+    'edges_unique': lambda vertices, faces: unique_edges(faces),
+    'bounds': lambda vertices, faces: np.array([vertices.min(axis=0), vertices.max(axis=0)]),
+    'face_normals': face_normals
+}
+
+def _read_only(array):
+    """Read-only view of an array (the original stays writeable)"""
+    view = np.asarray(array).view(np.ndarray)
+    view.flags.writeable = False
+    return view
+
+class ModelView:
+    """
+    Read-only handle on a registered model
+
+    Geometry is exposed as non-writeable arrays; derived quantities are
+    computed through the registry on first use and shared by every view.
+    """
+
+    def __init__(self, registry, key, vertices, faces):
+        self._registry = registry
+        self._key = key
+        self.path = Path(key)
+        self.vertices = vertices
+        self.faces = faces
+
+    def derived(self, name):
+        """Cached derived array (see DERIVED)"""
+        return self._registry.derived(self._key, name)
+
+    @property
+    def edges_unique(self):
+        return self.derived('edges_unique')
+
+    @property
+    def bounds(self):
+        return self.derived('bounds')
+
+    @property
+    def face_normals(self):
+        return self.derived('face_normals')
+
+class ModelRegistry:
+    """
+    Least recently used cache of parsed model files
+
+    Files are keyed by resolved path and re-parsed only when their size or
+    modification time changes. Only the vertex and face arrays of the parsed
+    mesh are kept, so the budget accounts for everything that is held; when
+    they exceed it, the least recently used models are dropped.
+
+    Example:
+        registry = ModelRegistry(budget_mb=256)
+        model = registry.get('converted/cat.obj')   # parsed
+        registry.get('converted/cat.obj').edges_unique  # cached
+    """
+
+    def __init__(self, budget_mb=MODEL_BUDGET_MB, loader=load_mesh):
+        self.budget = int(budget_mb * (1 << 20))
+        self.loader = loader
+        self.loads = {}
+        self._entries = OrderedDict()
+
+    @staticmethod
+    def _key(path):
+        return str(Path(path).resolve())
+
+    @staticmethod
+    def _signature(key):
+        stat = os.stat(key)
+        return stat.st_size, stat.st_mtime_ns
+
+    def _entry(self, key):
+        entry = self._entries[key]
+        self._entries.move_to_end(key)
+        return entry
+
+    def get(self, path):
+        """
+        Read-only view of a model, parsing the file only on first use
+
+        Args:
+            path: model file path
+
+        Returns:
+            ModelView
+        """
+        key = self._key(path)
+        signature = self._signature(key)
+        entry = self._entries.get(key)
+
+        if entry is None or entry['signature'] != signature:
+            mesh = self.loader(key)
+            self.loads[key] = self.loads.get(key, 0) + 1
+            entry = {
+                'signature': signature,
+                'view': ModelView(self, key, _read_only(mesh.vertices), _read_only(mesh.faces)),
+                'derived': {}
+            }
+            self._entries[key] = entry
+            self._evict()
+
+        return self._entry(key)['view']
+
+    def derived(self, path, name):
+        """
+        Derived array of a model, computed once per loaded file
+
+        Args:
+            path: model file path
+            name: key of DERIVED
+
+        Returns:
+            Read-only array
+        """
+        if name not in DERIVED:
+            raise KeyError(f"Unknown derived quantity: {name}")
+
+        self.get(path)
+        entry = self._entry(self._key(path))
+
+        if name not in entry['derived']:
+            view = entry['view']
+            entry['derived'][name] = _read_only(DERIVED[name](view.vertices, view.faces))
+            self._evict()
+        return entry['derived'][name]
+
+    @staticmethod
+    def _entry_bytes(entry):
+        view = entry['view']
+        return view.vertices.nbytes + view.faces.nbytes + \
+            sum(array.nbytes for array in entry['derived'].values())
+
+    @property
+    def nbytes(self):
+        """Bytes held by the arrays of every loaded model"""
+        return sum(self._entry_bytes(entry) for entry in self._entries.values())
+
+    def _evict(self):
+        """Drop least recently used models until the budget is met (keeps the newest)"""
+        while len(self._entries) > 1 and self.nbytes > self.budget:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        """Forget every loaded model"""
+        self._entries.clear()
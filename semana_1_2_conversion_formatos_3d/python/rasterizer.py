@@ -0,0 +1,489 @@
+"""
+Z-buffer Mesh Rasterizer
+Renders flat shaded thumbnails of triangle meshes through a pinhole camera
+with vectorized NumPy, without matplotlib
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+from topology import half_edge_keys
+
+# Bounding box pixels of the triangles rasterized per vectorized step
+CANDIDATES_PER_CHUNK = 1 << 22
+
+# Default thumbnail look: light grey-blue surface on a white background
+BASE_COLOR = (150, 175, 210)
+BACKGROUND = (255, 255, 255)
+AMBIENT = 0.25
+LINE_COLOR = (40, 60, 110)
+
+# Line samples drawn in front of the depth buffer may be this much deeper
+# (relative) and still count as visible, so edges are not hidden by their
+# own faces
+DEPTH_TOLERANCE = 2e-3
+
+# Edges shorter than this on screen (in pixels) are not drawn
+MIN_EDGE_PIXELS = 0.5
+
+def create_intrinsic_matrix(fx, fy, cx, cy):
+    """Intrinsic matrix K (same layout as the pinhole camera workshop)"""
+    return np.array([
+        [fx, 0, cx],
+        [0, fy, cy],
+        [0, 0, 1]
+    ], dtype=np.float64)
+
+def look_at(eye, target, up=(0, 0, 1)):
+    """
+    World to camera rotation and translation for a camera at `eye`
+
+    Uses the OpenCV convention of the pinhole model (x right, y down,
+    z forward), so a world point X maps to R @ X + t in camera coordinates.
+    Several cameras are built at once when `eye` is an (N, 3) array.
+
+    Args:
+        eye: camera position, or (N, 3) array of positions
+        target: point the camera looks at
+        up: world direction that appears upwards in the image
+
+    Returns:
+        R: (3, 3) rotation matrix, or (N, 3, 3)
+        t: (3,) translation vector, or (N, 3)
+    """
+    eye = np.asarray(eye, dtype=np.float64)
+    forward = np.asarray(target, dtype=np.float64) - eye
+    forward /= np.linalg.norm(forward, axis=-1, keepdims=True)
+
+    right = np.cross(forward, up)
+    along_up = np.linalg.norm(right, axis=-1, keepdims=True) < 1e-9
+    if along_up.any():
+        # Looking along `up`: any perpendicular axis will do
+        fallback = np.where(np.abs(forward[..., 1:2]) < 0.9, [0, 1, 0], [1, 0, 0])
+        right = np.where(along_up, np.cross(forward, fallback), right)
+    right /= np.linalg.norm(right, axis=-1, keepdims=True)
+    down = np.cross(forward, right)
+
+    R = np.stack([right, down, forward], axis=-2)
+    return R, -np.einsum('...ij,...j->...i', R, eye)
+
+def orbit_cameras(vertices, width, height, azimuths, elevation=25.0, fov=35.0,
+                  up=(0, 0, 1), margin=1.1):
+    """
+    Cameras on a circle around the bounding sphere of a point set
+
+    Every view shares K; the rotations of all azimuths are built in one
+    batched look_at.
+
+    Args:
+        vertices: (N, 3) array of positions
+        width, height: image size in pixels
+        azimuths: (M,) rotations around `up` in degrees
+        elevation: angle above the horizontal plane in degrees
+        fov: vertical field of view in degrees
+        up: world up axis
+        margin: extra space around the model
+
+    Returns:
+        K (3, 3), R (M, 3, 3) and t (M, 3)
+    """
+    vertices = np.asarray(vertices, dtype=np.float64)
+    lower, upper = vertices.min(axis=0), vertices.max(axis=0)
+    center = (lower + upper) / 2.0
+    radius = max(np.linalg.norm(upper - lower) / 2.0, 1e-12)
+
+    focal = (height / 2.0) / np.tan(np.radians(fov) / 2.0)
+    half_angle = np.arctan(min(width, height) / 2.0 / focal)
+    distance = margin * radius / np.sin(half_angle)
+
+    up = np.asarray(up, dtype=np.float64) / np.linalg.norm(up)
+    side = np.cross(up, [1, 0, 0] if abs(up[0]) < 0.9 else [0, 1, 0])
+    side /= np.linalg.norm(side)
+    front = np.cross(side, up)
+
+    a = np.radians(np.atleast_1d(np.asarray(azimuths, dtype=np.float64)))[:, None]
+    e = np.radians(elevation)
+    directions = np.cos(e) * (np.cos(a) * front + np.sin(a) * side) + np.sin(e) * up
+
+    K = create_intrinsic_matrix(focal, focal, width / 2.0, height / 2.0)
+    R, t = look_at(center + distance * directions, center, up)
+    return K, R, t
+
+def orbit_camera(vertices, width, height, azimuth=45.0, elevation=25.0, fov=35.0,
+                 up=(0, 0, 1), margin=1.1):
+    """
+    Camera framing the bounding sphere of a point set
+
+    Args:
+        vertices: (N, 3) array of positions
+        width, height: image size in pixels
+        azimuth: rotation around `up` in degrees
+        elevation: angle above the horizontal plane in degrees
+        fov: vertical field of view in degrees
+        up: world up axis
+        margin: extra space around the model
+
+    Returns:
+        K, R, t of the camera
+    """
+    K, R, t = orbit_cameras(vertices, width, height, [azimuth], elevation, fov, up, margin)
+    return K, R[0], t[0]
+
+def rasterize(vertices, faces, K, R, t, width, height, near=1e-6,
+              chunk=CANDIDATES_PER_CHUNK):
+    """
+    Depth buffered visibility of every pixel
+
+    Vertices are projected as in full_projection (K @ (R @ X + t), divided by
+    depth). Every triangle is split into pixel rows, the edge equations give
+    the exact span of covered pixel centres on each row, and only those
+    pixels are generated; interpolated inverse depth is resolved per pixel
+    with np.maximum.at.
+    Triangles with a vertex behind the near plane are skipped and
+    sub-pixel triangles simply cover no pixel centre, so the work scales
+    with the covered image area rather than the face count.
+
+    Args:
+        vertices: (V, 3) array of world positions
+        faces: (F, 3) int array of vertex indices
+        K: (3, 3) intrinsic matrix
+        R: (3, 3) world to camera rotation
+        t: (3,) translation
+        width, height: image size in pixels
+        near: smallest camera depth that is drawn
+        chunk: bounding box pixels rasterized per step (bounds peak memory)
+
+    Returns:
+        depth: (height, width) camera depth, inf where empty
+        face_index: (height, width) int64 index of the visible face, -1 where empty
+    """
+    camera = np.asarray(vertices, dtype=np.float64) @ R.T + np.ravel(t)
+    depth = camera[:, 2]
+    front = depth > near
+    pixels = (camera[front] @ K.T)[:, :2] / depth[front, None]
+
+    # Drop triangles crossing the near plane before touching their corners;
+    # corners are handled as three contiguous index arrays (faster than
+    # reducing over the short axis of an (F, 3) array)
+    corner_index = np.ascontiguousarray(np.asarray(faces, dtype=np.int64).reshape(-1, 3).T)
+    keep = np.flatnonzero(front[corner_index[0]] & front[corner_index[1]] & front[corner_index[2]])
+    slot = np.cumsum(front) - 1
+    corner_index = [slot[i[keep]] for i in corner_index]
+    x0, x1, x2 = (pixels[i, 0] for i in corner_index)
+    y0, y1, y2 = (pixels[i, 1] for i in corner_index)
+
+    # Screen bounding box of the pixel centres (i + 0.5) inside each triangle
+    lower = np.empty((len(keep), 2), dtype=np.int64)
+    upper = np.empty((len(keep), 2), dtype=np.int64)
+    for axis, (p0, p1, p2), size in ((0, (x0, x1, x2), width), (1, (y0, y1, y2), height)):
+        low = np.minimum(np.minimum(p0, p1), p2) - 0.5
+        high = np.maximum(np.maximum(p0, p1), p2) - 0.5
+        lower[:, axis] = np.ceil(np.clip(low, 0, size))
+        upper[:, axis] = np.floor(np.clip(high, -1, size - 1))
+    spans = upper - lower + 1
+
+    covers = (spans[:, 0] > 0) & (spans[:, 1] > 0)
+    keep, lower, spans = keep[covers], lower[covers], spans[covers]
+    x0, x1, x2, y0, y1, y2 = (v[covers] for v in (x0, x1, x2, y0, y1, y2))
+    corner_index = [i[covers] for i in corner_index]
+
+    doubled = (x1 - x0) * (y2 - y0) - (x2 - x0) * (y1 - y0)
+    valid = doubled != 0
+    keep, lower, spans = keep[valid], lower[valid], spans[valid]
+    x0, y0, x1, y1, x2, y2 = (v[valid] for v in (x0, y0, x1, y1, x2, y2))
+    scale = 1.0 / doubled[valid]
+    inverse = 1.0 / np.column_stack([depth[front][i[valid]] for i in corner_index])
+
+    # Barycentric weights as affine functions of the pixel: w = a * x + b * y + c;
+    # inverse depth is affine too: a_z * x + b_z * y + c_z
+    a = np.stack([y1 - y2, y2 - y0, y0 - y1], axis=1) * scale[:, None]
+    b = np.stack([x2 - x1, x0 - x2, x1 - x0], axis=1) * scale[:, None]
+    c = np.stack([x1 * y2 - x2 * y1, x2 * y0 - x0 * y2, x0 * y1 - x1 * y0], axis=1) * scale[:, None]
+    a_z, b_z, c_z = ((coefficient * inverse).sum(axis=1) for coefficient in (a, b, c))
+
+    best = np.zeros(width * height)
+    face_index = np.full(width * height, -1, dtype=np.int64)
+
+    # Chunks of triangles whose bounding boxes hold at most `chunk` pixels
+    areas = spans[:, 0] * spans[:, 1]
+    cumulative = np.cumsum(areas)
+    splits = np.searchsorted(cumulative, np.arange(chunk, cumulative[-1] if len(keep) else 0, chunk),
+                             side='right')
+    edges = np.unique(np.concatenate([[0], splits, [len(keep)]]))
+
+    for start, stop in zip(edges[:-1], edges[1:]):
+        # One entry per (triangle, pixel row)
+        rows = spans[start:stop, 1]
+        tri = np.repeat(np.arange(start, stop), rows)
+        py = lower[tri, 1] + np.arange(len(tri)) - np.repeat(np.cumsum(rows) - rows, rows)
+
+        # Exact span of covered pixel centres: every edge bounds x from one side
+        left = np.full(len(tri), -np.inf)
+        right = np.full(len(tri), np.inf)
+        empty = np.zeros(len(tri), dtype=bool)
+        for k in range(3):
+            slope = a[tri, k]
+            offset = b[tri, k] * (py + 0.5) + c[tri, k]
+            with np.errstate(divide='ignore', invalid='ignore'):
+                bound = -offset / slope
+            np.maximum(left, bound, out=left, where=slope > 0)
+            np.minimum(right, bound, out=right, where=slope < 0)
+            empty |= (slope == 0) & (offset < 0)
+
+        first = np.maximum(np.ceil(left - 0.5), lower[tri, 0])
+        last = np.minimum(np.floor(right - 0.5), lower[tri, 0] + spans[tri, 0] - 1)
+        counts = np.where(empty, 0, np.maximum(last - first + 1, 0)).astype(np.int64)
+
+        # One entry per covered pixel
+        run = np.repeat(np.arange(len(tri)), counts)
+        px = first.astype(np.int64)[run] + np.arange(len(run)) - np.repeat(np.cumsum(counts) - counts, counts)
+        tri, py = tri[run], py[run]
+
+        inv_depth = a_z[tri] * (px + 0.5) + b_z[tri] * (py + 0.5) + c_z[tri]
+        pixel = py * width + px
+        np.maximum.at(best, pixel, inv_depth)
+        winner = inv_depth >= best[pixel]
+        face_index[pixel[winner]] = keep[tri[winner]]
+
+    depth_buffer = np.full(width * height, np.inf)
+    covered = face_index >= 0
+    depth_buffer[covered] = 1.0 / best[covered]
+    return depth_buffer.reshape(height, width), face_index.reshape(height, width)
+
+def shade(vertices, faces, face_index, R, t, color=BASE_COLOR, background=BACKGROUND,
+          ambient=AMBIENT):
+    """
+    Flat Lambert shading of a rasterized face buffer
+
+    The light sits at the camera; faces are lit on both sides so meshes with
+    inconsistent winding still render correctly.
+
+    Args:
+        vertices: (V, 3) array of world positions
+        faces: (F, 3) int array of vertex indices
+        face_index: buffer returned by rasterize
+        R, t: camera extrinsics used for rasterize
+        color: RGB surface color
+        background: RGB color of empty pixels
+        ambient: light received by faces seen edge-on
+
+    Returns:
+        (height, width, 3) uint8 image
+    """
+    vertices = np.asarray(vertices, dtype=np.float64)
+    faces = np.asarray(faces, dtype=np.int64).reshape(-1, 3)
+
+    visible = np.unique(face_index[face_index >= 0])
+    triangles = vertices[faces[visible]]
+    normals = np.cross(triangles[:, 1] - triangles[:, 0], triangles[:, 2] - triangles[:, 0])
+    normals /= np.maximum(np.linalg.norm(normals, axis=1, keepdims=True), 1e-30)
+
+    # Direction from each face towards the camera centre -R^T t
+    eye = -R.T @ np.ravel(t)
+    view = eye - triangles.mean(axis=1)
+    view /= np.maximum(np.linalg.norm(view, axis=1, keepdims=True), 1e-30)
+    light = ambient + (1.0 - ambient) * np.abs(np.einsum('ij,ij->i', normals, view))
+
+    palette = np.vstack([np.asarray(background, dtype=np.float64),
+                         light[:, None] * np.asarray(color, dtype=np.float64)])
+    lookup = np.searchsorted(visible, face_index) + 1
+    lookup[face_index < 0] = 0
+    return palette[lookup].round().astype(np.uint8)
+
+def visible_edges(vertices, faces, eye=None, direction=None):
+    """
+    Distinct edges with at least one face turned towards the viewer
+
+    Back-facing faces are found from their winding, so an edge is kept when
+    any face using it is front facing. Edges are deduplicated through the
+    packed half-edge keys of topology.half_edge_keys.
+
+    Args:
+        vertices: (V, 3) array of positions
+        faces: (F, 3) int array of vertex indices
+        eye: camera position (perspective view)
+        direction: unit vector towards an orthographic viewer; when neither
+            is given every edge is returned
+
+    Returns:
+        (E, 2) int64 array of vertex index pairs
+    """
+    vertices = np.asarray(vertices, dtype=np.float64)
+    faces = np.asarray(faces, dtype=np.int64).reshape(-1, 3)
+    count = len(vertices)
+
+    if eye is not None or direction is not None:
+        v0, v1, v2 = (vertices[faces[:, k]] for k in range(3))
+        normals = np.cross(v1 - v0, v2 - v0)
+        towards = np.asarray(eye, dtype=np.float64) - v0 if eye is not None else direction
+        front = np.einsum('ij,ij->i', normals, np.broadcast_to(towards, normals.shape)) > 0
+        faces = faces[front]
+
+    keys = half_edge_keys(faces, count) >> np.uint64(1)
+    keys.sort()
+    keys = keys[np.concatenate([[True], keys[1:] != keys[:-1]])] if len(keys) else keys
+    width = np.uint64(max(count, 1))
+    return np.column_stack([keys // width, keys % width]).astype(np.int64)
+
+def draw_lines(image, start, end, color=LINE_COLOR, depth=None, tolerance=DEPTH_TOLERANCE,
+               chunk=CANDIDATES_PER_CHUNK):
+    """
+    Draw line segments into an image buffer, optionally depth tested
+
+    Every segment is sampled once per pixel step along its major axis; all
+    samples of a chunk of segments are generated and written in one
+    vectorized pass. Depth is interpolated as inverse depth, like the
+    triangle rasterizer.
+
+    Args:
+        image: (H, W, 3) uint8 array, modified in place
+        start, end: (E, 3) arrays of pixel x, pixel y and camera depth
+        color: RGB line color
+        depth: optional (H, W) depth buffer from rasterize; hidden samples
+            are skipped
+        tolerance: relative depth slack of the visibility test
+        chunk: samples generated per step
+
+    Returns:
+        Number of pixels written
+    """
+    height, width = image.shape[:2]
+    start, end = np.asarray(start, dtype=np.float64), np.asarray(end, dtype=np.float64)
+    delta = end[:, :2] - start[:, :2]
+    steps = np.ceil(np.abs(delta).max(axis=1)).astype(np.int64) + 1
+    inverse = 1.0 / start[:, 2], 1.0 / end[:, 2]
+
+    cumulative = np.cumsum(steps)
+    splits = np.searchsorted(cumulative, np.arange(chunk, cumulative[-1] if len(steps) else 0, chunk),
+                             side='right')
+    edges = np.unique(np.concatenate([[0], splits, [len(steps)]]))
+
+    written = 0
+    for first, last in zip(edges[:-1], edges[1:]):
+        counts = steps[first:last]
+        segment = np.repeat(np.arange(first, last), counts)
+        local = np.arange(len(segment)) - np.repeat(cumulative[first:last] - counts, counts)
+        s = local / np.maximum(steps[segment] - 1, 1)
+
+        px = np.floor(start[segment, 0] + s * delta[segment, 0]).astype(np.int64)
+        py = np.floor(start[segment, 1] + s * delta[segment, 1]).astype(np.int64)
+        inside = (px >= 0) & (px < width) & (py >= 0) & (py < height)
+        px, py, s, segment = px[inside], py[inside], s[inside], segment[inside]
+
+        if depth is not None:
+            z = 1.0 / (inverse[0][segment] + s * (inverse[1][segment] - inverse[0][segment]))
+            shown = z <= depth[py, px] * (1.0 + tolerance)
+            px, py = px[shown], py[shown]
+
+        image[py, px] = color
+        written += len(px)
+    return written
+
+def render_wireframe(mesh, width=512, height=512, azimuth=45.0, elevation=25.0, fov=35.0,
+                     up=(0, 0, 1), color=LINE_COLOR, background=BACKGROUND, hidden=True,
+                     min_length=MIN_EDGE_PIXELS):
+    """
+    Render every visible edge of a mesh from an orbit camera
+
+    Back-facing edges are culled first, then edges behind the near plane or
+    shorter than `min_length` pixels on screen; with `hidden` the remaining
+    ones are depth tested against the rasterized faces.
+
+    Returns:
+        image: (height, width, 3) uint8 image
+        drawn: number of edges drawn
+    """
+    vertices, faces = np.asarray(mesh.vertices, dtype=np.float64), np.asarray(mesh.faces)
+    K, R, t = orbit_camera(vertices, width, height, azimuth, elevation, fov, up)
+    edges = visible_edges(vertices, faces, eye=-R.T @ np.ravel(t))
+
+    camera = vertices @ R.T + np.ravel(t)
+    depth = camera[:, 2]
+    front = (depth[edges] > 1e-6).all(axis=1)
+    edges = edges[front]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        screen = np.column_stack([(camera @ K.T)[:, :2] / depth[:, None], depth])
+
+    start, end = screen[edges[:, 0]], screen[edges[:, 1]]
+    long_enough = np.hypot(*(end[:, :2] - start[:, :2]).T) >= min_length
+    start, end = start[long_enough], end[long_enough]
+
+    image = np.empty((height, width, 3), dtype=np.uint8)
+    image[:] = background
+    depth_buffer = rasterize(vertices, faces, K, R, t, width, height)[0] if hidden else None
+    draw_lines(image, start, end, color, depth_buffer)
+    return image, len(start)
+
+def render_mesh(mesh, width=256, height=256, azimuth=45.0, elevation=25.0, fov=35.0,
+                up=(0, 0, 1), color=BASE_COLOR, background=BACKGROUND):
+    """
+    Render a trimesh-like mesh from an orbit camera
+
+    Returns:
+        (height, width, 3) uint8 image
+    """
+    vertices, faces = np.asarray(mesh.vertices), np.asarray(mesh.faces)
+    K, R, t = orbit_camera(vertices, width, height, azimuth, elevation, fov, up)
+    _, face_index = rasterize(vertices, faces, K, R, t, width, height)
+    return shade(vertices, faces, face_index, R, t, color, background)
+
+def save_thumbnail(mesh, output_path, size=256, wireframe=False, **options):
+    """
+    Render a mesh and write it as a PNG
+
+    Args:
+        mesh: trimesh.Trimesh or compatible object
+        output_path: destination .png file
+        size: width and height in pixels
+        wireframe: draw the visible edges (render_wireframe) instead of faces
+        options: extra keyword arguments of render_mesh / render_wireframe
+
+    Returns:
+        Path of the written file
+    """
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    if wireframe:
+        image = render_wireframe(mesh, size, size, **options)[0]
+    else:
+        image = render_mesh(mesh, size, size, **options)
+    Image.fromarray(image).save(output_path)
+    return output_path
+
+if __name__ == "__main__":
+    from convert_formats import find_models, load_mesh
+
+    parser = argparse.ArgumentParser(
+        description="Render PNG thumbnails of meshes with a NumPy z-buffer")
+    parser.add_argument('inputs', nargs='*', default=["cat.stl"],
+                        help="model files or directories")
+    parser.add_argument('--output', default='thumbnails', help="output directory")
+    parser.add_argument('--size', type=int, default=256, help="thumbnail size in pixels")
+    parser.add_argument('--azimuth', type=float, default=45.0)
+    parser.add_argument('--elevation', type=float, default=25.0)
+    parser.add_argument('--wireframe', action='store_true',
+                        help="draw visible edges instead of shaded faces")
+    args = parser.parse_args()
+
+    models = find_models(args.inputs)
+    if not models:
+        print("Error: no model files found")
+        exit(1)
+
+    total = 0.0
+    for path in models:
+        mesh = load_mesh(path)
+        start = time.perf_counter()
+        output = save_thumbnail(mesh, Path(args.output) / f"{path.stem}{path.suffix.replace('.', '_')}.png",
+                                args.size, args.wireframe,
+                                azimuth=args.azimuth, elevation=args.elevation)
+        elapsed = time.perf_counter() - start
+        total += elapsed
+        print(f"[OK] {path} ({len(mesh.faces):,} faces) -> {output} in {elapsed * 1000:.1f} ms")
+
+    print(f"\n{len(models)} thumbnails in {total:.2f} s "
+          f"({total * 1000 / len(models):.1f} ms per model, excluding loading)")
@@ -0,0 +1,249 @@
+"""
+Memory-mapped Binary STL Reader
+Exposes the triangles of a binary STL file as a zero-copy NumPy view
+"""
+
+import hashlib
+
+import numpy as np
+import trimesh
+from pathlib import Path
+
+from topology import check_topology
+from welding import weld_vertices
+
+# Binary STL layout: 80 byte header, uint32 triangle count, then one
+# 50 byte record per triangle (normal, three vertices, attribute count)
+STL_HEADER_SIZE = 80
+STL_DATA_OFFSET = 84
+STL_TRIANGLE_DTYPE = np.dtype([
+    ('normal', '<f4', (3,)),
+    ('vertices', '<f4', (3, 3)),
+    ('attributes', '<u2')
+])
+
+# Triangles processed at once when reducing over the mapped buffer
+CHUNK_SIZE = 1 << 20
+
+def binary_stl_count(file_path):
+    """
+    Validate a binary STL file and return its triangle count
+
+    Args:
+        file_path: path to the STL file
+
+    Returns:
+        (header, count): 80 byte header and number of triangle records
+
+    Raises:
+        ValueError: if the file size doesn't match a binary STL layout
+    """
+    path = Path(file_path)
+    file_size = path.stat().st_size
+
+    if file_size < STL_DATA_OFFSET:
+        raise ValueError(f"{path.name} is too small to be a binary STL")
+
+    with open(path, 'rb') as f:
+        header = f.read(STL_HEADER_SIZE)
+        count = int(np.frombuffer(f.read(4), dtype='<u4')[0])
+
+    expected_size = STL_DATA_OFFSET + count * STL_TRIANGLE_DTYPE.itemsize
+    if file_size != expected_size:
+        raise ValueError(
+            f"{path.name} is not a binary STL "
+            f"(expected {expected_size} bytes, found {file_size})")
+
+    return header, count
+
+class MappedSTL:
+    """
+    Binary STL file mapped into memory
+
+    Normals and triangles are views into the mapped file, nothing is read
+    until it is accessed. Cheap statistics (bounds, area, volume) are
+    computed in chunks straight from the buffer; the welded indexed mesh is
+    only built when vertices, faces or topology are requested.
+
+    The attribute names mirror trimesh.Trimesh so instances can be passed to
+    convert_formats.analyze_mesh directly.
+    """
+
+    def __init__(self, file_path):
+        self.path = Path(file_path)
+        self.header, count = binary_stl_count(self.path)
+
+        if count > 0:
+            self.records = np.memmap(self.path, dtype=STL_TRIANGLE_DTYPE, mode='r',
+                                     offset=STL_DATA_OFFSET, shape=(count,))
+        else:
+            self.records = np.zeros(0, dtype=STL_TRIANGLE_DTYPE)
+
+        self._welded = None
+        self._mesh = None
+        self._topology = None
+        self._bounds = None
+        self._area = None
+        self._volume = None
+
+    def __len__(self):
+        return len(self.records)
+
+    @property
+    def normals(self):
+        """Face normals stored in the file, (N, 3) float32 view"""
+        return self.records['normal']
+
+    @property
+    def triangles(self):
+        """Triangle corners, (N, 3, 3) float32 view"""
+        return self.records['vertices']
+
+    def _chunks(self):
+        """Yield consecutive (M, 3, 3) float64 blocks of triangles"""
+        triangles = self.triangles
+        for start in range(0, len(triangles), CHUNK_SIZE):
+            yield triangles[start:start + CHUNK_SIZE].astype(np.float64)
+
+    @property
+    def bounds(self):
+        """Axis aligned bounding box, (2, 3) array"""
+        if self._bounds is None:
+            if len(self) == 0:
+                self._bounds = np.zeros((2, 3))
+            else:
+                lower = np.full(3, np.inf)
+                upper = np.full(3, -np.inf)
+                for chunk in self._chunks():
+                    points = chunk.reshape(-1, 3)
+                    lower = np.minimum(lower, points.min(axis=0))
+                    upper = np.maximum(upper, points.max(axis=0))
+                self._bounds = np.array([lower, upper])
+        return self._bounds
+
+    def _integrate(self):
+        """Accumulate surface area and signed volume in one pass"""
+        area = 0.0
+        volume = 0.0
+        for chunk in self._chunks():
+            v0, v1, v2 = chunk[:, 0], chunk[:, 1], chunk[:, 2]
+            area += np.linalg.norm(np.cross(v1 - v0, v2 - v0), axis=1).sum() / 2.0
+            volume += np.einsum('ij,ij->', v0, np.cross(v1, v2)) / 6.0
+        self._area = float(area)
+        self._volume = float(volume)
+
+    @property
+    def area(self):
+        """Total surface area"""
+        if self._area is None:
+            self._integrate()
+        return self._area
+
+    @property
+    def volume(self):
+        """Signed volume enclosed by the triangles"""
+        if self._volume is None:
+            self._integrate()
+        return self._volume
+
+    def geometry_digest(self):
+        """SHA-1 of the triangle records, read from the mapped buffer in chunks"""
+        digest = hashlib.sha1(b'binary-stl')
+        for start in range(0, len(self.records), CHUNK_SIZE):
+            digest.update(self.records[start:start + CHUNK_SIZE].tobytes())
+        return digest.hexdigest()
+
+    def weld(self):
+        """
+        Merge bit-identical corners into an indexed mesh
+
+        Returns:
+            vertices: (V, 3) float64 array of unique positions
+            faces: (N, 3) int64 array of indices into vertices
+        """
+        if self._welded is None:
+            corners = self.triangles.reshape(-1, 3)
+            welded = weld_vertices(corners, tolerance=0)
+            vertices = welded['vertices'].astype(np.float64)
+            faces = welded['remap'].reshape(-1, 3)
+            self._welded = (vertices, faces)
+        return self._welded
+
+    @property
+    def vertices(self):
+        """Welded unique vertices (built on first access)"""
+        return self.weld()[0]
+
+    @property
+    def faces(self):
+        """Welded face indices (built on first access)"""
+        return self.weld()[1]
+
+    @property
+    def duplicate_vertices(self):
+        """Welded vertices that a tolerance weld still merges, as for a trimesh mesh"""
+        return weld_vertices(self.vertices)['duplicates']
+
+    @property
+    def duplicate_corners(self):
+        """Stored corners that repeat an earlier one bit for bit (3N minus the welded vertices)"""
+        return 3 * len(self) - len(self.vertices)
+
+    @property
+    def edges(self):
+        """Directed face edges, (3N, 2)"""
+        return self.faces[:, [0, 1, 1, 2, 2, 0]].reshape(-1, 2)
+
+    def to_trimesh(self):
+        """Welded mesh as a trimesh.Trimesh (built on first access)"""
+        if self._mesh is None:
+            vertices, faces = self.weld()
+            self._mesh = trimesh.Trimesh(vertices=vertices, faces=faces, process=False,
+                                         metadata={'header': self.header.decode('utf-8', 'ignore')})
+        return self._mesh
+
+    def topology(self):
+        """check_topology of the welded faces (computed once)"""
+        if self._topology is None:
+            vertices, faces = self.weld()
+            self._topology = check_topology(faces, len(vertices))
+        return self._topology
+
+    @property
+    def is_watertight(self):
+        return self.topology()['is_watertight']
+
+    @property
+    def is_winding_consistent(self):
+        return self.topology()['is_winding_consistent']
+
+def open_stl(file_path):
+    """
+    Map a binary STL file, or fall back to trimesh for ASCII files
+
+    Args:
+        file_path: path to the STL file
+
+    Returns:
+        MappedSTL for binary files, trimesh.Trimesh otherwise
+    """
+    try:
+        return MappedSTL(file_path)
+    except ValueError:
+        return trimesh.load(str(file_path))
+
+if __name__ == "__main__":
+    from convert_formats import analyze_mesh
+
+    stl_file = "cat.stl"
+
+    if not Path(stl_file).exists():
+        print(f"Error: {stl_file} not found")
+        exit(1)
+
+    mapped = MappedSTL(stl_file)
+    print(f"Mapped {len(mapped)} triangles from {stl_file}")
+    header = mapped.header.rstrip(b'\0').decode('ascii', 'replace')
+    print(f"Header: {header}")
+
+    analyze_mesh(mapped, 'stl (mmap)')
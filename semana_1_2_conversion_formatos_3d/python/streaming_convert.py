@@ -0,0 +1,352 @@
+"""
+Out-of-core STL Conversion
+Streams a binary STL into OBJ or PLY with bounded memory, welding vertices
+through hash-partitioned spill files
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from stl_reader import STL_DATA_OFFSET, STL_TRIANGLE_DTYPE, binary_stl_count
+from welding import _hash_rows, group_rows
+
+# Triangles read from the input per step (~12.5 MB of STL records)
+CHUNK_TRIANGLES = 1 << 18
+
+# Target corners per spill partition; only one partition is loaded at a time
+PARTITION_CORNERS = 1 << 20
+
+# Upper bound on simultaneously open spill files; with more partitions the
+# records are spilled in groups of partitions first (see _spill)
+MAX_OPEN_FILES = 256
+
+# Spill records: bit pattern of a corner and its position in the input
+CORNER_DTYPE = np.dtype([('key', '<u4', (3,)), ('corner', '<u8')])
+
+# Spill records: input corner and the welded vertex it maps to
+REMAP_DTYPE = np.dtype([('corner', '<u8'), ('vertex', '<u4')])
+
+PLY_FACE_DTYPE = np.dtype([('count', 'u1'), ('indices', '<i4', (3,))])
+
+def _obj_header(f, name, vertex_count, face_count):
+    f.write(f"# Streamed from {name}\n"
+            f"# {vertex_count} vertices, {face_count} faces\n".encode('ascii'))
+
+def _obj_vertices(f, vertices):
+    np.savetxt(f, vertices, fmt='v %.9g %.9g %.9g')
+
+def _obj_faces(f, faces):
+    np.savetxt(f, faces + 1, fmt='f %d %d %d')
+
+def _ply_header(f, name, vertex_count, face_count):
+    f.write((
+        "ply\n"
+        "format binary_little_endian 1.0\n"
+        f"comment Streamed from {name}\n"
+        f"element vertex {vertex_count}\n"
+        "property float x\n"
+        "property float y\n"
+        "property float z\n"
+        f"element face {face_count}\n"
+        "property list uchar int vertex_indices\n"
+        "end_header\n").encode('ascii'))
+
+def _ply_vertices(f, vertices):
+    f.write(np.ascontiguousarray(vertices, dtype='<f4').tobytes())
+
+def _ply_faces(f, faces):
+    records = np.empty(len(faces), dtype=PLY_FACE_DTYPE)
+    records['count'] = 3
+    records['indices'] = faces
+    f.write(records.tobytes())
+
+# Output format -> (header, vertex block, face block) writers
+WRITERS = {
+    'obj': (_obj_header, _obj_vertices, _obj_faces),
+    'ply': (_ply_header, _ply_vertices, _ply_faces)
+}
+
+def _peak_rss_mb():
+    """Peak resident set size of this process in MB (None if unavailable)"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in kilobytes elsewhere
+    return peak / (1 << 20) if os.uname().sysname == 'Darwin' else peak / 1024
+
+def _scatter(records, partition, files):
+    """Append every record to the spill file of its partition"""
+    order = np.argsort(partition, kind='stable')
+    bounds = np.searchsorted(partition[order], np.arange(len(files) + 1))
+    for index, f in enumerate(files):
+        start, stop = bounds[index], bounds[index + 1]
+        if stop > start:
+            records[order[start:stop]].tofile(f)
+
+def _read_records(path, dtype, block):
+    """Yield consecutive blocks of spill records, deleting the file afterwards"""
+    with open(path, 'rb') as f:
+        while True:
+            records = np.fromfile(f, dtype=dtype, count=block)
+            if len(records) == 0:
+                break
+            yield records
+    path.unlink()
+
+def _spill(blocks, partition_of, paths, dtype, block, offset=0):
+    """
+    Write records to the spill file of their partition
+
+    At most MAX_OPEN_FILES files are open at once: with more partitions the
+    records are first spilled into group files of consecutive partitions,
+    and each group file is then split the same way, so the partition count
+    (and with it the input size) is not limited by the open-file limit.
+
+    Args:
+        blocks: iterable of record arrays
+        partition_of: function mapping records to their partition indices
+        paths: spill file of partitions offset, offset + 1, ...
+        dtype: record dtype
+        block: records read at a time when splitting group files
+        offset: partition index of paths[0]
+    """
+    if len(paths) <= MAX_OPEN_FILES:
+        files = [open(p, 'wb') for p in paths]
+        try:
+            for records in blocks:
+                _scatter(records, partition_of(records) - offset, files)
+        finally:
+            for f in files:
+                f.close()
+        return
+
+    group_size = -(-len(paths) // MAX_OPEN_FILES)
+    starts = range(0, len(paths), group_size)
+    group_paths = [paths[start].with_name(f"{paths[start].stem}_group{group_size}.bin")
+                   for start in starts]
+    _spill(blocks, lambda records: (partition_of(records) - offset) // group_size,
+           group_paths, dtype, block)
+
+    for start, group_path in zip(starts, group_paths):
+        _spill(_read_records(group_path, dtype, block), partition_of,
+               paths[start:start + group_size], dtype, block, offset + start)
+
+def _read_triangles(input_path, count, chunk_triangles):
+    """Yield consecutive blocks of STL triangle records"""
+    with open(input_path, 'rb') as f:
+        f.seek(STL_DATA_OFFSET)
+        for start in range(0, count, chunk_triangles):
+            yield start, np.fromfile(f, dtype=STL_TRIANGLE_DTYPE,
+                                     count=min(chunk_triangles, count - start))
+
+def stream_convert(input_path, output_path, format_name=None,
+                   chunk_triangles=CHUNK_TRIANGLES, partition_corners=PARTITION_CORNERS,
+                   spill_dir=None, verbose=True):
+    """
+    Convert a binary STL to OBJ or PLY without loading it into memory
+
+    Pass 1 reads fixed-size chunks of triangles, accumulates the single-pass
+    statistics and spills every corner into a partition chosen by the hash
+    of its coordinates, so identical corners always share a partition.
+    Pass 2 welds one partition at a time and spills the (corner, vertex)
+    remap into partitions by corner position. Pass 3 writes the vertices and
+    rebuilds the faces range by range. The partition count grows with the
+    input so every partition stays near `partition_corners`; peak memory
+    depends on the chunk and partition sizes, not on the input size.
+
+    Args:
+        input_path: path to a binary STL file
+        output_path: destination .obj or .ply file
+        format_name: 'obj' or 'ply' (default: output suffix)
+        chunk_triangles: triangles read from the input per step
+        partition_corners: target corners per spill partition
+        spill_dir: directory for temporary spill files (default: system temp)
+        verbose: print statistics
+
+    Returns:
+        Dictionary with the statistics computable in a single pass
+    """
+    input_path = Path(input_path)
+    output_path = Path(output_path)
+    format_name = (format_name or output_path.suffix.lstrip('.')).lower()
+    if format_name not in WRITERS:
+        raise ValueError(f"Unsupported streaming format: {format_name} "
+                         f"(available: {', '.join(WRITERS)})")
+    write_header, write_vertices, write_faces = WRITERS[format_name]
+
+    start_time = time.perf_counter()
+    _, count = binary_stl_count(input_path)
+    corner_count = 3 * count
+
+    partitions = max(-(-corner_count // partition_corners), 1)
+    # Range partitions hold whole triangles so faces can be rebuilt per range
+    range_size = max(-(-corner_count // partitions), 3)
+    range_size += (-range_size) % 3
+
+    lower = np.full(3, np.inf)
+    upper = np.full(3, -np.inf)
+    area = 0.0
+    volume = 0.0
+    degenerate = 0
+    vertex_count = 0
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.TemporaryDirectory(prefix='stream_', dir=spill_dir) as tmp:
+        tmp = Path(tmp)
+        hash_paths = [tmp / f"hash_{i}.bin" for i in range(partitions)]
+        range_paths = [tmp / f"range_{i}.bin" for i in range(partitions)]
+        vertex_path = tmp / "vertices.bin"
+        spill_block = 3 * chunk_triangles
+
+        # Pass 1: statistics and hash partitioning of the corners
+        def corner_records():
+            nonlocal lower, upper, area, volume, degenerate
+            for first, chunk in _read_triangles(input_path, count, chunk_triangles):
+                triangles = chunk['vertices'].astype(np.float64)
+                v0, v1, v2 = triangles[:, 0], triangles[:, 1], triangles[:, 2]
+                points = triangles.reshape(-1, 3)
+                lower = np.minimum(lower, points.min(axis=0))
+                upper = np.maximum(upper, points.max(axis=0))
+
+                doubled = np.linalg.norm(np.cross(v1 - v0, v2 - v0), axis=1)
+                area += doubled.sum() / 2.0
+                volume += np.einsum('ij,ij->', v0, np.cross(v1, v2)) / 6.0
+                degenerate += int(np.count_nonzero(doubled == 0))
+
+                # Bit-exact keys, folding -0.0 into +0.0 first
+                keys = (chunk['vertices'].reshape(-1, 3) + np.float32(0)).view('<u4')
+                records = np.empty(len(keys), dtype=CORNER_DTYPE)
+                records['key'] = keys
+                records['corner'] = np.arange(3 * first, 3 * first + len(keys))
+                yield records
+
+        def hash_partition(records):
+            keys = records['key'].astype(np.int64)
+            return (_hash_rows(keys) % np.uint64(partitions)).astype(np.int64)
+
+        _spill(corner_records(), hash_partition, hash_paths, CORNER_DTYPE, spill_block)
+
+        # Pass 2: weld each hash partition, spill the remap by corner range
+        def remap_records(vertex_file):
+            nonlocal vertex_count
+            for path in hash_paths:
+                records = np.fromfile(path, dtype=CORNER_DTYPE)
+                path.unlink()
+                if len(records) == 0:
+                    continue
+
+                representative = group_rows(records['key'].astype(np.int64))
+                is_first = representative == np.arange(len(records))
+                local = np.cumsum(is_first) - 1
+
+                records['key'][is_first].view('<f4').tofile(vertex_file)
+
+                remap = np.empty(len(records), dtype=REMAP_DTYPE)
+                remap['corner'] = records['corner']
+                remap['vertex'] = vertex_count + local[representative]
+                vertex_count += int(is_first.sum())
+                yield remap
+
+        def range_partition(records):
+            return (records['corner'] // np.uint64(range_size)).astype(np.int64)
+
+        with open(vertex_path, 'wb') as vertex_file:
+            _spill(remap_records(vertex_file), range_partition, range_paths,
+                   REMAP_DTYPE, spill_block)
+
+        # Pass 3: write vertices, then rebuild faces range by range
+        with open(output_path, 'wb') as out:
+            write_header(out, input_path.name, vertex_count, count)
+
+            with open(vertex_path, 'rb') as vertex_file:
+                while True:
+                    block = np.fromfile(vertex_file, dtype='<f4', count=3 * partition_corners)
+                    if len(block) == 0:
+                        break
+                    write_vertices(out, block.reshape(-1, 3))
+
+            for index, path in enumerate(range_paths):
+                remap = np.fromfile(path, dtype=REMAP_DTYPE)
+                path.unlink()
+                if len(remap) == 0:
+                    continue
+                corner_map = np.empty(len(remap), dtype=np.int64)
+                corner_map[remap['corner'] - np.uint64(index * range_size)] = remap['vertex']
+                write_faces(out, corner_map.reshape(-1, 3))
+
+    if count == 0:
+        lower = upper = np.zeros(3)
+
+    stats = {
+        'format': format_name,
+        'input': input_path.name,
+        'vertices': vertex_count,
+        'faces': count,
+        'duplicate_vertices': corner_count - vertex_count,
+        'degenerate_faces': degenerate,
+        'volume': float(volume),
+        'surface_area': float(area),
+        'bounds_min': lower.tolist(),
+        'bounds_max': upper.tolist(),
+        'file_size': output_path.stat().st_size,
+        'elapsed_s': time.perf_counter() - start_time,
+        'partitions': partitions,
+        'peak_rss_mb': _peak_rss_mb()
+    }
+
+    if verbose:
+        print(f"\n{'='*50}")
+        print(f"STREAMED: {input_path.name} -> {output_path.name}")
+        print(f"{'='*50}")
+        print(f"Vertices:        {stats['vertices']:,}")
+        print(f"Faces:           {stats['faces']:,}")
+        print(f"Duplicates:      {stats['duplicate_vertices']:,}")
+        print(f"Degenerate:      {stats['degenerate_faces']:,}")
+        print(f"Volume:          {stats['volume']:.4f}")
+        print(f"Surface Area:    {stats['surface_area']:.4f}")
+        print(f"Bounds:          {lower} to {upper}")
+        print(f"File Size:       {stats['file_size']:,} bytes")
+        print(f"Elapsed:         {stats['elapsed_s']:.2f} s ({partitions} partitions)")
+        if stats['peak_rss_mb'] is not None:
+            print(f"Peak RSS:        {stats['peak_rss_mb']:.1f} MB")
+
+    return stats
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Stream a binary STL into OBJ or PLY with bounded memory")
+    parser.add_argument('input', nargs='?', default="cat.stl",
+                        help="binary STL file")
+    parser.add_argument('output', nargs='?', default=None,
+                        help="output .obj/.ply file (default: converted/<name>.obj)")
+    parser.add_argument('--format', choices=sorted(WRITERS), default=None,
+                        help="output format (default: output file suffix)")
+    parser.add_argument('--chunk', type=int, default=CHUNK_TRIANGLES,
+                        help="triangles read per step")
+    parser.add_argument('--spill-dir', default=None,
+                        help="directory for temporary spill files")
+    args = parser.parse_args()
+
+    input_path = Path(args.input)
+    if not input_path.exists():
+        print(f"Error: {input_path} not found")
+        exit(1)
+
+    output_path = Path(args.output) if args.output else \
+        Path('converted') / f"{input_path.stem}.{args.format or 'obj'}"
+
+    stats = stream_convert(input_path, output_path, args.format,
+                           chunk_triangles=args.chunk, spill_dir=args.spill_dir)
+
+    report_path = output_path.with_name(f"{output_path.stem}_stream.json")
+    with open(report_path, 'w') as f:
+        json.dump(stats, f, indent=2)
+    print(f"\n[OK] Statistics saved to: {report_path}")
@@ -0,0 +1,285 @@
+"""
+Half-edge Topology Checker
+Finds boundary loops, non-manifold edges and flipped faces of large meshes
+from one sort of packed half-edge keys
+"""
+
+import argparse
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+# Approximate peak working memory of check_topology per input face, measured
+# with tracemalloc on meshes of 100K-1M faces (see the __main__ block)
+BYTES_PER_FACE = 150
+
+def half_edge_keys(faces, vertex_count=None):
+    """
+    Pack every directed face edge into one sortable uint64
+
+    The key is (min * V + max) * 2 + direction, so the two half-edges of a
+    shared edge sort next to each other and differ only in the low bit
+    (0 when the edge runs from the smaller to the larger vertex index).
+
+    Args:
+        faces: (F, 3) int array of vertex indices
+        vertex_count: number of vertices (default: largest index + 1)
+
+    Returns:
+        (3F,) uint64 array; half-edge 3f + k runs from faces[f, k] to
+        faces[f, (k + 1) % 3]
+    """
+    faces = np.asarray(faces)
+    if vertex_count is None:
+        vertex_count = int(faces.max()) + 1 if faces.size else 0
+    if vertex_count > 1 << 31:
+        raise ValueError(f"Too many vertices for 64-bit edge keys: {vertex_count}")
+
+    start = faces.astype(np.uint64)
+    end = start[:, [1, 2, 0]].reshape(-1)
+    start = start.reshape(-1)
+    direction = start > end
+    lower = np.minimum(start, end)
+    upper = np.maximum(start, end, out=end)
+    del start
+    lower *= np.uint64(vertex_count)
+    lower += upper
+    lower <<= np.uint64(1)
+    lower |= direction
+    return lower
+
+def _components(u, v, count):
+    """
+    Connected components of a graph given as an edge list
+
+    Roots are hooked onto the smaller root of every edge, then paths are
+    fully compressed; each round costs a few vectorized passes over the
+    edges and the number of rounds grows with log(count) in practice.
+
+    Returns:
+        (count,) int64 array with the smallest node index of each component
+    """
+    parent = np.arange(count, dtype=np.int64)
+    while True:
+        pu, pv = parent[u], parent[v]
+        differ = pu != pv
+        if not differ.any():
+            return parent
+        pu, pv = pu[differ], pv[differ]
+        np.minimum.at(parent, np.maximum(pu, pv), np.minimum(pu, pv))
+        while True:
+            jumped = parent[parent]
+            if np.array_equal(jumped, parent):
+                break
+            parent = jumped
+
+def _face_set(indices, face_count):
+    """Sorted distinct face indices, through a mask instead of np.unique"""
+    mask = np.zeros(face_count, dtype=bool)
+    mask[indices] = True
+    return np.flatnonzero(mask)
+
+def check_topology(faces, vertex_count=None):
+    """
+    Validate the edge topology of a triangle mesh
+
+    The half-edge keys are sorted once; runs of equal edges then give every
+    edge's use count and, from the direction bit, whether the two faces of a
+    shared edge traverse it in opposite directions. Definitions follow
+    trimesh: the mesh is watertight when every edge is used exactly twice,
+    and winding consistent when every such edge is reversed.
+
+    Flipped faces: faces joined by reversed edges form coherently oriented
+    patches, and an inconsistent edge says its two patches disagree. Labeling
+    (patch, orientation) pairs over those edges splits every connected
+    region into two sides; the faces on the smaller side are reported as
+    flipped. A region where both orientations of a patch meet is
+    non-orientable.
+
+    Peak working memory is about BYTES_PER_FACE bytes per face (packed
+    keys, their sort order and the gathered edge runs), independent of the
+    vertex count and far below the edge arrays and adjacency graph that
+    trimesh caches.
+
+    Args:
+        faces: (F, 3) int array of vertex indices
+        vertex_count: number of vertices (default: largest index + 1)
+
+    Returns:
+        Dictionary with counts and flags, plus int64 face index arrays:
+        'boundary_faces' (faces with a boundary edge), 'non_manifold_faces'
+        (faces on an edge used three or more times), 'flipped_faces' and
+        'non_orientable_faces'
+    """
+    faces = np.asarray(faces).reshape(-1, 3)
+    face_count = len(faces)
+    if vertex_count is None:
+        vertex_count = int(faces.max()) + 1 if face_count else 0
+
+    keys = half_edge_keys(faces, vertex_count)
+    order = np.argsort(keys, kind='stable')
+    keys = keys[order]
+    edge = keys >> np.uint64(1)
+
+    # Runs of equal edges in the sorted keys
+    new = np.empty(len(edge), dtype=bool)
+    new[:1] = True
+    np.not_equal(edge[1:], edge[:-1], out=new[1:])
+    starts = np.flatnonzero(new)
+    uses = np.diff(np.append(starts, len(edge)))
+    del new
+
+    boundary = starts[uses == 1]
+    non_manifold = np.flatnonzero(uses > 2)
+    pairs = starts[uses == 2]
+    # Sorted keys put direction 0 before 1; a reversed pair has both
+    reversed_pair = (keys[pairs] & np.uint64(1)) != (keys[pairs + 1] & np.uint64(1))
+
+    # Faces touching a boundary or a non-manifold edge
+    boundary_faces = _face_set(order[boundary] // 3, face_count)
+    non_manifold_faces = _face_set(order[np.repeat(uses > 2, uses)] // 3, face_count)
+
+    # Boundary loops: components of the graph of boundary edges
+    loops = 0
+    if len(boundary):
+        width = np.uint64(vertex_count)
+        ends = np.column_stack([edge[boundary] // width, edge[boundary] % width])
+        nodes, local = np.unique(ends, return_inverse=True)
+        local = local.reshape(-1, 2)
+        loops = len(np.unique(_components(local[:, 0], local[:, 1], len(nodes))))
+
+    # Patches of faces joined by reversed edges are coherently oriented; only
+    # the (few) patches touching an inconsistent edge need a decision
+    flipped = non_orientable = np.zeros(0, dtype=np.int64)
+    if not reversed_pair.all():
+        first, second = order[pairs] // 3, order[pairs + 1] // 3
+        del order, keys, edge
+        patch = _components(first[reversed_pair], second[reversed_pair], face_count)
+        a, b = patch[first[~reversed_pair]], patch[second[~reversed_pair]]
+        del first, second
+
+        # Orientation classes: node p is patch p as stored, node K + p flipped
+        involved, local = np.unique(np.concatenate([a, b]), return_inverse=True)
+        a, b = local[:len(a)], local[len(a):]
+        count = len(involved)
+        label = _components(np.concatenate([a, a + count]),
+                            np.concatenate([b + count, b]), 2 * count)
+        as_stored, as_flipped = label[:count], label[count:]
+
+        sizes = np.bincount(patch, minlength=face_count)[involved]
+        members = np.bincount(as_stored, weights=sizes, minlength=2 * count)
+        kept, swapped = members[as_stored], members[as_flipped]
+        both = as_stored == as_flipped
+        minority = (kept < swapped) | ((kept == swapped) & (as_stored > as_flipped))
+
+        flipped = np.flatnonzero(np.isin(patch, involved[~both & minority]))
+        non_orientable = np.flatnonzero(np.isin(patch, involved[both]))
+
+    referenced = np.zeros(vertex_count, dtype=bool)
+    referenced[faces] = True
+    referenced = int(np.count_nonzero(referenced))
+    return {
+        'faces': face_count,
+        'edges': len(starts),
+        'boundary_edges': len(boundary),
+        'non_manifold_edges': len(non_manifold),
+        'inconsistent_edges': int(np.count_nonzero(~reversed_pair)),
+        'boundary_loops': loops,
+        'euler_characteristic': referenced - len(starts) + face_count,
+        'is_watertight': bool(face_count and len(pairs) * 2 == 3 * face_count),
+        'is_winding_consistent': bool(face_count and reversed_pair.all()),
+        'boundary_faces': boundary_faces,
+        'non_manifold_faces': non_manifold_faces,
+        'flipped_faces': flipped,
+        'non_orientable_faces': non_orientable
+    }
+
+def mesh_topology(mesh):
+    """
+    check_topology of a mesh
+
+    Meshes that provide their own topology() (e.g. MappedSTL) are asked
+    directly. Nothing is kept here: mesh_metrics.MeshMetrics computes the
+    report once per mesh and shares it between the topology metrics.
+
+    Args:
+        mesh: trimesh.Trimesh or compatible object
+
+    Returns:
+        Dictionary returned by check_topology
+    """
+    if hasattr(mesh, 'topology'):
+        return mesh.topology()
+    return check_topology(mesh.faces, len(mesh.vertices))
+
+def print_topology(report, limit=10):
+    """
+    Print a topology report with the first face indices of each defect
+
+    Args:
+        report: dictionary returned by check_topology
+        limit: face indices listed per defect
+    """
+    print(f"\n{'='*50}")
+    print("TOPOLOGY")
+    print(f"{'='*50}")
+    print(f"Faces:              {report['faces']:,}")
+    print(f"Edges:              {report['edges']:,}")
+    print(f"Euler:              {report['euler_characteristic']}")
+    print(f"Watertight:         {report['is_watertight']}")
+    print(f"Winding consistent: {report['is_winding_consistent']}")
+    print(f"Boundary edges:     {report['boundary_edges']:,} "
+          f"in {report['boundary_loops']} loops")
+    print(f"Non-manifold edges: {report['non_manifold_edges']:,}")
+    print(f"Inconsistent edges: {report['inconsistent_edges']:,}")
+
+    for name in ('boundary_faces', 'non_manifold_faces', 'flipped_faces', 'non_orientable_faces'):
+        indices = report[name]
+        if len(indices):
+            more = " ..." if len(indices) > limit else ""
+            print(f"{name.replace('_', ' ').capitalize() + ':':<20}{len(indices):,} "
+                  f"{indices[:limit].tolist()}{more}")
+
+if __name__ == "__main__":
+    import trimesh
+
+    parser = argparse.ArgumentParser(
+        description="Check watertightness, manifoldness and winding of a mesh")
+    parser.add_argument('input', nargs='?', default="cat.stl", help="model file")
+    parser.add_argument('--flip', type=int, default=0,
+                        help="flip this many random faces first (to exercise the checker)")
+    parser.add_argument('--compare', action='store_true',
+                        help="also time trimesh's is_watertight/is_winding_consistent")
+    args = parser.parse_args()
+
+    if not Path(args.input).exists():
+        print(f"Error: {args.input} not found")
+        exit(1)
+
+    mesh = trimesh.load(args.input, force='mesh')
+    faces = mesh.faces.copy()
+    if args.flip:
+        chosen = np.random.default_rng(0).choice(len(faces), args.flip, replace=False)
+        faces[chosen] = faces[chosen, ::-1]
+        print(f"Flipped faces: {np.sort(chosen)[:10].tolist()}")
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    report = check_topology(faces, len(mesh.vertices))
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    print_topology(report)
+    print(f"\nChecked in {elapsed * 1000:.1f} ms, peak {peak / (1 << 20):.1f} MB "
+          f"({peak / max(len(faces), 1):.0f} bytes per face)")
+
+    if args.compare:
+        reference = trimesh.Trimesh(vertices=mesh.vertices, faces=faces, process=False)
+        start = time.perf_counter()
+        expected = (reference.is_watertight, reference.is_winding_consistent)
+        elapsed = time.perf_counter() - start
+        print(f"trimesh: watertight={expected[0]}, winding consistent={expected[1]} "
+              f"in {elapsed * 1000:.1f} ms")
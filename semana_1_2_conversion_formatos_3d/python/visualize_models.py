@@ -3,32 +3,85 @@
 Creates visual comparisons of different 3D formats
 """
 
-import trimesh
 import numpy as np
 import matplotlib.pyplot as plt
+from mpl_toolkits.mplot3d.art3d import Line3DCollection
 from pathlib import Path
 
-def create_comparison_visualization(stl_file):
+from decimation import PLOT_FACE_BUDGET, fit_face_budget
+from model_registry import ModelRegistry
+from rasterizer import MIN_EDGE_PIXELS, visible_edges
+
+# Resolution of the saved figures
+SAVE_DPI = 150
+
+def view_direction(ax):
+    """Unit vector from the scene towards the viewer of a 3D axes"""
+    elev, azim = np.radians(ax.elev), np.radians(ax.azim)
+    return np.array([np.cos(elev) * np.cos(azim), np.cos(elev) * np.sin(azim), np.sin(elev)])
+
+def set_equal_limits(ax, bounds):
+    """Cube shaped axis limits around a bounding box"""
+    max_range = (bounds[1] - bounds[0]).max() / 2.0
+    for center, set_limits in zip(bounds.mean(axis=0), (ax.set_xlim, ax.set_ylim, ax.set_zlim)):
+        set_limits(center - max_range, center + max_range)
+
+def wireframe_segments(vertices, faces, direction, pixel_size, min_pixels=MIN_EDGE_PIXELS):
     """
-    Create side-by-side visualization of different formats
+    Edges worth drawing from a viewing direction, as one segment array
+
+    Back-facing edges are dropped (see rasterizer.visible_edges), then edges
+    whose length across the screen plane is below `min_pixels`.
+
+    Args:
+        vertices: (V, 3) array of positions
+        faces: (F, 3) int array of vertex indices
+        direction: unit vector towards the viewer
+        pixel_size: world size of one output pixel
+        min_pixels: shortest edge drawn, in pixels
+
+    Returns:
+        (E, 2, 3) array of segments
+    """
+    vertices = np.asarray(vertices, dtype=np.float64)
+    edges = visible_edges(vertices, faces, direction=direction)
+    segments = vertices[edges]
+
+    delta = segments[:, 1] - segments[:, 0]
+    across = delta - np.outer(delta @ direction, direction)
+    return segments[np.linalg.norm(across, axis=1) >= min_pixels * pixel_size]
+
+def load_models(stl_file, registry):
+    """
+    Read-only views of the source model and its conversions
 
     Args:
         stl_file: path to the STL file
+        registry: ModelRegistry shared by every figure
+
+    Returns:
+        Dictionary of format label to ModelView
     """
-    # Load models
-    raw_models = {
-        'STL': trimesh.load(stl_file),
-        'OBJ': trimesh.load('converted/cat.obj'),
-        'GLTF': trimesh.load('converted/cat.gltf')
+    return {
+        'STL': registry.get(stl_file),
+        'OBJ': registry.get('converted/cat.obj'),
+        'GLTF': registry.get('converted/cat.gltf')
     }
 
-    # Handle Scene objects (GLTF returns Scene)
-    models = {}
-    for name, data in raw_models.items():
-        if isinstance(data, trimesh.Scene):
-            models[name] = list(data.geometry.values())[0]
-        else:
-            models[name] = data
+def plotted_label(count, plotted):
+    """Title suffix noting how many of `count` items were actually plotted"""
+    return f' ({plotted} plotted)' if plotted < count else ''
+
+def create_comparison_visualization(stl_file, registry=None, face_budget=PLOT_FACE_BUDGET):
+    """
+    Create side-by-side visualization of different formats
+
+    Args:
+        stl_file: path to the STL file
+        registry: ModelRegistry to load the models from (default: a new one)
+        face_budget: meshes with more faces are simplified before plotting
+    """
+    models = load_models(stl_file, registry or ModelRegistry())
 
     # Create figure with subplots
     fig = plt.figure(figsize=(15, 5))
@@ -36,9 +89,8 @@ def create_comparison_visualization(stl_file):
     for idx, (format_name, mesh) in enumerate(models.items(), 1):
         ax = fig.add_subplot(1, 3, idx, projection='3d')
 
-        # Get vertices and faces
-        vertices = mesh.vertices
-        faces = mesh.faces
+        # Get vertices and faces, simplified to the budget (titles keep the true counts)
+        vertices, faces = fit_face_budget(mesh.vertices, mesh.faces, face_budget)
 
         # Plot
         ax.plot_trisurf(
@@ -51,75 +103,62 @@ def create_comparison_visualization(stl_file):
             edgecolor='none'
         )
 
-        ax.set_title(f'{format_name} Format\n{len(vertices)} vertices, {len(faces)} faces',
+        ax.set_title(f'{format_name} Format\n{len(mesh.vertices)} vertices, {len(mesh.faces)} faces'
+                     f'{plotted_label(len(mesh.faces), len(faces))}',
                     fontsize=12, fontweight='bold')
         ax.set_xlabel('X')
         ax.set_ylabel('Y')
         ax.set_zlabel('Z')
 
-        # Set equal aspect ratio
-        max_range = np.array([
-            vertices[:, 0].max() - vertices[:, 0].min(),
-            vertices[:, 1].max() - vertices[:, 1].min(),
-            vertices[:, 2].max() - vertices[:, 2].min()
-        ]).max() / 2.0
-
-        mid_x = (vertices[:, 0].max() + vertices[:, 0].min()) * 0.5
-        mid_y = (vertices[:, 1].max() + vertices[:, 1].min()) * 0.5
-        mid_z = (vertices[:, 2].max() + vertices[:, 2].min()) * 0.5
-
-        ax.set_xlim(mid_x - max_range, mid_x + max_range)
-        ax.set_ylim(mid_y - max_range, mid_y + max_range)
-        ax.set_zlim(mid_z - max_range, mid_z + max_range)
+        # Set equal aspect ratio (bounds are cached by the registry)
+        set_equal_limits(ax, mesh.bounds)
 
     plt.tight_layout()
 
     # Save figure
     output_path = Path('../media/models_comparison.png')
     output_path.parent.mkdir(exist_ok=True)
-    plt.savefig(output_path, dpi=150, bbox_inches='tight')
+    plt.savefig(output_path, dpi=SAVE_DPI, bbox_inches='tight')
     print(f"✓ Saved comparison visualization to {output_path}")
     plt.close()
 
-def create_wireframe_comparison(stl_file):
+def create_wireframe_comparison(stl_file, registry=None, face_budget=PLOT_FACE_BUDGET):
     """
     Create wireframe comparison of different formats
 
     Args:
         stl_file: path to the STL file
+        registry: ModelRegistry to load the models from (default: a new one)
+        face_budget: meshes with more faces are simplified before plotting,
+            and at most this many vertices are scattered
     """
-    raw_models = {
-        'STL': trimesh.load(stl_file),
-        'OBJ': trimesh.load('converted/cat.obj'),
-        'GLTF': trimesh.load('converted/cat.gltf')
-    }
-
-    # Handle Scene objects (GLTF returns Scene)
-    models = {}
-    for name, data in raw_models.items():
-        if isinstance(data, trimesh.Scene):
-            models[name] = list(data.geometry.values())[0]
-        else:
-            models[name] = data
+    models = load_models(stl_file, registry or ModelRegistry())
 
     fig = plt.figure(figsize=(15, 5))
 
     for idx, (format_name, mesh) in enumerate(models.items(), 1):
         ax = fig.add_subplot(1, 3, idx, projection='3d')
 
-        vertices = mesh.vertices
         edges = mesh.edges_unique
-
-        # Plot edges
-        for edge in edges[:500]:  # Limit edges for performance
-            points = vertices[edge]
-            ax.plot3D(*points.T, 'b-', alpha=0.3, linewidth=0.5)
-
-        # Plot vertices
-        ax.scatter(vertices[:, 0], vertices[:, 1], vertices[:, 2],
+        set_equal_limits(ax, mesh.bounds)
+        vertices, faces = fit_face_budget(mesh.vertices, mesh.faces, face_budget)
+
+        # Every front facing edge longer than half a pixel, as one artist
+        axes_pixels = ax.get_position().width * fig.get_figwidth() * SAVE_DPI
+        pixel_size = (mesh.bounds[1] - mesh.bounds[0]).max() / axes_pixels
+        segments = wireframe_segments(vertices, faces, view_direction(ax), pixel_size)
+        ax.add_collection3d(Line3DCollection(segments, colors='b', alpha=0.3, linewidths=0.5),
+                            autolim=False)
+
+        # Plot vertices (randomly sampled down to the budget)
+        points = mesh.vertices
+        if len(points) > face_budget:
+            points = points[np.random.default_rng(0).choice(len(points), face_budget, replace=False)]
+        ax.scatter(points[:, 0], points[:, 1], points[:, 2],
                   c='red', s=1, alpha=0.5)
 
-        ax.set_title(f'{format_name} Wireframe\n{len(vertices)} vertices, {len(edges)} edges',
+        ax.set_title(f'{format_name} Wireframe\n{len(mesh.vertices)} vertices, {len(edges)} edges '
+                     f'({len(segments)} drawn)',
                     fontsize=12, fontweight='bold')
         ax.set_xlabel('X')
         ax.set_ylabel('Y')
@@ -128,7 +167,7 @@ def create_wireframe_comparison(stl_file):
     plt.tight_layout()
 
     output_path = Path('../media/wireframe_comparison.png')
-    plt.savefig(output_path, dpi=150, bbox_inches='tight')
+    plt.savefig(output_path, dpi=SAVE_DPI, bbox_inches='tight')
     print(f"✓ Saved wireframe comparison to {output_path}")
     plt.close()
 
@@ -144,6 +183,9 @@ if __name__ == "__main__":
         exit(1)
 
     print("Creating visualizations...")
-    create_comparison_visualization(stl_file)
-    create_wireframe_comparison(stl_file)
+    registry = ModelRegistry()
+    create_comparison_visualization(stl_file, registry)
+    create_wireframe_comparison(stl_file, registry)
+    print(f"Parsed {sum(registry.loads.values())} model files "
+          f"({registry.nbytes / (1 << 20):.1f} MB of arrays cached)")
     print("\nAll visualizations created successfully!")
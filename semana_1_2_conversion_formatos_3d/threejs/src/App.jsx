@@ -19,7 +19,8 @@ function App() {
   const formats = [
     { id: 'stl', name: 'STL', path: '/models/cat.stl' },
     { id: 'obj', name: 'OBJ', path: '/models/cat.obj' },
-    { id: 'gltf', name: 'GLTF', path: '/models/cat.gltf' }
+    { id: 'gltf', name: 'GLTF', path: '/models/cat.gltf' },
+    { id: 'glb', name: 'GLB', path: '/models/cat.glb' }
   ]
 
   return (
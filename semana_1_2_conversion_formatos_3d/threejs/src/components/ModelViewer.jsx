@@ -8,6 +8,8 @@ import * as THREE from 'three'
 function ModelViewer({ format, modelPath, showWireframe, wireframeColor, rotationSpeed, onStatsUpdate }) {
   const meshRef = useRef()
   let geometry = null
+  // Node transform of glTF meshes (holds the dequantization of quantized GLB files)
+  let nodeTransform = null
 
   try {
     switch (format) {
@@ -22,10 +24,12 @@ function ModelViewer({ format, modelPath, showWireframe, wireframeColor, rotatio
         }
         break
       case 'gltf':
+      case 'glb':
         const gltfData = useLoader(GLTFLoader, modelPath)
-        // Extract geometry from GLTF
+        // Extract geometry from GLTF/GLB
         if (gltfData.scene.children[0]) {
           geometry = gltfData.scene.children[0].geometry
+          nodeTransform = gltfData.scene.children[0]
         }
         break
       default:
@@ -60,20 +64,27 @@ function ModelViewer({ format, modelPath, showWireframe, wireframeColor, rotatio
   }
 
   return (
-    <mesh ref={meshRef} geometry={geometry}>
-      {showWireframe ? (
-        <meshBasicMaterial color={wireframeColor} wireframe />
-      ) : (
-        <>
-          <meshStandardMaterial
-            color="#6c8ebf"
-            metalness={0.3}
-            roughness={0.4}
-            side={THREE.DoubleSide}
-          />
-        </>
-      )}
-    </mesh>
+    <group ref={meshRef}>
+      <mesh
+        geometry={geometry}
+        position={nodeTransform ? nodeTransform.position : [0, 0, 0]}
+        quaternion={nodeTransform ? nodeTransform.quaternion : [0, 0, 0, 1]}
+        scale={nodeTransform ? nodeTransform.scale : [1, 1, 1]}
+      >
+        {showWireframe ? (
+          <meshBasicMaterial color={wireframeColor} wireframe />
+        ) : (
+          <>
+            <meshStandardMaterial
+              color="#6c8ebf"
+              metalness={0.3}
+              roughness={0.4}
+              side={THREE.DoubleSide}
+            />
+          </>
+        )}
+      </mesh>
+    </group>
   )
 }
 
@@ -1,30 +1,40 @@
 import numpy as np
-import matplotlib.pyplot as plt
-from mpl_toolkits.mplot3d import Axes3D
 
-def project_pinhole(points_3d, focal_length):
+from plotting import pyplot, show
+
+# Distancia mínima (en Z) de un punto a la cámara para proyectarlo
+NEAR_PLANE = 1e-3
+
+def project_pinhole(points_3d, focal_length, near=NEAR_PLANE, return_mask=False):
     """
     Proyecta puntos 3D a 2D usando el modelo pinhole básico.
     Ecuaciones: x' = f * X/Z, y' = f * Y/Z
 
+    Los puntos con Z <= near (detrás de la cámara o sobre ella) no se
+    proyectan: sus coordenadas quedan en NaN, que matplotlib omite al dibujar.
+
     Args:
         points_3d: Array de puntos 3D (N, 3) donde cada fila es [X, Y, Z]
         focal_length: Distancia focal f
+        near: Distancia del plano cercano
+        return_mask: Devolver también la máscara de puntos válidos
 
     Returns:
-        Array de puntos 2D (N, 2) donde cada fila es [x', y']
+        Array de puntos 2D (N, 2) donde cada fila es [x', y'], y la máscara
+        de validez (N,) si return_mask es True
     """
-    X = points_3d[:, 0]
-    Y = points_3d[:, 1]
-    Z = points_3d[:, 2]
+    points_3d = np.asarray(points_3d, dtype=np.float64)
+    valid = points_3d[:, 2] > near
+    visible = points_3d if valid.all() else points_3d[valid]
 
-    # Evitar división por cero
-    Z = np.where(Z == 0, 1e-10, Z)
+    visible_projected = focal_length * visible[:, :2] / visible[:, 2:]
+    if valid.all():
+        projected = visible_projected
+    else:
+        projected = np.full((len(points_3d), 2), np.nan)
+        projected[valid] = visible_projected
 
-    x_prime = focal_length * X / Z
-    y_prime = focal_length * Y / Z
-
-    return np.column_stack([x_prime, y_prime])
+    return (projected, valid) if return_mask else projected
 
 def create_cube(size=1.0, center=[0, 0, 5]):
     """
@@ -74,6 +84,8 @@ def visualize_projection(focal_lengths=[1.0, 2.0, 4.0]):
     Args:
         focal_lengths: Lista de distancias focales a probar
     """
+    plt = pyplot()
+
     # Crear cubo en 3D
     cube_vertices = create_cube(size=2.0, center=[0, 0, 5])
     edges = get_cube_edges()
@@ -121,7 +133,7 @@ def visualize_projection(focal_lengths=[1.0, 2.0, 4.0]):
     plt.tight_layout()
     plt.savefig('../media/1_pinhole_projection.png', dpi=150, bbox_inches='tight')
     print("Imagen guardada: media/1_pinhole_projection.png")
-    plt.show()
+    show()
 
 if __name__ == "__main__":
     print("=== Modelo de Cámara Pinhole ===")
@@ -1,6 +1,6 @@
 import numpy as np
-import matplotlib.pyplot as plt
-from mpl_toolkits.mplot3d import Axes3D
+
+from plotting import pyplot, show
 
 def create_intrinsic_matrix(fx, fy, cx, cy):
     """
@@ -27,31 +27,71 @@ def create_intrinsic_matrix(fx, fy, cx, cy):
 
     return K
 
-def project_with_intrinsics(points_3d, K):
+# Distancia mínima (en Z) de un punto a la cámara para proyectarlo
+NEAR_PLANE = 1e-3
+
+def frustum_mask(points_3d, K, near=NEAR_PLANE, image_size=None):
+    """
+    Indica qué puntos (en coordenadas de cámara) están dentro del frustum.
+
+    La prueba contra los bordes de la imagen se hace en coordenadas
+    homogéneas (0 <= u <= ancho * Z), sin dividir por Z.
+
+    Args:
+        points_3d: Array de puntos 3D (N, 3)
+        K: Matriz intrínseca (3x3)
+        near: Distancia del plano cercano
+        image_size: (ancho, alto) en píxeles, o None para no recortar
+
+    Returns:
+        Máscara booleana (N,)
+    """
+    Z = points_3d[:, 2]
+    valid = Z > near
+
+    if image_size is not None:
+        width, height = image_size
+        u = K[0, 0] * points_3d[:, 0] + K[0, 1] * points_3d[:, 1] + K[0, 2] * Z
+        v = K[1, 1] * points_3d[:, 1] + K[1, 2] * Z
+        valid &= (u >= 0) & (u <= width * Z) & (v >= 0) & (v <= height * Z)
+
+    return valid
+
+def project_with_intrinsics(points_3d, K, near=NEAR_PLANE, image_size=None,
+                            return_mask=False):
     """
     Proyecta puntos 3D a 2D usando la matriz intrínseca K.
 
+    Solo se proyectan los puntos dentro del frustum (frente al plano cercano
+    y, si se da image_size, dentro de la imagen); el resto queda en NaN.
+
     Args:
         points_3d: Array de puntos 3D (N, 3)
         K: Matriz intrínseca (3x3)
+        near: Distancia del plano cercano
+        image_size: (ancho, alto) en píxeles, o None para no recortar
+        return_mask: Devolver también la máscara de puntos válidos
 
     Returns:
-        Array de puntos 2D en píxeles (N, 2)
+        Array de puntos 2D en píxeles (N, 2), y la máscara de validez (N,)
+        si return_mask es True
     """
-    # Convertir a coordenadas homogéneas y transponer
-    points_homogeneous = points_3d.T  # (3, N)
+    points_3d = np.asarray(points_3d, dtype=np.float64)
+    valid = frustum_mask(points_3d, K, near, image_size)
+    visible = points_3d if valid.all() else points_3d[valid]
 
     # Proyección: p = K * P
-    projected_homogeneous = K @ points_homogeneous  # (3, N)
+    projected_homogeneous = visible @ K.T  # (M, 3)
 
-    # Normalizar por la coordenada Z
-    Z = projected_homogeneous[2, :]
-    Z = np.where(Z == 0, 1e-10, Z)
+    # Normalizar por la coordenada Z (NaN fuera del frustum)
+    visible_projected = projected_homogeneous[:, :2] / projected_homogeneous[:, 2:]
+    if valid.all():
+        projected = visible_projected
+    else:
+        projected = np.full((len(points_3d), 2), np.nan)
+        projected[valid] = visible_projected
 
-    x = projected_homogeneous[0, :] / Z
-    y = projected_homogeneous[1, :] / Z
-
-    return np.column_stack([x, y])
+    return (projected, valid) if return_mask else projected
 
 def create_cube(size=1.0, center=[0, 0, 5]):
     """Crea los vértices de un cubo en 3D."""
@@ -81,6 +121,8 @@ def visualize_intrinsic_effects():
     """
     Visualiza el efecto de diferentes parámetros intrínsecos en la proyección.
     """
+    plt = pyplot()
+
     cube_vertices = create_cube(size=2.0, center=[0, 0, 5])
     edges = get_cube_edges()
 
@@ -134,7 +176,7 @@ def visualize_intrinsic_effects():
     plt.tight_layout()
     plt.savefig('../media/2_intrinsic_parameters.png', dpi=150, bbox_inches='tight')
     print("Imagen guardada: media/2_intrinsic_parameters.png")
-    plt.show()
+    show()
 
 if __name__ == "__main__":
     print("=== Parámetros Intrínsecos de la Cámara ===")
@@ -1,33 +1,276 @@
 import numpy as np
-import matplotlib.pyplot as plt
-from mpl_toolkits.mplot3d import Axes3D
+
+from plotting import pyplot, show
+from projection_kernels import project_points
+
+# Índice de cada eje de coordenadas
+AXES = {'x': 0, 'y': 1, 'z': 2}
+
+def axis_rotation(axis, angles_deg):
+    """
+    Crea matrices de rotación alrededor de un eje de coordenadas.
+
+    Args:
+        axis: 'x', 'y' o 'z'
+        angles_deg: Ángulo en grados, o arreglo de ángulos de forma (...)
+
+    Returns:
+        Matrices de rotación (..., 3, 3)
+    """
+    angle = np.radians(np.asarray(angles_deg, dtype=np.float64))
+    c, s = np.cos(angle), np.sin(angle)
+    i = AXES[axis]
+    j, k = (i + 1) % 3, (i + 2) % 3
+
+    R = np.zeros(angle.shape + (3, 3))
+    R[..., i, i] = 1
+    R[..., j, j] = c
+    R[..., k, k] = c
+    R[..., j, k] = -s
+    R[..., k, j] = s
+    return R
 
 def create_rotation_matrix_x(angle_deg):
-    """Crea matriz de rotación alrededor del eje X."""
-    angle = np.radians(angle_deg)
-    return np.array([
-        [1, 0, 0],
-        [0, np.cos(angle), -np.sin(angle)],
-        [0, np.sin(angle), np.cos(angle)]
-    ])
+    """Crea matriz de rotación alrededor del eje X (o una por ángulo de un arreglo)."""
+    return axis_rotation('x', angle_deg)
 
 def create_rotation_matrix_y(angle_deg):
-    """Crea matriz de rotación alrededor del eje Y."""
-    angle = np.radians(angle_deg)
-    return np.array([
-        [np.cos(angle), 0, np.sin(angle)],
-        [0, 1, 0],
-        [-np.sin(angle), 0, np.cos(angle)]
-    ])
+    """Crea matriz de rotación alrededor del eje Y (o una por ángulo de un arreglo)."""
+    return axis_rotation('y', angle_deg)
 
 def create_rotation_matrix_z(angle_deg):
-    """Crea matriz de rotación alrededor del eje Z."""
-    angle = np.radians(angle_deg)
-    return np.array([
-        [np.cos(angle), -np.sin(angle), 0],
-        [np.sin(angle), np.cos(angle), 0],
-        [0, 0, 1]
-    ])
+    """Crea matriz de rotación alrededor del eje Z (o una por ángulo de un arreglo)."""
+    return axis_rotation('z', angle_deg)
+
+def euler_to_matrix(angles_deg, order='xyz'):
+    """
+    Compone rotaciones de Euler por lotes.
+
+    R = R_{order[0]}(a0) @ R_{order[1]}(a1) @ ..., igual que encadenar a mano
+    create_rotation_matrix_*; p. ej. create_rotation_matrix_y(45) @
+    create_rotation_matrix_x(15) es euler_to_matrix([45, 15], 'yx').
+
+    Args:
+        angles_deg: Ángulos en grados (..., len(order))
+        order: Ejes de las rotaciones, de izquierda a derecha
+
+    Returns:
+        Matrices de rotación (..., 3, 3)
+    """
+    angles_deg = np.asarray(angles_deg, dtype=np.float64)
+    R = axis_rotation(order[0], angles_deg[..., 0])
+    for n, axis in enumerate(order[1:], 1):
+        R = R @ axis_rotation(axis, angles_deg[..., n])
+    return R
+
+def matrix_to_euler(R, order='xyz'):
+    """
+    Ángulos de Euler (en grados) de matrices de rotación; inversa de
+    euler_to_matrix para tres ejes distintos.
+
+    En el bloqueo de cardán (segundo ángulo de ±90°) el último ángulo se
+    fija en 0.
+
+    Args:
+        R: Matrices de rotación (..., 3, 3)
+        order: Tres ejes distintos, p. ej. 'xyz' o 'zyx'
+
+    Returns:
+        Ángulos en grados (..., 3)
+    """
+    R = np.asarray(R, dtype=np.float64)
+    i, j, k = (AXES[axis] for axis in order)
+    if len({i, j, k}) != 3:
+        raise ValueError(f"Se necesitan tres ejes distintos, no '{order}'")
+    # +1 para órdenes cíclicos (xyz, yzx, zxy), -1 para los demás
+    sign = 1.0 if (j - i) % 3 == 1 else -1.0
+
+    second = np.arcsin(np.clip(sign * R[..., i, k], -1.0, 1.0))
+    first = np.arctan2(-sign * R[..., j, k], R[..., k, k])
+    third = np.arctan2(-sign * R[..., i, j], R[..., i, i])
+
+    locked = np.abs(R[..., i, k]) > 1 - 1e-12
+    if np.any(locked):
+        first = np.where(locked, np.arctan2(sign * R[..., k, j], R[..., j, j]), first)
+        third = np.where(locked, 0.0, third)
+
+    return np.degrees(np.stack([first, second, third], axis=-1))
+
+def _cross_matrix(v):
+    """Matrices antisimétricas [v]x (..., 3, 3) de vectores (..., 3)."""
+    zero = np.zeros(v.shape[:-1])
+    x, y, z = v[..., 0], v[..., 1], v[..., 2]
+    return np.stack([
+        np.stack([zero, -z, y], axis=-1),
+        np.stack([z, zero, -x], axis=-1),
+        np.stack([-y, x, zero], axis=-1)
+    ], axis=-2)
+
+def rodrigues_to_matrix(rvecs):
+    """
+    Fórmula de Rodrigues por lotes, compatible con cv2.Rodrigues.
+
+    R = I + (sin θ / θ) [r]x + ((1 - cos θ) / θ²) [r]x², con θ = |r|; los
+    coeficientes usan su serie de Taylor cerca de θ = 0.
+
+    Args:
+        rvecs: Vectores de rotación en radianes (..., 3); también acepta los
+            rvecs (3, 1) de OpenCV o una lista de ellos (N, 3, 1)
+
+    Returns:
+        Matrices de rotación (..., 3, 3)
+    """
+    rvecs = np.asarray(rvecs, dtype=np.float64)
+    if rvecs.shape[-1] == 1:
+        rvecs = rvecs[..., 0]
+
+    theta2 = np.einsum('...i,...i->...', rvecs, rvecs)
+    theta = np.sqrt(theta2)
+    small = theta < 1e-4
+    safe = np.where(small, 1.0, theta)
+    A = np.where(small, 1 - theta2 / 6, np.sin(safe) / safe)
+    B = np.where(small, 0.5 - theta2 / 24, (1 - np.cos(safe)) / safe ** 2)
+
+    cross = _cross_matrix(rvecs)
+    return np.eye(3) + A[..., None, None] * cross + B[..., None, None] * (cross @ cross)
+
+def quaternion_to_matrix(quaternions):
+    """
+    Matrices de rotación de cuaterniones (w, x, y, z); se normalizan antes.
+
+    Args:
+        quaternions: Cuaterniones (..., 4), parte escalar primero
+
+    Returns:
+        Matrices de rotación (..., 3, 3)
+    """
+    q = np.asarray(quaternions, dtype=np.float64)
+    q = q / np.linalg.norm(q, axis=-1, keepdims=True)
+    w, x, y, z = q[..., 0], q[..., 1], q[..., 2], q[..., 3]
+
+    return np.stack([
+        np.stack([1 - 2 * (y * y + z * z), 2 * (x * y - w * z), 2 * (x * z + w * y)], axis=-1),
+        np.stack([2 * (x * y + w * z), 1 - 2 * (x * x + z * z), 2 * (y * z - w * x)], axis=-1),
+        np.stack([2 * (x * z - w * y), 2 * (y * z + w * x), 1 - 2 * (x * x + y * y)], axis=-1)
+    ], axis=-2)
+
+def matrix_to_quaternion(R):
+    """
+    Cuaterniones (w, x, y, z) con w >= 0 de matrices de rotación.
+
+    Usa el método de Shepperd: de las cuatro fórmulas posibles se toma, por
+    matriz, la del mayor divisor, así que es estable para cualquier ángulo.
+
+    Args:
+        R: Matrices de rotación (..., 3, 3)
+
+    Returns:
+        Cuaterniones unitarios (..., 4)
+    """
+    R = np.asarray(R, dtype=np.float64)
+    r00, r01, r02 = R[..., 0, 0], R[..., 0, 1], R[..., 0, 2]
+    r10, r11, r12 = R[..., 1, 0], R[..., 1, 1], R[..., 1, 2]
+    r20, r21, r22 = R[..., 2, 0], R[..., 2, 1], R[..., 2, 2]
+
+    # Cuatro veces el cuadrado de w, x, y, z; cada fila es la fórmula de uno
+    diagonal = np.stack([1 + r00 + r11 + r22, 1 + r00 - r11 - r22,
+                         1 - r00 + r11 - r22, 1 - r00 - r11 + r22], axis=-1)
+    candidates = np.stack([
+        np.stack([diagonal[..., 0], r21 - r12, r02 - r20, r10 - r01], axis=-1),
+        np.stack([r21 - r12, diagonal[..., 1], r01 + r10, r02 + r20], axis=-1),
+        np.stack([r02 - r20, r01 + r10, diagonal[..., 2], r12 + r21], axis=-1),
+        np.stack([r10 - r01, r02 + r20, r12 + r21, diagonal[..., 3]], axis=-1)
+    ], axis=-2)
+
+    best = np.argmax(diagonal, axis=-1)
+    q = np.take_along_axis(candidates, best[..., None, None], axis=-2)[..., 0, :]
+    q /= np.linalg.norm(q, axis=-1, keepdims=True)
+    return q * np.where(q[..., :1] < 0, -1.0, 1.0)
+
+def rodrigues_to_quaternion(rvecs):
+    """
+    Cuaterniones (w, x, y, z) de vectores de rotación (..., 3) o (..., 3, 1).
+    """
+    rvecs = np.asarray(rvecs, dtype=np.float64)
+    if rvecs.shape[-1] == 1:
+        rvecs = rvecs[..., 0]
+
+    theta = np.linalg.norm(rvecs, axis=-1, keepdims=True)
+    small = theta < 1e-4
+    safe = np.where(small, 1.0, theta)
+    # sin(θ/2) / θ, con su serie de Taylor cerca de 0
+    scale = np.where(small, 0.5 - theta ** 2 / 48, np.sin(safe / 2) / safe)
+    return np.concatenate([np.cos(theta / 2), rvecs * scale], axis=-1)
+
+def quaternion_to_rodrigues(quaternions):
+    """
+    Vectores de rotación (..., 3), con ángulo en [0, π], de cuaterniones
+    (w, x, y, z).
+    """
+    q = np.asarray(quaternions, dtype=np.float64)
+    q = q / np.linalg.norm(q, axis=-1, keepdims=True)
+    q = q * np.where(q[..., :1] < 0, -1.0, 1.0)
+
+    w, xyz = q[..., :1], q[..., 1:]
+    sin_half = np.linalg.norm(xyz, axis=-1, keepdims=True)
+    small = sin_half < 1e-8
+    # θ / sin(θ/2), que tiende a 2 / w cuando θ -> 0
+    scale = np.where(small, 2.0 / w, 2.0 * np.arctan2(sin_half, w) / np.where(small, 1.0, sin_half))
+    return xyz * scale
+
+def matrix_to_rodrigues(R):
+    """
+    Vectores de rotación (..., 3) de matrices de rotación, compatibles con
+    cv2.Rodrigues; pasan por el cuaternión para ser estables cerca de 0 y π.
+    """
+    return quaternion_to_rodrigues(matrix_to_quaternion(R))
+
+def quaternion_multiply(q1, q2):
+    """Producto de Hamilton q1 * q2 de cuaterniones (..., 4) (w, x, y, z)."""
+    q1, q2 = np.asarray(q1, dtype=np.float64), np.asarray(q2, dtype=np.float64)
+    w1, x1, y1, z1 = (q1[..., i] for i in range(4))
+    w2, x2, y2, z2 = (q2[..., i] for i in range(4))
+    return np.stack([
+        w1 * w2 - x1 * x2 - y1 * y2 - z1 * z2,
+        w1 * x2 + x1 * w2 + y1 * z2 - z1 * y2,
+        w1 * y2 - x1 * z2 + y1 * w2 + z1 * x2,
+        w1 * z2 + x1 * y2 - y1 * x2 + z1 * w2
+    ], axis=-1)
+
+def slerp(q0, q1, fractions):
+    """
+    Interpolación esférica entre cuaterniones, por lotes.
+
+    Toma el camino más corto (invierte q1 si el producto punto es negativo)
+    y usa interpolación lineal normalizada cuando los extremos casi coinciden.
+
+    Args:
+        q0, q1: Cuaterniones (..., 4) (w, x, y, z)
+        fractions: Posiciones entre 0 y 1, compatibles por broadcasting con
+            q0[..., 0]; p. ej. q0, q1 de forma (4,) y fractions (N,)
+
+    Returns:
+        Cuaterniones unitarios interpolados (..., 4)
+    """
+    q0 = np.asarray(q0, dtype=np.float64)
+    q1 = np.asarray(q1, dtype=np.float64)
+    q0 = q0 / np.linalg.norm(q0, axis=-1, keepdims=True)
+    q1 = q1 / np.linalg.norm(q1, axis=-1, keepdims=True)
+    fractions = np.asarray(fractions, dtype=np.float64)[..., None]
+
+    dot = np.sum(q0 * q1, axis=-1, keepdims=True)
+    q1 = np.where(dot < 0, -q1, q1)
+    dot = np.abs(dot)
+
+    omega = np.arccos(np.clip(dot, -1.0, 1.0))
+    sin_omega = np.sin(omega)
+    close = sin_omega < 1e-6
+    safe = np.where(close, 1.0, sin_omega)
+    w0 = np.where(close, 1 - fractions, np.sin((1 - fractions) * omega) / safe)
+    w1 = np.where(close, fractions, np.sin(fractions * omega) / safe)
+
+    q = w0 * q0 + w1 * q1
+    return q / np.linalg.norm(q, axis=-1, keepdims=True)
 
 def world_to_camera(points_world, R, t):
     """
@@ -53,39 +296,499 @@ def create_intrinsic_matrix(fx, fy, cx, cy):
         [0, 0, 1]
     ], dtype=np.float64)
 
-def project_with_intrinsics(points_3d, K):
-    """Proyecta puntos 3D a 2D usando la matriz intrínseca."""
-    points_homogeneous = points_3d.T
-    projected_homogeneous = K @ points_homogeneous
+# Distancia mínima (en Z) de un punto a la cámara para proyectarlo
+NEAR_PLANE = 1e-3
 
-    Z = projected_homogeneous[2, :]
-    Z = np.where(Z == 0, 1e-10, Z)
+def homogeneous_mask(u, v, Z, near=NEAR_PLANE, image_size=None):
+    """
+    Prueba del frustum sobre coordenadas homogéneas de imagen (u, v, Z) = K X.
 
-    x = projected_homogeneous[0, :] / Z
-    y = projected_homogeneous[1, :] / Z
+    La prueba contra los bordes de la imagen se hace sin dividir por Z
+    (0 <= u <= ancho * Z), así que sirve antes de la división perspectiva.
 
-    return np.column_stack([x, y])
+    Args:
+        u, v: Coordenadas homogéneas de imagen (cualquier forma)
+        Z: Profundidad en la cámara (misma forma)
+        near: Distancia del plano cercano
+        image_size: (ancho, alto) en píxeles, o None para no recortar
 
-def full_projection(points_world, K, R, t):
+    Returns:
+        Máscara booleana con la forma de Z
+    """
+    valid = Z > near
+
+    if image_size is not None:
+        width, height = image_size
+        valid &= (u >= 0) & (u <= width * Z) & (v >= 0) & (v <= height * Z)
+
+    return valid
+
+def frustum_mask(points_3d, K, near=NEAR_PLANE, image_size=None):
+    """
+    Indica qué puntos (en coordenadas de cámara) están dentro del frustum.
+
+    Args:
+        points_3d: Puntos en coordenadas de cámara (N, 3)
+        K: Matriz intrínseca (3x3)
+        near: Distancia del plano cercano
+        image_size: (ancho, alto) en píxeles, o None para no recortar
+
+    Returns:
+        Máscara booleana (N,)
+    """
+    Z = points_3d[:, 2]
+    if image_size is None:
+        return Z > near
+
+    u = K[0, 0] * points_3d[:, 0] + K[0, 1] * points_3d[:, 1] + K[0, 2] * Z
+    v = K[1, 1] * points_3d[:, 1] + K[1, 2] * Z
+    return homogeneous_mask(u, v, Z, near, image_size)
+
+def project_with_intrinsics(points_3d, K, near=NEAR_PLANE, image_size=None,
+                            return_mask=False):
+    """
+    Proyecta puntos 3D a 2D usando la matriz intrínseca.
+
+    Solo se proyectan los puntos dentro del frustum (ver frustum_mask); el
+    resto queda en NaN.
+
+    Returns:
+        Puntos en píxeles (N, 2), y la máscara de validez (N,) si
+        return_mask es True
+    """
+    points_3d = np.asarray(points_3d, dtype=np.float64)
+    valid = frustum_mask(points_3d, K, near, image_size)
+    visible = points_3d if valid.all() else points_3d[valid]
+
+    projected_homogeneous = visible @ K.T
+
+    visible_projected = projected_homogeneous[:, :2] / projected_homogeneous[:, 2:]
+    if valid.all():
+        projected = visible_projected
+    else:
+        projected = np.full((len(points_3d), 2), np.nan)
+        projected[valid] = visible_projected
+
+    return (projected, valid) if return_mask else projected
+
+def full_projection(points_world, K, R, t, near=NEAR_PLANE, image_size=None,
+                    return_mask=False, backend=None):
     """
     Proyección completa: mundo -> cámara -> imagen.
 
+    Usa projection_kernels.project_points, que hace ambos pasos en un solo
+    recorrido de los puntos (con Numba si está instalado, NumPy si no).
+
     Args:
         points_world: Puntos en coordenadas del mundo (N, 3)
         K: Matriz intrínseca (3x3)
         R: Matriz de rotación (3x3)
         t: Vector de traslación (3,)
+        near: Distancia del plano cercano
+        image_size: (ancho, alto) en píxeles, o None para no recortar
+        return_mask: Devolver también la máscara de puntos válidos
+        backend: 'numpy', 'numba' o 'auto' (ver projection_kernels.resolve_backend)
+
+    Returns:
+        Puntos proyectados en píxeles (N, 2) (NaN fuera del frustum), y la
+        máscara de validez (N,) si return_mask es True
+    """
+    # Mundo -> cámara (extrínsecos) -> imagen (intrínsecos), NaN fuera del frustum
+    projected = project_points(points_world, K, R, t, near=near, image_size=image_size,
+                               backend=backend)
+    return (projected, ~np.isnan(projected[:, 0])) if return_mask else projected
+
+def clip_segments(start, end, near=NEAR_PLANE):
+    """
+    Recorta segmentos (en coordenadas de cámara) contra el plano cercano.
+
+    Los extremos detrás del plano se mueven a su intersección con Z = near;
+    los segmentos completamente detrás se marcan como inválidos.
+
+    Args:
+        start: Extremos iniciales (E, 3)
+        end: Extremos finales (E, 3)
+        near: Distancia del plano cercano
 
     Returns:
-        Puntos proyectados en píxeles (N, 2)
+        start, end recortados (E, 3) y la máscara de segmentos válidos (E,)
+    """
+    start = np.array(start, dtype=np.float64)
+    end = np.array(end, dtype=np.float64)
+    start_behind = start[:, 2] <= near
+    end_behind = end[:, 2] <= near
+    valid = ~(start_behind & end_behind)
+
+    # Exactamente un extremo detrás: interpolar hasta el plano cercano
+    crossing = valid & (start_behind | end_behind)
+    if crossing.any():
+        s, e = start[crossing], end[crossing]
+        alpha = (near - s[:, 2]) / (e[:, 2] - s[:, 2])
+        hit = s + alpha[:, None] * (e - s)
+        hit[:, 2] = near
+        behind = start_behind[crossing]
+        s[behind] = hit[behind]
+        e[~behind] = hit[~behind]
+        start[crossing], end[crossing] = s, e
+
+    return start, end, valid
+
+def project_edges(points_camera, edges, K, near=NEAR_PLANE, image_size=None):
     """
-    # 1. Transformar de mundo a cámara (extrínsecos)
-    points_camera = world_to_camera(points_world, R, t)
+    Proyecta las aristas de un modelo con recorte y descarte por frustum.
 
-    # 2. Proyectar a imagen (intrínsecos)
-    points_image = project_with_intrinsics(points_camera, K)
+    Las aristas se recortan contra el plano cercano (clip_segments); si se
+    da image_size, se descartan además las que quedan por completo al mismo
+    lado de un borde de la imagen (códigos de Cohen-Sutherland). Solo se
+    proyectan las aristas que sobreviven.
 
-    return points_image
+    Args:
+        points_camera: Vértices en coordenadas de cámara (N, 3)
+        edges: Pares de índices de vértices (E, 2)
+        K: Matriz intrínseca (3x3)
+        near: Distancia del plano cercano
+        image_size: (ancho, alto) en píxeles, o None para no descartar
+
+    Returns:
+        Segmentos en píxeles (E, 2, 2) (NaN en las aristas descartadas) y la
+        máscara de aristas visibles (E,)
+    """
+    points_camera = np.asarray(points_camera, dtype=np.float64)
+    edges = np.asarray(edges).reshape(-1, 2)
+    start, end, valid = clip_segments(points_camera[edges[:, 0]], points_camera[edges[:, 1]], near)
+
+    segments = np.full((len(edges), 2, 2), np.nan)
+    ends = np.stack([start[valid], end[valid]], axis=1) @ K.T
+    pixels = ends[..., :2] / ends[..., 2:]
+
+    if image_size is not None:
+        width, height = image_size
+        outside = [pixels[..., 0] < 0, pixels[..., 0] > width,
+                   pixels[..., 1] < 0, pixels[..., 1] > height]
+        culled = np.zeros(len(pixels), dtype=bool)
+        for side in outside:
+            culled |= side.all(axis=1)
+        visible = np.flatnonzero(valid)
+        valid[visible[culled]] = False
+        pixels = pixels[~culled]
+
+    segments[valid] = pixels
+    return segments, valid
+
+class Camera:
+    """
+    Cámara pinhole con matriz intrínseca K y extrínsecos R, t.
+
+    La matriz de proyección P = K [R | t], el centro de la cámara y la
+    matriz que lleva píxeles a direcciones de rayos se calculan en el primer
+    uso y se conservan hasta que cambia K, R o t. Los parámetros se guardan
+    como arreglos de solo lectura, así que solo pueden cambiar a través de
+    sus setters, que invalidan la caché.
+
+    Ejemplo:
+        camera = Camera(create_intrinsic_matrix(500, 500, 320, 240),
+                        R=np.eye(3), t=[0, 0, 5])
+        pixels = camera.project(points)   # usa P en caché
+        camera.t = [1, 0, 5]              # invalida P, centro y rayos
+    """
+
+    def __init__(self, K, R=None, t=None):
+        self._cache = {}
+        self.K = K
+        self.R = np.eye(3) if R is None else R
+        self.t = np.zeros(3) if t is None else t
+
+    def _set(self, name, value, shape):
+        array = np.array(value, dtype=np.float64).reshape(shape)
+        array.flags.writeable = False
+        setattr(self, name, array)
+        self._cache.clear()
+
+    def _cached(self, name, compute):
+        if name not in self._cache:
+            value = compute()
+            value.flags.writeable = False
+            self._cache[name] = value
+        return self._cache[name]
+
+    @property
+    def K(self):
+        return self._K
+
+    @K.setter
+    def K(self, value):
+        self._set('_K', value, (3, 3))
+
+    @property
+    def R(self):
+        return self._R
+
+    @R.setter
+    def R(self, value):
+        self._set('_R', value, (3, 3))
+
+    @property
+    def t(self):
+        return self._t
+
+    @t.setter
+    def t(self, value):
+        self._set('_t', value, (3,))
+
+    @property
+    def P(self):
+        """Matriz de proyección K [R | t] (3x4)."""
+        return self._cached('P', lambda: self._K @ np.column_stack([self._R, self._t]))
+
+    @property
+    def center(self):
+        """Centro de la cámara en coordenadas del mundo, -R^T t."""
+        return self._cached('center', lambda: -self._R.T @ self._t)
+
+    @property
+    def pixel_to_ray(self):
+        """Inversa de K R: lleva píxeles homogéneos a direcciones en el mundo."""
+        return self._cached('pixel_to_ray', lambda: np.linalg.inv(self._K @ self._R))
+
+    def project(self, points_world, out=None, near=NEAR_PLANE, image_size=None,
+                return_mask=False):
+        """
+        Proyecta puntos del mundo con una sola multiplicación homogénea.
+
+        Args:
+            points_world: Puntos en coordenadas del mundo (N, 3)
+            out: Arreglo preasignado (N, 2) opcional
+            near: Distancia del plano cercano
+            image_size: (ancho, alto) en píxeles, o None para no recortar
+            return_mask: Devolver también la máscara de puntos válidos
+
+        Returns:
+            Puntos proyectados en píxeles (N, 2), NaN fuera del frustum, y la
+            máscara de validez (N,) si return_mask es True
+        """
+        P = self.P
+        homogeneous = np.asarray(points_world).reshape(-1, 3) @ P[:, :3].T
+        homogeneous += P[:, 3]
+
+        # Puntos fuera del frustum: NaN
+        valid = homogeneous_mask(homogeneous[:, 0], homogeneous[:, 1], homogeneous[:, 2],
+                                 near, image_size)
+        Z = homogeneous[:, 2:]
+        Z[~valid] = np.nan
+        projected = np.divide(homogeneous[:, :2], Z, out=out)
+        return (projected, valid) if return_mask else projected
+
+    def ray_directions(self, pixels, normalize=True):
+        """
+        Direcciones en el mundo de los rayos que pasan por unos píxeles.
+
+        Args:
+            pixels: Coordenadas en píxeles (N, 2)
+            normalize: Devolver vectores unitarios
+
+        Returns:
+            Direcciones (N, 3); cada rayo parte de `center`
+        """
+        pixels = np.asarray(pixels, dtype=np.float64).reshape(-1, 2)
+        M = self.pixel_to_ray
+        directions = pixels @ M[:, :2].T
+        directions += M[:, 2]
+        if normalize:
+            directions /= np.linalg.norm(directions, axis=1, keepdims=True)
+        return directions
+
+# Elementos (vistas x puntos) del espacio de trabajo de project_batch; limita
+# la memoria temporal sin importar cuántos puntos o vistas se proyecten
+PROJECTION_SCRATCH = 1 << 20
+
+def compose_projection(K, R, t):
+    """
+    Compone las matrices de proyección P = K [R | t] de M cámaras.
+
+    Args:
+        K: Matriz intrínseca (3x3) compartida, o (M, 3, 3)
+        R: Matrices de rotación (M, 3, 3)
+        t: Vectores de traslación (M, 3) o (M, 3, 1)
+
+    Returns:
+        Matrices de proyección (M, 3, 4)
+    """
+    R = np.asarray(R, dtype=np.float64).reshape(-1, 3, 3)
+    t = np.asarray(t, dtype=np.float64).reshape(-1, 3, 1)
+    K = np.broadcast_to(np.asarray(K, dtype=np.float64), R.shape)
+    return K @ np.concatenate([R, t], axis=2)
+
+def project_batch(points_world, K, R, t, out=None, dtype=np.float64, near=NEAR_PLANE,
+                  image_size=None, return_mask=False):
+    """
+    Proyecta N puntos desde M cámaras en una sola pasada vectorizada.
+
+    Cada vista se reduce a su matriz P = K [R | t], así que un punto cuesta
+    tres productos punto y una división por vista, sin los temporales de
+    world_to_camera + project_with_intrinsics. El trabajo se hace por bloques
+    de puntos en un espacio de trabajo de PROJECTION_SCRATCH elementos, y el
+    resultado se escribe directamente en `out` si se entrega.
+
+    Args:
+        points_world: Puntos en coordenadas del mundo (N, 3)
+        K: Matriz intrínseca (3x3) compartida, o (M, 3, 3)
+        R: Matrices de rotación (M, 3, 3)
+        t: Vectores de traslación (M, 3) o (M, 3, 1)
+        out: Arreglo preasignado (M, N, 2) opcional; define el tipo de dato
+        dtype: Tipo de dato del cálculo y del resultado (p. ej. np.float32)
+            cuando no se entrega `out`
+        near: Distancia del plano cercano
+        image_size: (ancho, alto) en píxeles, o None para no recortar
+        return_mask: Devolver también la máscara de puntos válidos
+
+    Returns:
+        Puntos proyectados en píxeles (M, N, 2), NaN donde el punto queda
+        fuera del frustum de la vista, y la máscara de validez (M, N) si
+        return_mask es True
+    """
+    points_world = np.asarray(points_world).reshape(-1, 3)
+    P = compose_projection(K, R, t)
+    M, N = len(P), len(points_world)
+
+    if out is None:
+        out = np.empty((M, N, 2), dtype=dtype)
+    elif out.shape != (M, N, 2):
+        raise ValueError(f"out debe tener forma {(M, N, 2)}, no {out.shape}")
+    dtype = out.dtype
+    P = P.astype(dtype)
+
+    mask = np.empty((M, N), dtype=bool) if return_mask else None
+
+    # Espacio de trabajo reutilizado por todos los bloques
+    chunk = max(1, min(N, PROJECTION_SCRATCH // max(M, 1)))
+    points_buffer = np.empty((3, chunk), dtype=dtype)
+    buffers = np.empty((3, M * chunk), dtype=dtype)
+
+    for start in range(0, N, chunk):
+        stop = min(start + chunk, N)
+        n = stop - start
+        points = points_buffer[:, :n]
+        points[...] = points_world[start:stop].T
+        u, v, depth = (buffer[:M * n].reshape(M, n) for buffer in buffers)
+
+        # Coordenadas homogéneas de cada punto en cada vista
+        for i, axis in enumerate((u, v, depth)):
+            np.matmul(P[:, i, :3], points, out=axis)
+            axis += P[:, i, 3:]
+
+        # NaN fuera del frustum (misma prueba homogénea que frustum_mask)
+        valid = homogeneous_mask(u, v, depth, near, image_size)
+        depth[~valid] = np.nan
+        np.reciprocal(depth, out=depth)
+
+        for i, axis in enumerate((u, v)):
+            axis *= depth
+            out[:, start:stop, i] = axis
+        if mask is not None:
+            mask[:, start:stop] = valid
+
+    return (out, mask) if return_mask else out
+
+# Puntos leídos por bloque en project_file
+POINTS_PER_CHUNK = 1 << 20
+
+def open_points(path, dtype=np.float32):
+    """
+    Abre una nube de puntos en disco como memmap de solo lectura, sin cargarla.
+
+    Args:
+        path: Archivo .npy (N, 3), o binario crudo de coordenadas X, Y, Z
+        dtype: Tipo de dato de los archivos binarios crudos
+
+    Returns:
+        Arreglo (N, 3) respaldado por el archivo
+    """
+    if str(path).endswith('.npy'):
+        points = np.load(path, mmap_mode='r')
+    else:
+        points = np.memmap(path, dtype=dtype, mode='r')
+    return points.reshape(-1, 3)
+
+def project_file(input_path, output_path, K, R, t, image_size=None, depth_path=None,
+                 occupancy_path=None, near=NEAR_PLANE, chunk=POINTS_PER_CHUNK,
+                 dtype=np.float32, backend=None):
+    """
+    Proyecta una nube de puntos en disco por bloques, con memoria constante.
+
+    Los puntos se leen de un memmap en bloques de `chunk`, y las coordenadas
+    en píxeles (NaN fuera del frustum) se escriben en un .npy mapeado en
+    memoria. Con image_size se pueden generar también una imagen de
+    profundidad (Z mínima por píxel, inf donde no cae ningún punto) y una de
+    ocupación (puntos por píxel), ambas como .npy mapeados. La memoria usada
+    depende de `chunk` y del tamaño de la imagen, no del número de puntos.
+
+    Args:
+        input_path: Puntos del mundo (.npy (N, 3) o binario crudo, ver open_points)
+        output_path: Archivo .npy (N, 2) de salida
+        K: Matriz intrínseca (3x3)
+        R: Matriz de rotación (3x3)
+        t: Vector de traslación (3,)
+        image_size: (ancho, alto) en píxeles; descarta puntos fuera de la imagen
+        depth_path: Archivo .npy (alto, ancho) de profundidad (requiere image_size)
+        occupancy_path: Archivo .npy (alto, ancho) de conteos (requiere image_size)
+        near: Distancia del plano cercano
+        chunk: Puntos por bloque
+        dtype: Tipo de dato de la salida y de los binarios crudos de entrada
+        backend: Backend de projection_kernels ('numpy', 'numba' o 'auto')
+
+    Returns:
+        Diccionario con el número de puntos y de puntos visibles
+    """
+    if (depth_path or occupancy_path) and image_size is None:
+        raise ValueError("Las imágenes de profundidad y ocupación requieren image_size")
+
+    points = open_points(input_path, dtype)
+    output = np.lib.format.open_memmap(output_path, mode='w+', dtype=dtype,
+                                       shape=(len(points), 2))
+    K = np.asarray(K, dtype=np.float64)
+    R = np.asarray(R, dtype=np.float64)
+    t = np.asarray(t, dtype=np.float64).reshape(3)
+
+    depth = occupancy = None
+    if image_size is not None:
+        width, height = image_size
+        if depth_path:
+            depth = np.lib.format.open_memmap(depth_path, mode='w+', dtype=np.float32,
+                                              shape=(height, width))
+            depth[...] = np.inf
+        if occupancy_path:
+            occupancy = np.lib.format.open_memmap(occupancy_path, mode='w+', dtype=np.uint32,
+                                                  shape=(height, width))
+            occupancy[...] = 0
+
+    visible = 0
+    projected_buffer = np.empty((min(chunk, len(points)), 2))
+    for start in range(0, len(points), chunk):
+        stop = min(start + chunk, len(points))
+        block = np.asarray(points[start:stop])
+        projected = project_points(block, K, R, t, near=near, out=projected_buffer[:stop - start],
+                                   image_size=image_size, backend=backend)
+        valid = ~np.isnan(projected[:, 0])
+        output[start:stop] = projected
+        visible += int(np.count_nonzero(valid))
+
+        if depth is not None or occupancy is not None:
+            columns = np.minimum(projected[valid, 0].astype(np.int64), width - 1)
+            rows = np.minimum(projected[valid, 1].astype(np.int64), height - 1)
+            pixels = rows * width + columns
+            if depth is not None:
+                # Profundidad (Z en cámara) solo de los puntos visibles
+                Z = block[valid] @ R[2] + t[2]
+                np.minimum.at(depth.reshape(-1), pixels, Z)
+            if occupancy is not None:
+                # Solo los píxeles tocados por el bloque, sin temporales del tamaño de la imagen
+                np.add.at(occupancy.reshape(-1), pixels, 1)
+
+    for array in (output, depth, occupancy):
+        if array is not None:
+            array.flush()
+
+    return {'points': len(points), 'visible': visible}
 
 def create_cube(size=1.0, center=[0, 0, 0]):
     """Crea los vértices de un cubo en 3D."""
@@ -115,6 +818,8 @@ def visualize_camera_motion():
     """
     Visualiza el efecto de mover la cámara (parámetros extrínsecos).
     """
+    plt = pyplot()
+
     # Cubo en el origen del mundo
     cube_vertices = create_cube(size=2.0, center=[0, 0, 0])
     edges = get_cube_edges()
@@ -140,7 +845,7 @@ def visualize_camera_motion():
             "title": "Rotación 20° en X + traslación Y"
         },
         {
-            "R": create_rotation_matrix_y(45) @ create_rotation_matrix_x(15),
+            "R": euler_to_matrix([45, 15], order='yx'),
             "t": np.array([1, 1, 6]),
             "title": "Rotación compuesta + traslación"
         }
@@ -163,16 +868,19 @@ def visualize_camera_motion():
     # Dibujar posiciones de cámara
     colors = ['red', 'green', 'orange', 'purple']
     for idx, config in enumerate(configs):
-        camera_pos = -config["R"].T @ config["t"]
+        camera_pos = Camera(K, config["R"], config["t"]).center
         ax_3d.scatter(camera_pos[0], camera_pos[1], camera_pos[2],
                      c=colors[idx], s=100, marker='^', label=f'Cámara {idx+1}')
 
     ax_3d.legend()
     ax_3d.set_box_aspect([1,1,1])
 
-    # Proyecciones desde cada posición de cámara
-    for idx, config in enumerate(configs):
-        projected = full_projection(cube_vertices, K, config["R"], config["t"])
+    # Proyecciones desde todas las posiciones de cámara en una sola llamada
+    all_projected = project_batch(cube_vertices, K,
+                                  np.stack([config["R"] for config in configs]),
+                                  np.stack([config["t"] for config in configs]))
+
+    for idx, (config, projected) in enumerate(zip(configs, all_projected)):
 
         ax = fig.add_subplot(2, 3, idx + 2)
         ax.set_title(config["title"])
@@ -201,7 +909,7 @@ def visualize_camera_motion():
     plt.tight_layout()
     plt.savefig('../media/3_extrinsic_parameters.png', dpi=150, bbox_inches='tight')
     print("Imagen guardada: media/3_extrinsic_parameters.png")
-    plt.show()
+    show()
 
 if __name__ == "__main__":
     print("=== Parámetros Extrínsecos de la Cámara ===")
@@ -2,7 +2,8 @@ import numpy as np
 import cv2
 import glob
 import os
-import matplotlib.pyplot as plt
+
+from plotting import pyplot, show
 
 def calibrate_camera(images_path, pattern_size=(9, 6), square_size=1.0):
     """
@@ -119,6 +120,8 @@ def visualize_detected_corners(images_path, pattern_size=(9, 6), num_samples=4):
         pattern_size: Tamaño del patrón
         num_samples: Número de imágenes a visualizar
     """
+    plt = pyplot()
+
     # Si es una lista, usarla directamente; si es string, hacer glob
     if isinstance(images_path, list):
         images = images_path
@@ -162,7 +165,7 @@ def visualize_detected_corners(images_path, pattern_size=(9, 6), num_samples=4):
     plt.tight_layout()
     plt.savefig('../media/4_corner_detection.png', dpi=150, bbox_inches='tight')
     print("Imagen guardada: media/4_corner_detection.png")
-    plt.show()
+    show()
 
 if __name__ == "__main__":
     print("=== Calibración de Cámara ===")
@@ -1,9 +1,10 @@
 import numpy as np
 import cv2
-import matplotlib.pyplot as plt
 import os
 import glob
 
+from plotting import pyplot, show
+
 def load_calibration(filename='calibration_params.npz'):
     """
     Carga los parámetros de calibración.
@@ -82,6 +83,8 @@ def visualize_undistortion(images_path, K, dist, num_samples=2):
         dist: Coeficientes de distorsión
         num_samples: Número de imágenes a visualizar
     """
+    plt = pyplot()
+
     # Si es una lista, usarla directamente; si es string, hacer glob
     if isinstance(images_path, list):
         images = images_path
@@ -126,7 +129,7 @@ def visualize_undistortion(images_path, K, dist, num_samples=2):
     plt.tight_layout()
     plt.savefig('../media/5_undistortion_comparison.png', dpi=150, bbox_inches='tight')
     print("Imagen guardada: media/5_undistortion_comparison.png")
-    plt.show()
+    show()
 
 def analyze_distortion_effect(K, dist):
     """
@@ -136,6 +139,8 @@ def analyze_distortion_effect(K, dist):
         K: Matriz intrínseca
         dist: Coeficientes de distorsión
     """
+    plt = pyplot()
+
     # Crear imagen con cuadrícula
     img_size = (640, 480)
     grid_img = np.ones((img_size[1], img_size[0], 3), dtype=np.uint8) * 255
@@ -180,7 +185,7 @@ def analyze_distortion_effect(K, dist):
     plt.tight_layout()
     plt.savefig('../media/5_distortion_grid.png', dpi=150, bbox_inches='tight')
     print("Imagen guardada: media/5_distortion_grid.png")
-    plt.show()
+    show()
 
 if __name__ == "__main__":
     print("=== Corrección de Distorsión ===")
@@ -1,9 +1,10 @@
 import numpy as np
 import cv2
-import matplotlib.pyplot as plt
 import glob
 import os
 
+from plotting import pyplot, show
+
 def load_calibration(filename='calibration_params.npz'):
     """Carga los parámetros de calibración."""
     if not os.path.exists(filename):
@@ -130,6 +131,8 @@ def visualize_reprojection(cal_data, num_samples=2):
         cal_data: Diccionario con datos de calibración
         num_samples: Número de imágenes a visualizar
     """
+    plt = pyplot()
+
     if cal_data is None:
         return
 
@@ -192,7 +195,7 @@ def visualize_reprojection(cal_data, num_samples=2):
     plt.tight_layout()
     plt.savefig('../media/6_reprojection_error.png', dpi=150, bbox_inches='tight')
     print("Imagen guardada: media/6_reprojection_error.png")
-    plt.show()
+    show()
 
 def plot_error_distribution(cal_data):
     """
@@ -201,6 +204,8 @@ def plot_error_distribution(cal_data):
     Args:
         cal_data: Diccionario con datos de calibración
     """
+    plt = pyplot()
+
     if cal_data is None:
         return
 
@@ -231,7 +236,7 @@ def plot_error_distribution(cal_data):
     plt.tight_layout()
     plt.savefig('../media/6_error_distribution.png', dpi=150, bbox_inches='tight')
     print("Imagen guardada: media/6_error_distribution.png")
-    plt.show()
+    show()
 
 if __name__ == "__main__":
     print("=== Validación de Calibración ===")
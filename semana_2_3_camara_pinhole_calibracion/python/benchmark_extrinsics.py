@@ -0,0 +1,94 @@
+"""
+Mediciones de rendimiento de las funciones de 3_extrinsic_parameters.py.
+
+Se ejecuta aparte del taller para que `python main.py` (paso 3) solo muestre
+la demostración:
+    python benchmark_extrinsics.py [--poses N] [--points N] [--views M] [--file-points N]
+
+Mide la trayectoria de poses por lotes, el bucle con full_projection frente a
+project_batch y la proyección por bloques de una nube en disco (project_file).
+Con --file-points 0 se omite esta última, que escribe la nube en un
+directorio temporal.
+"""
+
+import importlib.util
+import os
+import tempfile
+import time
+
+import numpy as np
+
+def load_extrinsics():
+    """
+    Carga 3_extrinsic_parameters.py como módulo (su nombre no es importable).
+
+    Returns:
+        El módulo cargado, sin ejecutar su bloque __main__
+    """
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '3_extrinsic_parameters.py')
+    spec = importlib.util.spec_from_file_location('extrinsic_parameters', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Mide las funciones de parámetros extrínsecos")
+    parser.add_argument('--poses', type=int, default=100_000, help="poses de la trayectoria")
+    parser.add_argument('--points', type=int, default=100_000, help="puntos por vista")
+    parser.add_argument('--views', type=int, default=100, help="vistas de project_batch")
+    parser.add_argument('--file-points', type=int, default=2_000_000,
+                        help="puntos de la nube en disco (0 para omitir project_file)")
+    args = parser.parse_args()
+
+    ext = load_extrinsics()
+    print("=== Rendimiento de parámetros extrínsecos ===")
+
+    # Trayectoria de poses por lotes: Euler -> cuaternión -> slerp -> Rodrigues
+    start = time.perf_counter()
+    poses = args.poses
+    angles = np.column_stack([np.linspace(0, 360, poses), np.full(poses, 20.0), np.zeros(poses)])
+    keyframes = ext.matrix_to_quaternion(ext.euler_to_matrix(angles, order='zyx'))
+    halfway = ext.slerp(keyframes[:-1], keyframes[1:], np.full(poses - 1, 0.5))
+    rvecs = ext.quaternion_to_rodrigues(halfway)
+    trajectory = ext.rodrigues_to_matrix(rvecs)
+    print(f"\nTrayectoria de {poses:,} poses (Euler, cuaterniones, slerp, Rodrigues): "
+          f"{(time.perf_counter() - start) * 1000:.0f} ms")
+    print(f"  rvec de la pose intermedia 0: {rvecs[0]}")
+
+    # Proyección por lotes: muchas vistas de una nube de puntos a la vez
+    rng = np.random.default_rng(0)
+    cloud = rng.uniform(-1, 1, size=(args.points, 3))
+    angles = np.linspace(0, 90, args.views)
+    Rs = np.stack([ext.create_rotation_matrix_y(a) for a in angles])
+    ts = np.tile([0.0, 0.0, 5.0], (len(angles), 1))
+    K_demo = ext.create_intrinsic_matrix(fx=500, fy=500, cx=320, cy=240)
+
+    start = time.perf_counter()
+    loop = np.stack([ext.full_projection(cloud, K_demo, R_i, t_i) for R_i, t_i in zip(Rs, ts)])
+    loop_time = time.perf_counter() - start
+
+    buffer = np.empty((len(Rs), len(cloud), 2), dtype=np.float32)
+    start = time.perf_counter()
+    ext.project_batch(cloud, K_demo, Rs, ts, out=buffer)
+    batch_time = time.perf_counter() - start
+
+    print(f"\nProyección de {len(cloud):,} puntos en {len(Rs)} vistas:")
+    print(f"  Bucle con full_projection: {loop_time * 1000:.0f} ms")
+    print(f"  project_batch (float32, buffer preasignado): {batch_time * 1000:.0f} ms")
+    print(f"  Diferencia máxima: {np.abs(buffer - loop).max():.2e} píxeles")
+
+    # Proyección por bloques de una nube de puntos en disco (memoria constante)
+    if args.file_points > 0:
+        with tempfile.TemporaryDirectory() as folder:
+            cloud_path = os.path.join(folder, 'cloud.npy')
+            np.save(cloud_path, rng.normal(0, 2, size=(args.file_points, 3)).astype(np.float32))
+            start = time.perf_counter()
+            result = ext.project_file(cloud_path, os.path.join(folder, 'pixels.npy'), K_demo,
+                                      np.eye(3), [0, 0, 8], image_size=(640, 480),
+                                      depth_path=os.path.join(folder, 'depth.npy'),
+                                      occupancy_path=os.path.join(folder, 'occupancy.npy'))
+            print(f"\nproject_file: {result['visible']:,} de {result['points']:,} puntos visibles "
+                  f"en {(time.perf_counter() - start) * 1000:.0f} ms "
+                  f"(bloques de {ext.POINTS_PER_CHUNK:,} puntos)")
@@ -8,11 +8,17 @@ Este script permite ejecutar individualmente cada paso del taller:
 4. Calibración de cámara
 5. Corrección de distorsión
 6. Validación de calibración
+
+Con --headless no se abre ninguna ventana ni se espera Enter: se ejecutan
+los pasos indicados (o todos) y las figuras solo se guardan en media/.
+    python main.py --headless [pasos...]
 """
 
 import sys
 import os
 
+from plotting import is_headless, set_headless
+
 def print_menu():
     """Menú de opciones."""
     print("\n" + "="*60)
@@ -74,7 +80,19 @@ def run_all():
 
     for step in range(1, 7):
         run_step(step)
-        input("\nPresiona Enter para continuar al siguiente paso...")
+        if not is_headless():
+            input("\nPresiona Enter para continuar al siguiente paso...")
+
+def run_headless(steps):
+    """
+    Ejecuta pasos sin ventanas ni pausas (figuras guardadas con Agg).
+
+    Args:
+        steps: Números de los pasos a ejecutar (vacío: todos)
+    """
+    set_headless()
+    for step in steps or range(1, 7):
+        run_step(step)
 
 def main():
     """Función principal del menú interactivo."""
@@ -104,4 +122,13 @@ def main():
             input("Presiona Enter para continuar...")
 
 if __name__ == "__main__":
-    main()
+    if '--headless' in sys.argv[1:]:
+        steps = [arg for arg in sys.argv[1:] if arg != '--headless']
+        invalid = [arg for arg in steps if arg not in ['1', '2', '3', '4', '5', '6']]
+        if invalid:
+            print(f"\nOpción no válida: {' '.join(invalid)}. Los pasos van del 1 al 6.")
+            print("Uso: python main.py --headless [pasos...]")
+            sys.exit(2)
+        run_headless([int(step) for step in steps])
+    else:
+        main()
@@ -0,0 +1,45 @@
+"""
+Carga diferida de matplotlib para los scripts del taller.
+
+Las funciones de cálculo se pueden importar sin cargar matplotlib: solo las
+de visualización llaman a pyplot(), que lo importa en el primer uso. En modo
+sin ventanas (variable de entorno PINHOLE_HEADLESS=1, argumento --headless o
+set_headless()) se usa el backend Agg y show() no abre ninguna ventana; las
+figuras se siguen guardando en disco.
+"""
+
+import os
+import sys
+
+_state = {
+    'headless': os.environ.get('PINHOLE_HEADLESS', '') not in ('', '0') or '--headless' in sys.argv
+}
+
+def set_headless(headless=True):
+    """Activa o desactiva el modo sin ventanas."""
+    _state['headless'] = headless
+
+def is_headless():
+    """True si las figuras no deben mostrarse en pantalla."""
+    return _state['headless']
+
+def pyplot():
+    """
+    Importa matplotlib.pyplot en el primer uso.
+
+    Returns:
+        El módulo matplotlib.pyplot
+    """
+    if 'matplotlib.pyplot' not in sys.modules and is_headless():
+        import matplotlib
+        matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    return plt
+
+def show():
+    """Muestra las figuras abiertas, o las cierra en modo sin ventanas."""
+    plt = pyplot()
+    if is_headless():
+        plt.close('all')
+    else:
+        plt.show()
@@ -0,0 +1,257 @@
+"""
+Núcleos de proyección mundo -> cámara -> distorsión -> píxel.
+
+Incluye una implementación en NumPy y otra compilada con Numba (opcional,
+en paralelo sobre los núcleos de la CPU) que calculan exactamente lo mismo.
+Numba solo se importa, y el núcleo solo se compila, la primera vez que se
+usa su backend, así que importar este módulo no lo carga.
+"""
+
+import importlib.util
+import os
+import time
+
+import numpy as np
+
+# Numba es opcional; se importa en el primer uso del backend (ver _numba_kernel)
+NUMBA_AVAILABLE = importlib.util.find_spec('numba') is not None
+_numba = {}
+
+# Distancia mínima (en Z) de un punto a la cámara para proyectarlo
+NEAR_PLANE = 1e-3
+
+# Backend usado por project_points cuando no se indica otro: 'auto' elige
+# Numba si está instalado y NumPy si no
+DEFAULT_BACKEND = os.environ.get('PINHOLE_BACKEND', 'auto')
+
+def _parameters(K, R, t, dist):
+    """Parámetros de cámara como arreglos float64 contiguos."""
+    K = np.asarray(K, dtype=np.float64)
+    camera = np.array([K[0, 0], K[1, 1], K[0, 2], K[1, 2], K[0, 1]])
+    R = np.ascontiguousarray(R, dtype=np.float64).reshape(3, 3)
+    t = np.ascontiguousarray(t, dtype=np.float64).reshape(3)
+    coefficients = np.zeros(5)
+    if dist is not None:
+        dist = np.asarray(dist, dtype=np.float64).ravel()
+        coefficients[:len(dist)] = dist[:5]
+    return camera, R, t, coefficients
+
+def project_points_numpy(points_world, K, R, t, dist=None, near=NEAR_PLANE, out=None,
+                         image_size=None):
+    """
+    Proyección completa con distorsión en NumPy.
+
+    Usa el modelo de distorsión de OpenCV (k1, k2, p1, p2, k3), como
+    cv2.projectPoints (que además ignora el sesgo K[0, 1]). Cada componente
+    se evalúa con las mismas operaciones y en el mismo orden que el núcleo
+    de Numba, así que ambos resultados coinciden bit a bit.
+
+    Args:
+        points_world: Puntos en coordenadas del mundo (N, 3)
+        K: Matriz intrínseca (3x3)
+        R: Matriz de rotación (3x3)
+        t: Vector de traslación (3,)
+        dist: Coeficientes de distorsión (k1, k2, p1, p2[, k3]) o None
+        near: Distancia del plano cercano
+        out: Arreglo preasignado (N, 2) opcional
+        image_size: (ancho, alto) en píxeles, o None para no recortar
+
+    Returns:
+        Puntos proyectados en píxeles (N, 2), NaN detrás del plano cercano
+        y, con image_size, fuera de la imagen
+    """
+    camera, R, t, (k1, k2, p1, p2, k3) = _parameters(K, R, t, dist)
+    fx, fy, cx, cy, skew = camera
+    points_world = np.asarray(points_world).reshape(-1, 3)
+    X = points_world[:, 0].astype(np.float64)
+    Y = points_world[:, 1].astype(np.float64)
+    Z = points_world[:, 2].astype(np.float64)
+
+    # 1. Mundo -> cámara
+    xc = R[0, 0] * X + R[0, 1] * Y + R[0, 2] * Z + t[0]
+    yc = R[1, 0] * X + R[1, 1] * Y + R[1, 2] * Z + t[1]
+    zc = R[2, 0] * X + R[2, 1] * Y + R[2, 2] * Z + t[2]
+    del X, Y, Z
+
+    # 2. Plano de imagen normalizado (NaN detrás del plano cercano)
+    zc[zc <= near] = np.nan
+    x = xc / zc
+    y = yc / zc
+    del xc, yc, zc
+
+    # 3. Distorsión radial y tangencial
+    if dist is not None:
+        r2 = x * x + y * y
+        radial = 1.0 + k1 * r2 + k2 * r2 * r2 + k3 * r2 * r2 * r2
+        xy = x * y
+        xd = x * radial + 2.0 * p1 * xy + p2 * (r2 + 2.0 * x * x)
+        yd = y * radial + p1 * (r2 + 2.0 * y * y) + 2.0 * p2 * xy
+        x, y = xd, yd
+
+    # 4. Píxeles
+    if out is None:
+        out = np.empty((len(points_world), 2))
+    out[:, 0] = fx * x + skew * y + cx
+    out[:, 1] = fy * y + cy
+
+    # 5. Recorte contra los bordes de la imagen
+    if image_size is not None:
+        width, height = image_size
+        u, v = out[:, 0], out[:, 1]
+        out[~((u >= 0) & (u <= width) & (v >= 0) & (v <= height))] = np.nan
+    return out
+
+def _numba_kernel():
+    """Importa Numba y compila el núcleo (o lo carga de la caché en disco) en el primer uso."""
+    if 'kernel' in _numba:
+        return _numba['kernel']
+
+    import numba
+
+    @numba.njit(parallel=True, cache=True)
+    def _project_kernel(points, R, t, camera, coefficients, distort, near, clip, bounds, out):
+        fx, fy, cx, cy, skew = camera[0], camera[1], camera[2], camera[3], camera[4]
+        k1, k2, p1, p2, k3 = (coefficients[0], coefficients[1], coefficients[2],
+                              coefficients[3], coefficients[4])
+        width, height = bounds[0], bounds[1]
+
+        for n in numba.prange(points.shape[0]):
+            X = np.float64(points[n, 0])
+            Y = np.float64(points[n, 1])
+            Z = np.float64(points[n, 2])
+
+            xc = R[0, 0] * X + R[0, 1] * Y + R[0, 2] * Z + t[0]
+            yc = R[1, 0] * X + R[1, 1] * Y + R[1, 2] * Z + t[1]
+            zc = R[2, 0] * X + R[2, 1] * Y + R[2, 2] * Z + t[2]
+            if zc <= near:
+                zc = np.nan
+            x = xc / zc
+            y = yc / zc
+
+            if distort:
+                r2 = x * x + y * y
+                radial = 1.0 + k1 * r2 + k2 * r2 * r2 + k3 * r2 * r2 * r2
+                xy = x * y
+                xd = x * radial + 2.0 * p1 * xy + p2 * (r2 + 2.0 * x * x)
+                yd = y * radial + p1 * (r2 + 2.0 * y * y) + 2.0 * p2 * xy
+                x = xd
+                y = yd
+
+            u = fx * x + skew * y + cx
+            v = fy * y + cy
+            if clip and not (u >= 0 and u <= width and v >= 0 and v <= height):
+                u = np.nan
+                v = np.nan
+            out[n, 0] = u
+            out[n, 1] = v
+
+    _numba.update(module=numba, kernel=_project_kernel)
+    return _project_kernel
+
+def project_points_numba(points_world, K, R, t, dist=None, near=NEAR_PLANE, out=None,
+                         image_size=None):
+    """
+    Proyección completa con distorsión compilada con Numba.
+
+    Un solo bucle por punto (mundo -> cámara -> distorsión -> píxel), en
+    paralelo sobre los núcleos de la CPU y sin arreglos temporales; mismos
+    argumentos y resultado que project_points_numpy.
+    """
+    if not NUMBA_AVAILABLE:
+        raise ImportError("El backend 'numba' requiere instalar numba (pip install numba)")
+
+    camera, R, t, coefficients = _parameters(K, R, t, dist)
+    points_world = np.asarray(points_world).reshape(-1, 3)
+    bounds = np.array(image_size if image_size is not None else (0, 0), dtype=np.float64)
+    if out is None:
+        out = np.empty((len(points_world), 2))
+    _numba_kernel()(points_world, R, t, camera, coefficients, dist is not None, near,
+                    image_size is not None, bounds, out)
+    return out
+
+BACKENDS = {
+    'numpy': project_points_numpy,
+    'numba': project_points_numba
+}
+
+def resolve_backend(backend=None):
+    """
+    Nombre del backend a usar.
+
+    Args:
+        backend: 'numpy', 'numba', 'auto' o None (usa DEFAULT_BACKEND, que se
+            puede fijar con la variable de entorno PINHOLE_BACKEND)
+
+    Returns:
+        'numpy' o 'numba'
+    """
+    backend = backend or DEFAULT_BACKEND
+    if backend == 'auto':
+        return 'numba' if NUMBA_AVAILABLE else 'numpy'
+    if backend not in BACKENDS:
+        raise ValueError(f"Backend desconocido: {backend} (opciones: auto, {', '.join(BACKENDS)})")
+    return backend
+
+def project_points(points_world, K, R, t, dist=None, near=NEAR_PLANE, out=None,
+                   image_size=None, backend=None):
+    """
+    Proyección completa con distorsión usando el backend elegido.
+
+    Args:
+        points_world: Puntos en coordenadas del mundo (N, 3)
+        K: Matriz intrínseca (3x3)
+        R: Matriz de rotación (3x3)
+        t: Vector de traslación (3,)
+        dist: Coeficientes de distorsión (k1, k2, p1, p2[, k3]) o None
+        near: Distancia del plano cercano
+        out: Arreglo preasignado (N, 2) opcional
+        image_size: (ancho, alto) en píxeles, o None para no recortar
+        backend: ver resolve_backend
+
+    Returns:
+        Puntos proyectados en píxeles (N, 2), NaN detrás del plano cercano
+        y, con image_size, fuera de la imagen
+    """
+    return BACKENDS[resolve_backend(backend)](points_world, K, R, t, dist, near, out, image_size)
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Compara los backends de proyección")
+    parser.add_argument('--points', type=int, default=10_000_000, help="número de puntos")
+    parser.add_argument('--repeat', type=int, default=3, help="repeticiones por backend")
+    parser.add_argument('--threads', type=int, default=None,
+                        help="hilos de Numba (por defecto: todos los núcleos)")
+    args = parser.parse_args()
+
+    print("=== Backends de proyección ===")
+    rng = np.random.default_rng(0)
+    points = rng.normal(0, 1, size=(args.points, 3))
+    K = np.array([[800.0, 0, 320], [0, 800, 240], [0, 0, 1]])
+    angle = np.radians(20)
+    R = np.array([[np.cos(angle), 0, np.sin(angle)], [0, 1, 0], [-np.sin(angle), 0, np.cos(angle)]])
+    t = np.array([0.1, -0.2, 6.0])
+    dist = np.array([-0.28, 0.07, 1e-3, -5e-4, 0.01])
+
+    results = {}
+    for name in BACKENDS:
+        if name == 'numba' and not NUMBA_AVAILABLE:
+            print("numba no está instalado: solo se mide NumPy")
+            continue
+        out = np.empty((len(points), 2))
+        BACKENDS[name](points[:1000], K, R, t, dist)  # compilación / calentamiento
+        if name == 'numba' and args.threads:
+            _numba['module'].set_num_threads(args.threads)
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            BACKENDS[name](points, K, R, t, dist, out=out)
+        elapsed = (time.perf_counter() - start) / args.repeat
+        results[name] = out
+        threads = _numba['module'].get_num_threads() if name == 'numba' else 1
+        print(f"{name:>6}: {elapsed * 1000:7.1f} ms para {len(points):,} puntos "
+              f"({len(points) / elapsed / 1e6:.1f} M puntos/s, {threads} hilos, "
+              f"{os.cpu_count()} núcleos)")
+
+    if len(results) == 2:
+        identical = np.array_equal(results['numpy'], results['numba'], equal_nan=True)
+        print(f"Resultados idénticos bit a bit: {identical}")